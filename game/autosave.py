@@ -0,0 +1,117 @@
+import atexit
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+from game import database, save_format
+from game.config import SAVE_DELTAS, SAVE_COMPACT_EVERY
+
+
+class AutosaveQueue:
+    """
+    AutosaveQueue – zapis gry w tle (write-behind).
+
+    submit() tylko odkłada stan gry i wraca od razu; osobny wątek zapisuje go do bazy.
+    Kolejne zapisy tego samego slotu przed zapisem na dysk są scalane — trafia tylko najnowszy stan.
+    Wątek prowadzi też zapisy przyrostowe: delta względem ostatnio zapisanego stanu slotu,
+    pełny zapis co SAVE_COMPACT_EVERY delt albo gdy delta nie jest możliwa.
+    flush() czeka na zapisanie wszystkiego, close() dodatkowo kończy wątek (wywoływane też przy wyjściu).
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._pending: Dict[Tuple[str, int], Tuple[dict, Optional[str]]] = {}
+        self._writing = False
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        # Ostatni zapisany stan, jego dziennik powtórki i liczba delt od pełnego zapisu, osobno dla każdego slotu
+        self._saved: Dict[Tuple[str, int], dict] = {}
+        self._replays: Dict[Tuple[str, int], Optional[str]] = {}
+        self._deltas: Dict[Tuple[str, int], int] = {}
+
+    def submit(self, username: str, slot: int, data: dict, replay: Optional[str] = None) -> None:
+        """
+        Odkłada stan gry do zapisu. Dane nie mogą być potem modyfikowane przez wywołującego.
+        """
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Kolejka zapisów została zamknięta.")
+            self._pending[(username, slot)] = (data, replay)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+            self._cond.notify_all()
+
+    def forget(self) -> None:
+        """
+        Zapomina zapisane stany — następny zapis każdego slotu będzie pełny (np. po wczytaniu lub nowej grze).
+        """
+        with self._cond:
+            self._saved.clear()
+            self._replays.clear()
+            self._deltas.clear()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Czeka, aż wszystkie odłożone zapisy trafią do bazy. Zwraca False po przekroczeniu czasu.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._writing, timeout)
+
+    def close(self) -> None:
+        """
+        Zapisuje zaległe stany i kończy wątek zapisu.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                key = next(iter(self._pending))
+                data, replay = self._pending.pop(key)
+                self._writing = True
+            try:
+                self._write(key, data, replay)
+            except Exception as e:
+                logging.error(f"Nie udało się zapisać gry w tle ({key[0]}, slot {key[1]}): {e}")
+                with self._cond:
+                    self._saved.pop(key, None)
+                    self._replays.pop(key, None)
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+
+    def _write(self, key: Tuple[str, int], data: dict, replay: Optional[str]) -> None:
+        username, slot = key
+        with self._cond:
+            previous = self._saved.get(key)
+            saved_replay = self._replays.get(key)
+            deltas = self._deltas.get(key, 0)
+
+        delta = None
+        if SAVE_DELTAS and previous is not None and deltas < SAVE_COMPACT_EVERY:
+            delta = save_format.encode_delta(previous, data)
+        if delta == "" and replay == saved_replay:
+            # Nic się nie zmieniło — bez zapisu do bazy i bez liczenia delty do SAVE_COMPACT_EVERY
+            return
+        # Pusta delta przy zmienionym dzienniku podmienia tylko kolumnę replay
+        if delta is not None and database.append_save_delta(username, slot, delta, replay=replay):
+            if delta:
+                deltas += 1
+        else:
+            database.save_game(username, slot, save_format.encode(data), replay=replay)
+            deltas = 0
+
+        with self._cond:
+            self._saved[key] = data
+            self._replays[key] = replay
+            self._deltas[key] = deltas
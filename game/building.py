@@ -1,4 +1,6 @@
 import logging
+from typing import Optional
+from game.utils import column_label
 from game.tower import Strzelajaca, CiezkaArmatnia, Lodowa, MagiaOgnia, Laserowa
 
 class Building:
@@ -51,23 +53,13 @@ class Building:
         if x is None:
             self._game.notifications.append("❌ Nieprawidłowe pole.")
             return
-        if (y, x) in self._game.map.path or (y, x) == self._game.map.start or (y, x) == self._game.map.base:
-            self._game.notifications.append("❌ Nie można na ścieżce, starcie ani bazie.")
-            return
-        if self._game.gold < tower.cost:
-            self._game.notifications.append("❌ Brak złota.")
+        error = self.place_tower(tower, x, y)
+        if error:
+            self._game.notifications.append(error)
             return
+        if self._game.replay is not None:
+            self._game.replay.record_build(tower.name, x, y)
 
-        # Umieszczanie wieży i aktualizacja gry
-        tower.x, tower.y = x, y
-        self._game.towers.append(tower)
-        self._game.map.grid[y][x] = tower.symbol
-        self._game.gold -= tower.cost
-        self._game.stats["wydane_zloto"] += tower.cost
-        self._game.stats["towers_built"] += 1
-        self._game.stats["max_gold_ever"] = max(self._game.stats["max_gold_ever"], self._game.gold)
-
-        self._game.update_achievements()
         logging.info(f"Gracz {self._game.username} postawił {tower.name} na {coord}")
         self._game.notifications.append(f"✅ Postawiono {tower.name} na {coord}.")
         self._game.sound.play("build")
@@ -83,7 +75,7 @@ class Building:
         print("---+-------------------+--------+--------+---------+------------+----------+-----------------")
 
         tower_info = [
-            f"{nr:2} | {t.name:<17} | {t.level:^6} | {t.__class__.max_level():^6} | {chr(65 + t.x)}{t.y + 1:^7} | "
+            f"{nr:2} | {t.name:<17} | {t.level:^6} | {t.__class__.max_level():^6} | {column_label(t.x)}{t.y + 1:^7} | "
             f"{t.damage:^10} | {int(t.damage * 1.2):^8} | {int(t.cost * 0.75):^15}"
             for nr, t in enumerate(self._game.towers, 1)
         ]
@@ -104,23 +96,73 @@ class Building:
             )
             return
 
-        cost = int(tower.cost * 0.75)
+        cost = self.upgrade_price(tower)
 
         confirm = input(f"Ulepszyć {tower.name} za {cost} zł? (T/N): ").strip().lower()
         if confirm != 't':
             self._game.notifications.append("Anulowano ulepszenie.")
             return
-        if self._game.gold < cost:
-            self._game.notifications.append("❌ Brak złota.")
+        error = self.apply_upgrade(tower)
+        if error:
+            self._game.notifications.append(error)
             return
-
-        self._game.gold -= cost
-        self._game.stats["wydane_zloto"] += cost
-        self._game.stats["liczba_ulepszen"] += 1
-        tower.upgrade()
+        if self._game.replay is not None:
+            self._game.replay.record_upgrade(int(choice) - 1)
 
         logging.info(
             f"Gracz {self._game.username} ulepszył {tower.name} na {tower.x},{tower.y} do poziomu {tower.level}"
         )
         self._game.notifications.append(f"✅ Ulepszono {tower.name} do poziomu {tower.level}.")
-        self._game.save_game()
\ No newline at end of file
+        self._game.save_game()
+
+    def place_tower(self, tower, x, y) -> Optional[str]:
+        """
+        Stawia wieżę na polu (x, y) bez interakcji z graczem.
+        Zwraca komunikat błędu albo None, jeśli budowa się udała.
+        """
+        game = self._game
+        if not (0 <= x < len(game.map.grid[0]) and 0 <= y < len(game.map.grid)):
+            return "❌ Nieprawidłowe pole."
+        if (y, x) in game.map.path_tiles or (y, x) == game.map.start or (y, x) == game.map.base:
+            return "❌ Nie można na ścieżce, starcie ani bazie."
+        if game.gold < tower.cost:
+            return "❌ Brak złota."
+
+        # Umieszczanie wieży i aktualizacja gry
+        tower.x, tower.y = x, y
+        tower.game = game
+        game.towers.append(tower)
+        game.map.grid[y][x] = tower.symbol
+        game.map.touch()
+        game.gold -= tower.cost
+        game.stats["wydane_zloto"] += tower.cost
+        game.stats["towers_built"] += 1
+        game.stats["max_gold_ever"] = max(game.stats["max_gold_ever"], game.gold)
+        game.update_achievements()
+        return None
+
+    @staticmethod
+    def upgrade_price(tower) -> int:
+        """
+        Koszt ulepszenia wieży płacony przez gracza.
+        """
+        return int(tower.cost * 0.75)
+
+    def apply_upgrade(self, tower) -> Optional[str]:
+        """
+        Ulepsza wieżę bez interakcji z graczem.
+        Zwraca komunikat błędu albo None, jeśli ulepszenie się udało.
+        """
+        game = self._game
+        if tower.level >= tower.__class__.max_level():
+            return f"❌ {tower.name} osiągnęła maksymalny poziom ({tower.level}/{tower.__class__.max_level()})."
+        cost = self.upgrade_price(tower)
+        if game.gold < cost:
+            return "❌ Brak złota."
+
+        game.gold -= cost
+        game.stats["wydane_zloto"] += cost
+        game.stats["liczba_ulepszen"] += 1
+        tower.upgrade()
+        game.map.touch()
+        return None
@@ -1,16 +1,22 @@
 from game.settings import load_prefs
 
-# Podstawowe wymiary planszy gry
-MAP_WIDTH  = 26
-MAP_HEIGHT = 26
-
 # Wczytanie spersonalizowanych preferencji gracza z pliku konfiguracyjnego
 _prefs = load_prefs()
 
+# Podstawowe wymiary planszy gry (większe plansze, np. 256×256, przez map_width/map_height w preferencjach)
+MAP_WIDTH  = _prefs.get("map_width", 26)
+MAP_HEIGHT = _prefs.get("map_height", 26)
+# Okno mapy rysowane w interfejsie (na większych planszach przewijane klawiszami I/J/K/L)
+VIEWPORT_WIDTH  = _prefs.get("viewport_width", 26)
+VIEWPORT_HEIGHT = _prefs.get("viewport_height", 26)
+
 # Kluczowe parametry startowe gry, możliwe do dostosowania przez gracza w ustawieniach
 START_GOLD            = _prefs.get("starting_gold", 100)          # Ilość złota na start
 START_LIVES           = _prefs.get("starting_lives", 10)          # Liczba żyć na start
 NUM_WAVES             = _prefs.get("num_waves", 20)               # Liczba fal w jednej rozgrywce
 DELAY_STEP            = _prefs.get("delay_step", 2)               # Odstęp czasowy (np. między falami)
 HP_SCALE_PER_WAVE     = _prefs.get("hp_scale_per_wave", 0.10)     # Przyrost HP przeciwników z każdą falą (%)
-REWARD_SCALE_PER_WAVE = _prefs.get("reward_scale_per_wave", 0.05) # Przyrost nagród za przeciwników z każdą falą (%)
\ No newline at end of file
+REWARD_SCALE_PER_WAVE = _prefs.get("reward_scale_per_wave", 0.05) # Przyrost nagród za przeciwników z każdą falą (%)
+# Zapis gry: zapisy przyrostowe (delta) i pełny zapis (kompaktowanie) co SAVE_COMPACT_EVERY zapisów
+SAVE_DELTAS        = True
+SAVE_COMPACT_EVERY = 20
@@ -0,0 +1,87 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+class CoverageIndex:
+    """
+    Indeks pokrycia ścieżki przez zasięgi wież.
+    Dla każdego indeksu ścieżki przechowuje wieże, których zasięg Manhattan obejmuje to pole,
+    a dla każdej wieży — listę pokrytych indeksów ścieżki.
+    Wieże nie zmieniają się w trakcie fali, więc indeks budowany jest raz na falę
+    (po każdej budowie/ulepszeniu, zanim ruszy kolejna fala).
+    """
+
+    def __init__(
+        self,
+        path: Sequence[Tuple[int, int]],
+        towers: Sequence,
+        path_index: Optional[Dict[Tuple[int, int], int]] = None
+    ) -> None:
+        """
+        path_index – indeks pole → pierwsza pozycja na ścieżce (Map.path_index);
+        bez niego liczony jest z path.
+        """
+        self.path = path
+        self.towers = list(towers)
+        self.by_index: List[list] = [[] for _ in path]
+        self._covered: Dict[int, List[int]] = {}
+        if path_index is None:
+            path_index = {}
+            for idx, tile in enumerate(path):
+                path_index.setdefault(tile, idx)
+        self.path_index = path_index
+        self._build()
+
+    def _repeats(self) -> Dict[Tuple[int, int], List[int]]:
+        """
+        Wszystkie pozycje pól, przez które ścieżka przechodzi więcej niż raz
+        (path_index wskazuje tylko pierwszą z nich).
+        """
+        if len(self.path_index) == len(self.path):
+            return {}
+        positions: Dict[Tuple[int, int], List[int]] = {}
+        for idx, tile in enumerate(self.path):
+            positions.setdefault(tile, []).append(idx)
+        return {tile: indices for tile, indices in positions.items() if len(indices) > 1}
+
+    def _build(self) -> None:
+        """
+        Wylicza pokrycie. Dla każdej wieży przegląda mniejszy z dwóch zbiorów: pola jej rombu
+        zasięgu (wyszukiwane w path_index) albo całą ścieżkę.
+        Na dużych mapach koszt zależy więc od zasięgu wieży, a nie od długości ścieżki.
+        """
+        path_index = self.path_index
+        repeats = self._repeats()
+
+        for tower in self.towers:
+            r = tower.range
+            if 2 * r * (r + 1) + 1 < len(self.path):
+                covered = []
+                for dy in range(-r, r + 1):
+                    row = tower.y + dy
+                    rest = r - abs(dy)
+                    for col in range(tower.x - rest, tower.x + rest + 1):
+                        idx = path_index.get((row, col))
+                        if idx is None:
+                            continue
+                        if (row, col) in repeats:
+                            covered.extend(repeats[(row, col)])
+                        else:
+                            covered.append(idx)
+                covered.sort()
+            else:
+                covered = [idx for idx, tile in enumerate(self.path) if tower.covers(tile)]
+            for idx in covered:
+                self.by_index[idx].append(tower)
+            self._covered[id(tower)] = covered
+
+    def covered_indices(self, tower) -> List[int]:
+        """
+        Zwraca rosnącą listę indeksów ścieżki w zasięgu wieży.
+        """
+        return self._covered.get(id(tower), [])
+
+    def towers_at(self, path_index: int) -> list:
+        """
+        Zwraca wieże, których zasięg obejmuje dany indeks ścieżki.
+        """
+        return self.by_index[path_index]
@@ -1,11 +1,14 @@
 from sqlalchemy import (
-    create_engine, Column, Integer, String, Text, UniqueConstraint
+    create_engine, event, inspect, text, select, update, delete, bindparam,
+    Column, Integer, String, Text, UniqueConstraint
 )
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import declarative_base
 import datetime
-import json
 import os
 
+from game import save_format
+
 Base = declarative_base()
 DB_PATH = os.path.join(os.path.dirname(__file__), "..", "tower_defense.db")
 DB_URI = f"sqlite:///{DB_PATH}"
@@ -26,16 +29,86 @@ class Save(Base):
     username = Column(String, nullable=False)
     slot = Column(Integer, nullable=False)
     data = Column(Text, nullable=False)
+    # Dziennik powtórki (JSON) — brak dla zapisów sprzed jego wprowadzenia
+    replay = Column(Text, nullable=True)
     __table_args__ = (UniqueConstraint('username', 'slot', name='_username_slot_uc'),)
 
-engine = create_engine(DB_URI, echo=False, future=True)
-SessionLocal = sessionmaker(bind=engine, future=True)
+# Przygotowane zapytania (kompilowane raz; sqlite3 trzyma je w cache instrukcji połączenia)
+_SELECT_SAVE = select(Save.data).where(Save.username == bindparam("username"), Save.slot == bindparam("slot"))
+_SELECT_REPLAY = select(Save.replay).where(Save.username == bindparam("username"), Save.slot == bindparam("slot"))
+_SELECT_SLOTS = select(Save.slot).where(Save.username == bindparam("username"))
+_UPSERT_SAVE = sqlite_insert(Save)
+_UPSERT_SAVE = _UPSERT_SAVE.on_conflict_do_update(
+    index_elements=[Save.username, Save.slot],
+    set_={"data": _UPSERT_SAVE.excluded.data, "replay": _UPSERT_SAVE.excluded.replay}
+)
+_APPEND_DELTA = (
+    update(Save)
+    .where(Save.username == bindparam("b_username"), Save.slot == bindparam("b_slot"))
+    .values(data=Save.data + bindparam("b_delta"), replay=bindparam("b_replay"))
+)
+_DELETE_SAVE = delete(Save).where(Save.username == bindparam("username"), Save.slot == bindparam("slot"))
+_UPSERT_SCORE = sqlite_insert(Highscore)
+_UPSERT_SCORE = _UPSERT_SCORE.on_conflict_do_update(
+    index_elements=[Highscore.username],
+    set_={"score": _UPSERT_SCORE.excluded.score, "date": _UPSERT_SCORE.excluded.date},
+    where=Highscore.score < _UPSERT_SCORE.excluded.score
+)
+_TOP_SCORES = select(Highscore.username, Highscore.score, Highscore.date).order_by(Highscore.score.desc()).limit(
+    bindparam("limit")
+)
+_DELETE_SCORE = delete(Highscore).where(Highscore.username == bindparam("username"))
+
+
+def _set_sqlite_pragmas(dbapi_connection, _):
+    """
+    Ustawienia każdego nowego połączenia SQLite: dziennik WAL i synchronous=NORMAL
+    (zapis bez fsync przy każdym commicie, baza nadal spójna po awarii).
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+def make_engine(uri=DB_URI):
+    """
+    Tworzy silnik bazy z pulą połączeń wielokrotnego użytku (wątek gry + wątek autosave)
+    i pragmami SQLite ustawianymi przy każdym połączeniu.
+    """
+    new_engine = create_engine(
+        uri, echo=False, future=True,
+        pool_size=2, max_overflow=2, pool_timeout=10,
+        connect_args={"check_same_thread": False}
+    )
+    event.listen(new_engine, "connect", _set_sqlite_pragmas)
+    return new_engine
+
+
+engine = make_engine()
+# Silnik, dla którego init_db już utworzył i zmigrował tabele
+_initialized_engine = None
 
 def init_db():
     """
     Tworzy wszystkie tabele w bazie danych, jeśli jeszcze nie istnieją.
+    Wywołania po pierwszym (dla tego samego silnika) nic nie robią.
     """
+    global _initialized_engine
+    if _initialized_engine is engine:
+        return
     Base.metadata.create_all(engine)
+    _migrate()
+    _initialized_engine = engine
+
+def _migrate():
+    """
+    Dodaje kolumny brakujące w bazach utworzonych przez starsze wersje gry.
+    """
+    columns = {c["name"] for c in inspect(engine).get_columns("saves")}
+    if "replay" not in columns:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE saves ADD COLUMN replay TEXT"))
 
 def add_score(username, score, date=None):
     """
@@ -43,105 +116,77 @@ def add_score(username, score, date=None):
     """
     if not date:
         date = datetime.datetime.now().strftime('%Y-%m-%d %H:%M')
-    session = SessionLocal()
     try:
-        with session.begin():
-            hs = session.query(Highscore).filter_by(username=username).first()
-            if hs:
-                if score > hs.score:
-                    hs.score = score
-                    hs.date = date
-            else:
-                hs = Highscore(username=username, score=score, date=date)
-                session.add(hs)
+        with engine.begin() as conn:
+            conn.execute(_UPSERT_SCORE, {"username": username, "score": score, "date": date})
     except Exception as e:
         print(f"❌ Nie udało się dodać wyniku do bazy: {e}")
-    finally:
-        session.close()
 
 def get_top_scores(limit=10):
-    session = SessionLocal()
-    try:
-        results = (
-            session.query(Highscore)
-            .order_by(Highscore.score.desc())
-            .limit(limit)
-            .all()
-        )
-        return results
-    finally:
-        session.close()
+    with engine.connect() as conn:
+        return conn.execute(_TOP_SCORES, {"limit": limit}).all()
 
 def delete_score(username):
     """
     Usuwa wynik gracza z rankingu.
     """
-    session = SessionLocal()
-    try:
-        with session.begin():
-            hs = session.get(Highscore, username)
-            if hs:
-                session.delete(hs)
-    finally:
-        session.close()
+    with engine.begin() as conn:
+        conn.execute(_DELETE_SCORE, {"username": username})
 
-def save_game(username, slot, data_json):
+def save_game(username, slot, data_json, replay=None):
     """
-    Zapisuje stan gry użytkownika do wybranego slotu.
+    Zapisuje stan gry użytkownika do wybranego slotu (opcjonalnie razem z dziennikiem powtórki).
     """
-    session = SessionLocal()
-    try:
-        with session.begin():
-            save = session.query(Save).filter_by(username=username, slot=slot).first()
-            if save:
-                save.data = data_json
-            else:
-                save = Save(username=username, slot=slot, data=data_json)
-                session.add(save)
-    finally:
-        session.close()
+    with engine.begin() as conn:
+        conn.execute(_UPSERT_SAVE, {"username": username, "slot": slot, "data": data_json, "replay": replay})
+
+def append_save_delta(username, slot, delta, replay=None):
+    """
+    Dopisuje zapis przyrostowy (delta) do istniejącego zapisu gry i podmienia dziennik powtórki.
+    Zwraca False, jeśli zapisu w tym slocie nie ma (wtedy potrzebny jest pełny zapis).
+    """
+    with engine.begin() as conn:
+        result = conn.execute(
+            _APPEND_DELTA, {"b_username": username, "b_slot": slot, "b_delta": delta, "b_replay": replay}
+        )
+        return result.rowcount > 0
 
 def load_game(username, slot):
     """
-    Wczytuje zapis gry użytkownika z danego slotu.
+    Wczytuje zapis gry użytkownika z danego slotu (stary JSON albo format kompaktowy z deltami).
     """
-    session = SessionLocal()
     try:
-        save = session.query(Save).filter_by(username=username, slot=slot).first()
-        if save:
+        with engine.connect() as conn:
+            data = conn.execute(_SELECT_SAVE, {"username": username, "slot": slot}).scalar()
+        if data:
             try:
-                return json.loads(save.data)
-            except json.JSONDecodeError:
+                return save_format.loads(data)
+            except ValueError:
                 print("❌ Zapis gry jest uszkodzony lub nieprawidłowy format.")
                 return None
         return None
     except Exception as e:
         print(f"❌ Wystąpił błąd podczas wczytywania gry: {e}")
         return None
-    finally:
-        session.close()
+
+def load_replay(username, slot):
+    """
+    Zwraca dziennik powtórki zapisu (JSON) albo None, jeśli zapis go nie ma.
+    """
+    with engine.connect() as conn:
+        return conn.execute(_SELECT_REPLAY, {"username": username, "slot": slot}).scalar()
 
 
 def delete_save(username, slot):
     """
     Usuwa zapis gry z danego slotu.
     """
-    session = SessionLocal()
-    try:
-        with session.begin():
-            save = session.query(Save).filter_by(username=username, slot=slot).first()
-            if save:
-                session.delete(save)
-    finally:
-        session.close()
+    with engine.begin() as conn:
+        conn.execute(_DELETE_SAVE, {"username": username, "slot": slot})
 
 def list_saves_for_user(username):
     """
     Zwraca listę slotów z zapisami gry użytkownika.
     """
-    session = SessionLocal()
-    try:
-        return [f"slot {save.slot}" for save in session.query(Save).filter_by(username=username).all()]
-    finally:
-        session.close()
-    return []
\ No newline at end of file
+    with engine.connect() as conn:
+        return [f"slot {slot}" for slot in conn.execute(_SELECT_SLOTS, {"username": username}).scalars()]
@@ -0,0 +1,251 @@
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# Reguły nakładania tego samego efektu na wroga, który już go ma
+STACK_REFRESH = "refresh"   # czas trwania ustawiany na nowo (jak przypisanie licznika)
+STACK_EXTEND = "extend"     # czasy trwania się sumują
+STACK_MAX = "max"           # zostaje dłuższy z dwóch
+
+
+class StatusEffect:
+    """
+    Bazowa klasa efektu statusowego liczonego w turach wroga (tickach, w których nie jest ogłuszony).
+
+    Stan efektu to liczba pozostałych tur w Enemy.statuses[name]; Enemy nie potrzebuje
+    osobnego pola dla każdego efektu. Nowy efekt to podklasa zarejestrowana w STATUS_EFFECTS.
+        -FREEZES – wróg pod efektem traci całą turę (inne efekty czekają, jak przy ogłuszeniu),
+        -HOLDS – wróg pod efektem nie rusza się w tej turze (spowolnienie),
+        -DAMAGE – obrażenia zadawane wrogowi w każdej turze efektu (podpalenie).
+    Turę efektu (fire i zmniejszenie licznika) wykonuje Enemy.effect_turn według KindEffects.plan.
+    """
+    name = ""
+    STACKING = STACK_REFRESH
+    FREEZES = False
+    HOLDS = False
+    DAMAGE = 0
+
+    def affects(self, enemy) -> bool:
+        """
+        Czy efekt działa na tego wroga (licznik efektu bez działania stoi w miejscu).
+        """
+        return kind_effects(enemy.kind).rule(self.name) is not None
+
+    def affects_kind(self, kind) -> bool:
+        """
+        Czy efekt działa na wrogów danego typu (EnemyType).
+        """
+        return True
+
+    def stack(self, current: int, duration: int) -> int:
+        """
+        Liczba tur po nałożeniu efektu na wroga, który ma jeszcze `current` tur.
+        """
+        stacking = self.STACKING
+        if stacking == STACK_REFRESH:
+            return duration
+        if stacking == STACK_EXTEND:
+            return current + duration
+        return max(current, duration)
+
+    def fire(self, enemy) -> None:
+        """
+        Dodatkowe działanie efektu w jednej turze (poza obrażeniami DAMAGE). Nie zmienia statusów wroga.
+        """
+
+
+class Stun(StatusEffect):
+    name = "stun"
+    FREEZES = True
+
+
+class Slow(StatusEffect):
+    name = "slow"
+    HOLDS = True
+
+    def affects_kind(self, kind) -> bool:
+        # Nietoperz nie podlega spowolnieniu
+        return not kind.flying
+
+
+class Burn(StatusEffect):
+    name = "burn"
+    DAMAGE = 1
+
+    def affects_kind(self, kind) -> bool:
+        return not kind.flying and not kind.fire_immune
+
+
+STATUS_EFFECTS: Dict[str, StatusEffect] = {
+    effect.name: effect for effect in (Stun(), Slow(), Burn())
+}
+
+
+class EffectRule(NamedTuple):
+    """
+    Efekt widziany z perspektywy typu wroga: flagi efektu, obrażenia na turę
+    i jego działanie (None, gdy fire nic nie robi).
+    """
+    freezes: bool
+    holds: bool
+    damage: int
+    fire: Optional[Callable]
+
+
+class KindEffects:
+    """
+    Efekty statusowe z perspektywy jednego typu wroga (EnemyType). Działanie efektu zależy
+    tylko od typu, więc reguły (rule) i plany tur (plan) liczone są raz i zapamiętywane.
+
+    Plan tury dla zestawu efektów (kolejność kluczy Enemy.statuses) to para
+    (krotka działających efektów zatrzymujących, krotka (nazwa, holds, damage, fire) pozostałych
+    działających efektów). Enemy trzyma swój plan do zmiany zestawu efektów, więc tura nie pyta
+    o reguły każdego efektu.
+    """
+
+    def __init__(self, kind) -> None:
+        self.kind = kind
+        self._rules: Dict[str, Optional[EffectRule]] = {}
+        self._plans: Dict[Tuple[str, ...], tuple] = {}
+
+    def rule(self, name: str) -> Optional[EffectRule]:
+        """
+        Reguła efektu dla tego typu albo None, jeśli efekt na niego nie działa.
+        """
+        rules = self._rules
+        if name not in rules:
+            effect = STATUS_EFFECTS[name]
+            rule = None
+            if effect.affects_kind(self.kind):
+                fire = effect.fire if type(effect).fire is not StatusEffect.fire else None
+                rule = EffectRule(effect.FREEZES, effect.HOLDS, effect.DAMAGE, fire)
+            rules[name] = rule
+        return rules[name]
+
+    def plan(self, statuses: Optional[Dict[str, int]]) -> tuple:
+        """
+        Plan tury wroga z efektami `statuses` (efekty bez działania na ten typ są pomijane).
+        """
+        names = tuple(statuses) if statuses else ()
+        plan = self._plans.get(names)
+        if plan is None:
+            freezes = []
+            steps = []
+            for name in names:
+                rule = self.rule(name)
+                if rule is None:
+                    continue
+                if rule.freezes:
+                    freezes.append(name)
+                else:
+                    steps.append((name, rule.holds, rule.damage, rule.fire))
+            plan = self._plans[names] = (tuple(freezes), tuple(steps))
+        return plan
+
+
+_KIND_EFFECTS: Dict[object, KindEffects] = {}
+
+
+def kind_effects(kind) -> KindEffects:
+    """
+    Wspólny KindEffects dla typu wroga.
+    """
+    effects = _KIND_EFFECTS.get(kind)
+    if effects is None:
+        effects = _KIND_EFFECTS[kind] = KindEffects(kind)
+    return effects
+
+
+def has_effects(enemy) -> bool:
+    """
+    Czy wróg ma efekt, który na niego działa (efekty bez działania nie wymagają tur).
+    """
+    statuses = enemy.statuses
+    if not statuses:
+        return False
+    freezes, steps = enemy.kind_effects.plan(statuses)
+    return any(statuses[name] for name in freezes) or any(statuses[step[0]] for step in steps)
+
+
+class EffectWheel:
+    """
+    Koło czasowe (timer wheel) tur efektów statusowych dla silnika fali.
+
+    Wpisem jest wróg, a nie para (wróg, efekt): tura wroga to Enemy.effect_turn — ogłuszenie
+    albo wszystkie jego efekty i regeneracja, jak w Enemy.move. Wróg z działającymi efektami
+    ma turę w każdym ticku; wróg tylko regenerujący się — dopiero w ticku regeneracji
+    (pominięte tury dolicza się do licznika regeneracji przy odwiedzinach).
+    Stan planu trzymany jest na wrogu: effect_due (tick zaplanowanej tury, 0 = brak)
+    i effect_tick (tick ostatniej tury). advance(tick) podmienia listę szczeliny tick % SLOTS
+    na nową zamiast ją filtrować; wpisy nieaktualne (wróg przeplanowany) są pomijane,
+    a wpisy odległe o więcej niż SLOTS ticków wracają do szczeliny.
+    """
+    SLOTS = 64
+
+    def __init__(self) -> None:
+        self.now = 0
+        self._slots: List[list] = [[] for _ in range(self.SLOTS)]
+
+    def schedule(self, enemy, delay: int = 1) -> None:
+        """
+        Planuje turę wroga za `delay` ticków (chyba że ma już zaplanowaną wcześniejszą).
+        """
+        due = self.now + delay
+        current = enemy.effect_due
+        if current and current <= due:
+            return
+        enemy.effect_due = due
+        self._slots[due % self.SLOTS].append(enemy)
+
+    def _plan(self, enemy) -> None:
+        """
+        Planuje turę regeneracji wroga bez działających efektów (pominięte tury dolicza advance()).
+        """
+        if enemy.regenerates and not enemy.flying:
+            self.schedule(enemy, max(1, enemy.regen_interval - enemy._regen_counter))
+
+    def track(self, enemy) -> None:
+        """
+        Podpina wroga wchodzącego na mapę: planuje regenerację i efekty, które już ma.
+        """
+        enemy.effect_wheel = self
+        enemy.effect_tick = self.now
+        if has_effects(enemy):
+            self.schedule(enemy)
+        else:
+            self._plan(enemy)
+
+    def advance(self, tick: int) -> list:
+        """
+        Wykonuje tury wrogów przypadające na `tick` i zwraca tych wrogów.
+        Wróg, który w tej turze stoi (ogłuszenie, spowolnienie), ma ustawione skip_move.
+        """
+        self.now = tick
+        i = tick % self.SLOTS
+        slot = self._slots[i]
+        if not slot:
+            return []
+        self._slots[i] = later = []
+        slots = self.SLOTS
+        following = self._slots[(tick + 1) % slots]
+        turns = []
+        for enemy in slot:
+            due = enemy.effect_due
+            if due != tick:
+                if due > tick and due % slots == i:
+                    later.append(enemy)
+                continue
+            if not enemy.alive:
+                enemy.effect_due = 0
+                continue
+            # Tury bez efektów od ostatnich odwiedzin liczą się do regeneracji
+            if tick - 1 > enemy.effect_tick and enemy.kind.regenerates:
+                enemy._regen_counter += tick - 1 - enemy.effect_tick
+            enemy.effect_tick = tick
+            turns.append(enemy)
+            if enemy.effect_turn() and enemy.alive:
+                enemy.effect_due = tick + 1
+                following.append(enemy)
+            else:
+                enemy.effect_due = 0
+                if enemy.alive:
+                    self._plan(enemy)
+        return turns
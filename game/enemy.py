@@ -1,76 +1,243 @@
-from typing import List, Tuple, Optional
+from operator import attrgetter
+from typing import Dict, List, NamedTuple, Tuple, Optional
+
+from game.effects import STACK_REFRESH, STATUS_EFFECTS, has_effects, kind_effects
+
+
+class EnemyType(NamedTuple):
+    """
+    Niezmienne dane typu przeciwnika (flyweight): nazwa, symbol, bazowe statystyki i cechy specjalne.
+    Jeden obiekt typu jest współdzielony przez wszystkich wrogów danej klasy (a po przeskalowaniu —
+    danej klasy w danej fali); egzemplarze Enemy trzymają tylko stan zmienny.
+    """
+    name: str
+    symbol: str
+    max_hp: int
+    speed: int
+    reward: int
+    damage: int = 1
+    invisible: bool = False
+    fire_immune: bool = False
+    regenerates: bool = False
+    regen_interval: int = 0
+    flying: bool = False
+
+    def shared(self) -> "EnemyType":
+        """
+        Zwraca wspólny egzemplarz typu o takich samych danych (jeden obiekt na zestaw wartości).
+        """
+        return _SHARED_TYPES.setdefault(self, self)
+
+
+_SHARED_TYPES: Dict[EnemyType, EnemyType] = {}
+
+
+def _type_field(name: str) -> property:
+    """
+    Atrybut wroga czytany z jego typu. Zapis (np. w testach) nie zmienia typu współdzielonego,
+    tylko przypina temu wrogowi wariant typu z nową wartością.
+    """
+    def set_field(self, value) -> None:
+        self.kind = kind = self.kind._replace(**{name: value}).shared()
+        self.kind_effects = kind_effects(kind)
+        self.effect_plan = None
+
+    return property(attrgetter("kind." + name), set_field)
+
+
+def _status_field(name: str) -> property:
+    """
+    Licznik tur efektu statusowego (np. slowed = pozostałe tury spowolnienia).
+    Zapis ustawia licznik wprost, jak dawne pole wroga.
+    """
+    def get_status(self) -> int:
+        statuses = self.statuses
+        return statuses.get(name, 0) if statuses else 0
+
+    def set_status(self, value: int) -> None:
+        self.set_status(name, value)
+
+    return property(get_status, set_status)
+
 
 class Enemy:
     """
     Bazowa klasa wszystkich przeciwników w grze.
     Każdy przeciwnik porusza się po ścieżce na mapie, posiada własne statystyki
     i specjalne cechy.
+
+    Stałe dane typu (nazwa, symbol, maks. HP, prędkość, nagroda, obrażenia, cechy) leżą we
+    współdzielonym EnemyType (atrybut kind, domyślnie KIND klasy); egzemplarz ma __slots__
+    tylko ze stanem zmiennym, więc fala z tysiącami wrogów zajmuje kilkukrotnie mniej pamięci.
+
+    Efekty statusowe (spowolnienie, podpalenie, ogłuszenie i kolejne z game.effects) trzymane są
+    w słowniku statuses: nazwa → pozostałe tury (0 — efekt wygasł); slowed/burning/stunned
+    to widoki na ten słownik.
+    Poza silnikiem fali turę efektów (effect_turn) liczy move() w każdym ticku; w silniku robi to
+    koło czasowe (effect_wheel), które odwiedza tylko wrogów z aktywnymi efektami lub regeneracją.
     """
+    __slots__ = (
+        "kind", "path", "hp", "spawn_delay", "path_index", "position", "alive", "reached_end",
+        "statuses", "kind_effects", "effect_plan", "effect_wheel", "effect_due", "effect_tick",
+        "skip_move", "_regen_counter", "rewarded", "marked_for_gold", "death_queue",
+    )
+    # Typ przeciwnika danej klasy (podklasy ustawiają własny)
+    KIND: Optional[EnemyType] = None
+
+    name = _type_field("name")
+    symbol = _type_field("symbol")
+    max_hp = _type_field("max_hp")
+    speed = _type_field("speed")
+    reward = _type_field("reward")
+    damage = _type_field("damage")
+    invisible = _type_field("invisible")
+    fire_immune = _type_field("fire_immune")
+    regenerates = _type_field("regenerates")
+    regen_interval = _type_field("regen_interval")
+    flying = _type_field("flying")
+
+    slowed = _status_field("slow")
+    burning = _status_field("burn")
+    stunned = _status_field("stun")
 
     def __init__(
         self,
         path: List[Tuple[int, int]],
-        name: str,
-        hp: int,
-        speed: int,
-        reward: int,
+        name: Optional[str] = None,
+        hp: int = 0,
+        speed: int = 1,
+        reward: int = 0,
         symbol: str = "👾",
         spawn_delay: int = 0,
-        damage: int = 1
+        damage: int = 1,
+        kind: Optional[EnemyType] = None
     ) -> None:
-        # Parametry bazowe
+        """
+        Parametry name/hp/speed/reward/symbol/damage tworzą własny typ wroga;
+        podklasy korzystają z KIND albo z przekazanego kind (np. przeskalowanego dla fali).
+        """
+        if kind is None:
+            kind = self.KIND if name is None else EnemyType(name, symbol, hp, speed, reward, damage).shared()
+        self.kind = kind
         self.path = path
-        self.name = name
-        self.hp = hp
-        self.max_hp = hp
-        self.speed = speed
-        self.reward = reward
-        self.symbol = symbol
-        self.spawn_delay = spawn_delay
-        self.damage = damage
 
         # Stan bieżący
+        self.hp: int = kind.max_hp
+        self.spawn_delay: int = spawn_delay
         self.path_index: int = 0
         self.position: Tuple[int, int] = path[0] if path else (0, 0)
         self.alive: bool = True
         self.reached_end: bool = False
 
-        # Efekty statusowe
-        self.slowed: int = 0
-        self.burning: int = 0
+        # Efekty statusowe (nazwa → pozostałe tury) i koło czasowe silnika, jeśli wróg jest na mapie
+        self.statuses: Optional[Dict[str, int]] = None
+        # Reguły efektów dla typu wroga i plan tury dla bieżącego zestawu efektów (None = do wyliczenia)
+        self.kind_effects = kind_effects(kind)
+        self.effect_plan: Optional[tuple] = None
+        self.effect_wheel = None
+        # Tick zaplanowanej tury w kole czasowym (0 = brak) i tick ostatniej tury
+        self.effect_due: int = 0
+        self.effect_tick: int = 0
         self.skip_move: bool = False
-        self.stunned: int = 0
-
-        # Flagowe cechy specjalne
-        self.invisible: bool = False
-        self.fire_immune: bool = False
-        self.regenerates: bool = False
         self._regen_counter: int = 0
-        self.regen_interval: int = 0
 
-    def apply_effects(self) -> None:
+        # Znaczniki ustawiane przez wieże i silnik fali
+        self.rewarded: bool = False
+        self.marked_for_gold: bool = False
+        # Kolejka, do której wróg dopisuje się w chwili śmierci (ustawiana przez silnik fali)
+        self.death_queue: Optional[List['Enemy']] = None
+
+    def add_status(self, name: str, duration: int) -> None:
         """
-        Nakłada efekty statusowe na przeciwnika (np. slow, burn, regen).
+        Nakłada efekt statusowy (nazwa z game.effects.STATUS_EFFECTS) zgodnie z jego regułą nakładania.
         """
-        if self.slowed > 0:
-            self.slowed -= 1
-            self.skip_move = True
+        statuses = self.statuses
+        current = statuses.get(name) if statuses else None
+        if current:
+            effect = STATUS_EFFECTS[name]
+            turns = duration if effect.STACKING == STACK_REFRESH else effect.stack(current, duration)
+            if turns > 0:
+                # Trwający efekt — wróg ma już zaplanowaną turę, zmienia się tylko licznik
+                statuses[name] = turns
+                return
+            self.set_status(name, turns)
         else:
-            self.skip_move = False
+            # Dla wroga bez tego efektu każda reguła nakładania daje stack(0, duration) == duration
+            self.set_status(name, duration)
 
-        if self.burning > 0 and not self.fire_immune:
-            self.burning -= 1
-            self.take_damage(1)
+    def set_status(self, name: str, turns: int) -> None:
+        """
+        Ustawia liczbę pozostałych tur efektu (0 wyłącza efekt) i planuje turę wroga w kole czasowym.
+        Wyłączony efekt zostaje w statuses z licznikiem 0, więc plan tury (effect_plan)
+        zmienia się tylko wtedy, gdy wróg dostaje efekt nowego rodzaju.
+        """
+        statuses = self.statuses
+        if statuses is None:
+            statuses = self.statuses = {}
+        if name not in statuses:
+            self.effect_plan = None
+        if turns <= 0:
+            statuses[name] = 0
+            return
+        statuses[name] = turns
+        wheel = self.effect_wheel
+        # Wróg z turą zaplanowaną na najbliższy tick nie wymaga zmian w kole
+        if wheel is not None and self.effect_due != wheel.now + 1 and self.kind_effects.rule(name) is not None:
+            wheel.schedule(self)
 
-        if self.regenerates and self._should_regenerate():
-            self.hp = min(self.hp + 1, self.max_hp)
+    def effect_turn(self) -> bool:
+        """
+        Tura efektów wroga, jak w Enemy.move: ogłuszenie (FREEZES) zabiera całą turę, inaczej
+        działają wszystkie pozostałe efekty i regeneracja. Ustawia skip_move, jeśli wróg w tej turze
+        się nie rusza; zwraca True, jeśli ma jeszcze działające efekty (koło czasowe planuje mu
+        wtedy turę w kolejnym ticku).
+        """
+        statuses = self.statuses
+        plan = self.effect_plan
+        if plan is None:
+            plan = self.effect_plan = self.kind_effects.plan(statuses)
+        freezes, steps = plan
+        for name in freezes:
+            left = statuses[name]
+            if left:
+                # Pozostałe efekty (i regeneracja) czekają na kolejną turę
+                statuses[name] = left - 1
+                self.skip_move = True
+                return has_effects(self)
+
+        skip = active = False
+        for name, holds, damage, fire in steps:
+            left = statuses[name]
+            if not left:
+                continue
+            statuses[name] = left - 1
+            if left > 1:
+                active = True
+            if damage:
+                self.take_damage(damage)
+            if fire is not None:
+                fire(self)
+            if holds:
+                skip = True
+        self.skip_move = skip
+
+        kind = self.kind
+        if kind.regenerates and self._should_regenerate():
+            self.hp = min(self.hp + 1, kind.max_hp)
+        return active
+
+    def apply_effects(self) -> bool:
+        """
+        Nakłada efekty statusowe na przeciwnika (np. slow, burn, regen) — jedna tura efektów.
+        """
+        return self.effect_turn()
 
     def _should_regenerate(self) -> bool:
         """
         Sprawdza, czy nadszedł moment na regenerację HP.
         """
         self._regen_counter += 1
-        if self._regen_counter >= self.regen_interval:
+        if self._regen_counter >= self.kind.regen_interval:
             self._regen_counter = 0
             return True
         return False
@@ -86,91 +253,107 @@ class Enemy:
             self.spawn_delay -= 1
             return
 
-        if self.stunned > 0:
-            self.stunned -= 1
-            return
-
-        self.apply_effects()
+        self.effect_turn()
         if self.skip_move:
             return
+        self.step()
 
-        next_index = self.path_index + self.speed
+    def step(self) -> None:
+        """
+        Sam ruch o jedną turę (bez efektów statusowych) — silnik fali liczy efekty osobno.
+        """
+        next_index = self.path_index + self.kind.speed
         if next_index >= len(self.path):
-            self.alive = False
             self.reached_end = True
+            self.die()
             return
 
         self.path_index = next_index
         self.position = self.path[self.path_index]
 
-    def take_damage(self, amount: int) -> None:
+    def take_damage(self, amount: int, damage_type: Optional[str] = None) -> None:
+        """
+        Zadaje obrażenia przeciwnikowi. damage_type (np. "fire") opisuje źródło obrażeń.
+        """
         self.hp -= amount
         if self.hp <= 0:
-            self.alive = False
+            self.die()
+
+    def die(self) -> None:
+        """
+        Oznacza wroga jako martwego i zgłasza go do kolejki śmierci silnika (jeśli jest ustawiona).
+        Wróg już martwy (np. zabity podpaleniem, który w tym samym ticku doszedł do końca ścieżki)
+        nie jest zgłaszany ponownie.
+        """
+        if not self.alive:
+            return
+        self.alive = False
+        if self.death_queue is not None:
+            self.death_queue.append(self)
 
 class Goblin(Enemy):
     """
     Goblin – podstawowy przeciwnik, niskie HP, niskie obrażenia.
     """
-    def __init__(self, path: List[Tuple[int, int]], delay: int = 0) -> None:
-        super().__init__(path, name="Goblin", hp=20, speed=1,
-                         reward=5, symbol="👺", spawn_delay=delay, damage=1)
+    __slots__ = ()
+    KIND = EnemyType("Goblin", "👺", max_hp=20, speed=1, reward=5, damage=1)
+
+    def __init__(self, path: List[Tuple[int, int]], delay: int = 0, kind: Optional[EnemyType] = None) -> None:
+        super().__init__(path, spawn_delay=delay, kind=kind)
 
 class Ork(Enemy):
     """
     Ork – silniejszy przeciwnik, większe obrażenia.
     """
-    def __init__(self, path: List[Tuple[int, int]], delay: int = 0) -> None:
-        super().__init__(path, name="Ork", hp=25, speed=1,
-                         reward=10, symbol="👹", spawn_delay=delay, damage=2)
+    __slots__ = ()
+    KIND = EnemyType("Ork", "👹", max_hp=25, speed=1, reward=10, damage=2)
+
+    def __init__(self, path: List[Tuple[int, int]], delay: int = 0, kind: Optional[EnemyType] = None) -> None:
+        super().__init__(path, spawn_delay=delay, kind=kind)
 
 class Smok(Enemy):
     """
     Smok – boss, dużo HP, duża nagroda, duże obrażenia.
     """
-    def __init__(self, path: List[Tuple[int, int]], delay: int = 0) -> None:
-        super().__init__(path, name="Smok", hp=100, speed=2,
-                         reward=50, symbol="🐉", spawn_delay=delay, damage=5)
+    __slots__ = ()
+    KIND = EnemyType("Smok", "🐉", max_hp=100, speed=2, reward=50, damage=5)
+
+    def __init__(self, path: List[Tuple[int, int]], delay: int = 0, kind: Optional[EnemyType] = None) -> None:
+        super().__init__(path, spawn_delay=delay, kind=kind)
 
 class Duch(Enemy):
     """
     Duch – niewidzialny przeciwnik (trudniejszy do trafienia).
     """
-    def __init__(self, path: List[Tuple[int, int]], delay: int = 0) -> None:
-        super().__init__(path, name="Duch", hp=15, speed=1,
-                         reward=12, symbol="👻", spawn_delay=delay, damage=1)
-        self.invisible = True
+    __slots__ = ()
+    KIND = EnemyType("Duch", "👻", max_hp=15, speed=1, reward=12, damage=1, invisible=True)
+
+    def __init__(self, path: List[Tuple[int, int]], delay: int = 0, kind: Optional[EnemyType] = None) -> None:
+        super().__init__(path, spawn_delay=delay, kind=kind)
 
 class Nietoperz(Enemy):
     """
     Nietoperz – porusza się po prostej z punktu startowego do bazy (ignoruje ścieżkę mapy).
     """
+    __slots__ = ("target",)
+    KIND = EnemyType("Nietoperz", "🦇", max_hp=5, speed=2, reward=8, damage=1, flying=True)
+
     def __init__(
         self,
         path: List[Tuple[int, int]],
         delay: int = 0,
         start: Tuple[int, int] = (0, 0),
-        target: Tuple[int, int] = (0, 0)
+        target: Tuple[int, int] = (0, 0),
+        kind: Optional[EnemyType] = None
     ) -> None:
-        super().__init__(path, name="Nietoperz", hp=5, speed=2,
-                         reward=8, symbol="🦇", spawn_delay=delay, damage=1)
+        super().__init__(path, spawn_delay=delay, kind=kind)
         self.position = start
-        self.flying = True
         self.target = target
 
-    def move(self, all_enemies: Optional[List['Enemy']] = None) -> None:
+    def step(self) -> None:
         """
-        Przemieszcza Nietoperza po linii prostej do bazy (nie po ścieżce).
+        Krok o jedno pole w stronę bazy (w pionie i poziomie naraz).
         """
-        if not self.alive:
-            return
-        if self.spawn_delay > 0:
-            self.spawn_delay -= 1
-            return
-        if self.stunned > 0:
-            self.stunned -= 1
-            return
-
         x, y = self.position
         tx, ty = self.target
         dx = (1 if tx > x else -1) if tx != x else 0
@@ -178,30 +361,32 @@ class Nietoperz(Enemy):
         self.position = (x + dx, y + dy)
 
         if self.position == self.target:
-            self.alive = False
             self.reached_end = True
+            self.die()
 
 class Troll(Enemy):
     """
     Troll – przeciwnik regenerujący HP co kilka tur.
     """
-    def __init__(self, path: List[Tuple[int, int]], delay: int = 0) -> None:
-        super().__init__(path, name="Troll", hp=35, speed=1,
-                         reward=15, symbol="🧌", spawn_delay=delay, damage=3)
-        self.regenerates = True
-        self.regen_interval = 5
-        self._regen_counter = 0
+    __slots__ = ()
+    KIND = EnemyType("Troll", "🧌", max_hp=35, speed=1, reward=15, damage=3, regenerates=True, regen_interval=5)
+
+    def __init__(self, path: List[Tuple[int, int]], delay: int = 0, kind: Optional[EnemyType] = None) -> None:
+        super().__init__(path, spawn_delay=delay, kind=kind)
 
 class Pajak(Enemy):
-    def __init__(self, path: List[Tuple[int, int]], delay: int = 0) -> None:
-        super().__init__(path, name="Pająk", hp=10, speed=1,
-                         reward=12, symbol="🕷️", spawn_delay=delay, damage=2)
+    __slots__ = ()
+    KIND = EnemyType("Pająk", "🕷️", max_hp=10, speed=1, reward=12, damage=2)
+
+    def __init__(self, path: List[Tuple[int, int]], delay: int = 0, kind: Optional[EnemyType] = None) -> None:
+        super().__init__(path, spawn_delay=delay, kind=kind)
 
 class Rycerz(Enemy):
     """
     Rycerz – odporny na podpalenia.
     """
-    def __init__(self, path: List[Tuple[int, int]], delay: int = 0) -> None:
-        super().__init__(path, name="Rycerz", hp=18, speed=1,
-                         reward=18, symbol="🛡️", spawn_delay=delay, damage=4)
-        self.fire_immune = True
\ No newline at end of file
+    __slots__ = ()
+    KIND = EnemyType("Rycerz", "🛡️", max_hp=18, speed=1, reward=18, damage=4, fire_immune=True)
+
+    def __init__(self, path: List[Tuple[int, int]], delay: int = 0, kind: Optional[EnemyType] = None) -> None:
+        super().__init__(path, spawn_delay=delay, kind=kind)
@@ -0,0 +1,526 @@
+from collections import deque
+from heapq import heapify, heappop, heappush
+from typing import Dict, List, Optional, Tuple
+
+from game.coverage import CoverageIndex
+from game.effects import EffectWheel
+from game.map import Map
+from game.profiler import TickProfiler
+from game.progress import ProgressIndex
+from game.rng import new_seed, stream
+from game.tower import TARGET_FIRST, TARGET_WEAKEST
+from game.vectorized import RangeMatrix
+from game.wave import Wave
+
+# Rodzaje zdarzeń zgłaszanych przez silnik w trakcie jednego ticku
+EVENT_BASE_ENTRY = "base_entry"
+EVENT_REWARD = "reward"
+EVENT_SHOT = "shot"
+
+
+class TickEvent:
+    """
+    Pojedyncze zdarzenie z ticku fali (wejście do bazy, nagroda, strzał wieży).
+    Silnik tylko je zgłasza — prezentacją (dźwięk, powiadomienia) zajmuje się renderer.
+    """
+
+    def __init__(self, kind: str, enemy=None, tower=None, amount: int = 0) -> None:
+        self.kind = kind
+        self.enemy = enemy
+        self.tower = tower
+        self.amount = amount
+
+    def __repr__(self) -> str:
+        return f"TickEvent({self.kind!r}, amount={self.amount})"
+
+
+class WaveResult:
+    """
+    Podsumowanie rozegranej fali.
+    """
+
+    def __init__(
+        self,
+        wave_number: int,
+        ticks: int,
+        defeated: int,
+        survived: int,
+        gold_earned: int,
+        lives_lost: int
+    ) -> None:
+        self.wave_number = wave_number
+        self.ticks = ticks
+        self.defeated = defeated
+        self.survived = survived
+        self.gold_earned = gold_earned
+        self.lives_lost = lives_lost
+
+    def __repr__(self) -> str:
+        return (
+            f"WaveResult(wave={self.wave_number}, ticks={self.ticks}, defeated={self.defeated}, "
+            f"survived={self.survived}, gold={self.gold_earned}, lives_lost={self.lives_lost})"
+        )
+
+
+class HeadlessGame:
+    """
+    Minimalny stan gry bez interfejsu, menu i dźwięku.
+    Posiada te same pola co Game, z których korzysta silnik fali — do symulacji i testów.
+    """
+
+    def __init__(
+        self,
+        prefs: dict,
+        map_type: int = 1,
+        username: str = "headless",
+        seed: Optional[int] = None
+    ) -> None:
+        self.username = username
+        self.difficulty = prefs.get("mode", "Normal")
+        self.seed = seed if seed is not None else new_seed()
+        self.rng = None
+        self.map_type = map_type
+        self.map = Map(map_type=map_type, rng=stream(self.seed, "map"))
+        self.gold = prefs["starting_gold"]
+        self.lives = prefs["starting_lives"]
+        self.num_waves = prefs["num_waves"]
+        self.hp_scale_per_wave = prefs["hp_scale_per_wave"]
+        self.reward_scale_per_wave = prefs["reward_scale_per_wave"]
+        self.wave_number = 0
+        self.enemies = []
+        self.towers = []
+        self.game_speed = 1.0
+        self.notifications = []
+        self.stats = {
+            "zabici_przeciwnicy": 0,
+            "wydane_zloto": 0,
+            "liczba_ulepszen": 0,
+            "towers_built": 0,
+            "max_gold_ever": self.gold
+        }
+        self.achievements = {
+            "sto_pokonanych": False,
+            "bogacz": False,
+            "architekt": False
+        }
+
+    def snapshot(self) -> dict:
+        """
+        Stan gry w układzie zapisu, jak Game.snapshot.
+        """
+        # Import lokalny — game.game importuje silnik fali
+        from game.game import Game
+
+        return Game.snapshot(self)
+
+    def update_achievements(self) -> None:
+        self.achievements = {
+            "sto_pokonanych": self.stats.get("zabici_przeciwnicy", 0) >= 100,
+            "bogacz": self.stats.get("max_gold_ever", 0) >= 1000,
+            "architekt": self.stats.get("towers_built", 0) >= 20,
+        }
+
+
+class WaveEngine:
+    """
+    Silnik pojedynczej fali oparty na tickach.
+    Realizuje ruch przeciwników, ataki wież i przyznawanie nagród — bez UI, pauz i dźwięku.
+    Każde wywołanie tick() zwraca listę zdarzeń, które może narysować interaktywna pętla.
+
+    Przy indexed=True wieże dostają tylko wrogów z pokrytych pól ścieżki (CoverageIndex)
+    oraz latających, pobranych z przyrostowego indeksu postępu (ProgressIndex); wieże celujące
+    w najdalszego wroga dostają od razu wynik zapytania first_in_range.
+    indexed=False to pełny skan każdej wieży po wszystkich żywych wrogach; vectorized=True
+    (wyłącza indexed) liczy zasięg, cooldown i wybór celu macierzą NumPy (RangeMatrix) raz na tick
+    dla wszystkich wież — szybciej niż pełny skan, ale wolniej niż indexed=True.
+
+    Zgony nie są wyszukiwane skanem: wróg ginący od obrażeń lub po dojściu do bazy dopisuje się
+    do kolejki śmierci (Enemy.death_queue), którą silnik opróżnia pod koniec ticku (nagrody,
+    licznik żywych). Ruch przegląda listę aktywnych wrogów, z której martwi są co jakiś czas
+    usuwani, więc koszt ticku zależy od liczby żywych, a nie wszystkich wrogów fali.
+
+    Wrogowie czekający na wejście leżą w kolejce spawnu uporządkowanej po ticku wejścia
+    (spawn_delay z fali) i nie kosztują nic, dopóki nie wejdą na mapę. Wróg z opóźnieniem d
+    pojawia się na polu startowym w ticku d (po fazie ruchu) i rusza w ticku d + 1.
+    Efekty statusowe (ogłuszenie, spowolnienie, podpalenie, regeneracja) liczy koło czasowe
+    (EffectWheel) na początku ticku — odwiedzani są tylko wrogowie z aktywnymi efektami,
+    a pętla ruchu wywołuje już sam krok wroga (Enemy.step).
+    Przy indexed=True wieże czekają w kolejce priorytetowej po ticku gotowości (koniec cooldownu),
+    więc przeładowujące wieże nie kosztują nic w kolejnych tickach. Wieża, która nie znalazła
+    celu, zasypia i budzi się dopiero, gdy wróg wejdzie na pole w jej zasięgu. Laserowa bez celu
+    i tak zaczyna cooldown — śpiąca pamięta więc rytm (faza, okres) swoich kolejnych gotowości.
+    Pole cooldown wież uzupełniane jest pod koniec fali.
+    game.enemies zawiera wrogów, którzy weszli już na mapę (w kolejności wejścia) — tylko ich
+    widzą wieże i renderer; po fali to pełna lista wrogów fali (podsumowanie).
+    profiler (TickProfiler) – opcjonalny pomiar czasu sekcji ticku i liczników.
+    """
+
+    def __init__(
+        self,
+        game,
+        indexed: bool = True,
+        profiler: Optional[TickProfiler] = None,
+        vectorized: bool = False
+    ) -> None:
+        self.game = game
+        # Macierz NumPy zastępuje indeksy pokrycia i postępu
+        self.indexed = indexed and not vectorized
+        self.vectorized = vectorized
+        self.profiler = profiler
+        self.coverage: Optional[CoverageIndex] = None
+        self.progress: Optional[ProgressIndex] = None
+        self.ranges: Optional[RangeMatrix] = None
+        self.ticks: int = 0
+        self.gold_earned: int = 0
+        self.lives_lost: int = 0
+        self.alive_count: int = 0
+        # (kolejność na liście fali, wróg) dla wrogów, którzy jeszcze mogą żyć
+        self._active: List[tuple] = []
+        self._active_dead: int = 0
+        self._deaths: list = []
+        # (tick wejścia, wróg) — wrogowie czekający na wejście na mapę
+        self._spawn_queue: deque = deque()
+        self.effects = EffectWheel()
+        # Kolejka (tick gotowości, numer wieży) i wieże śpiące: numer -> (najbliższa gotowość, okres)
+        self._ready: List[Tuple[int, int]] = []
+        self._idle: Dict[int, Tuple[int, int]] = {}
+        # Numery wież pilnujących danego indeksu ścieżki / pola (dla latających)
+        self._watchers: List[List[int]] = []
+        self._tile_watchers: Dict[Tuple[int, int], List[int]] = {}
+        # Indeksy ścieżki w zasięgu każdej wieży (numer wieży -> CoverageIndex.covered_indices)
+        # i liczba śpiących wież pilnujących każdego indeksu ścieżki
+        self._covered: List[List[int]] = []
+        self._asleep: List[int] = []
+
+    def start(self) -> None:
+        """
+        Zwiększa numer fali i generuje jej przeciwników.
+        Każda fala dostaje własny strumień losowy wyprowadzony z ziarna gry — używa go
+        skład fali i efekty wież (np. ogłuszenie), więc fala N jest zawsze taka sama.
+        """
+        game = self.game
+        game.wave_number += 1
+        if getattr(game, "seed", None) is not None:
+            game.rng = stream(game.seed, "wave", game.wave_number)
+        wave = Wave(
+            game.wave_number,
+            game.map.path,
+            game.map.start,
+            game.map.base,
+            hp_scale_per_wave=game.hp_scale_per_wave,
+            reward_scale_per_wave=game.reward_scale_per_wave,
+            rng=getattr(game, "rng", None)
+        )
+        game.enemies = []
+        self.effects = EffectWheel()
+        self._deaths = []
+        self._active = []
+        self._active_dead = 0
+        self.alive_count = len(wave.enemies)
+        self._spawn_queue = deque(sorted(
+            ((enemy.spawn_delay, order, enemy) for order, enemy in enumerate(wave.enemies)),
+            key=lambda item: item[:2]
+        ))
+        if self.indexed:
+            self.coverage = CoverageIndex(game.map.path, game.towers, game.map.path_index)
+            self.progress = ProgressIndex(
+                (), track_hp=any(t.TARGETING == TARGET_WEAKEST for t in game.towers)
+            )
+            self._schedule_towers()
+        elif self.vectorized:
+            self.ranges = RangeMatrix(game.towers, capacity=len(wave.enemies))
+        self._spawn_due()
+
+    def _schedule_towers(self) -> None:
+        """
+        Ustawia kolejkę gotowości wież według cooldownu pozostałego z poprzedniej fali.
+        """
+        towers = self.game.towers
+        orders = {id(tower): order for order, tower in enumerate(towers)}
+        self._watchers = [[orders[id(t)] for t in at] for at in self.coverage.by_index]
+        self._covered = [self.coverage.covered_indices(tower) for tower in towers]
+        self._asleep = [0] * len(self._watchers)
+        self._tile_watchers = {}
+        self._idle = {}
+        self._ready = [(tower.cooldown + 1, order) for order, tower in enumerate(towers)]
+        heapify(self._ready)
+
+    def _wake(self, watchers: List[int]) -> None:
+        """
+        Budzi śpiące wieże z listy: wracają do kolejki na najbliższy tick gotowości
+        nie wcześniejszy niż bieżący.
+        """
+        idle = self._idle
+        asleep = self._asleep
+        tick = self.ticks
+        for order in watchers:
+            if order in idle:
+                ready, period = idle.pop(order)
+                for idx in self._covered[order]:
+                    asleep[idx] -= 1
+                if ready < tick:
+                    ready += -(-(tick - ready) // period) * period
+                heappush(self._ready, (ready, order))
+
+    def _wake_at(self, enemy) -> None:
+        """
+        Budzi wieże pilnujące pola, na które wszedł wróg.
+        """
+        if not enemy.flying:
+            if self._asleep[enemy.path_index]:
+                self._wake(self._watchers[enemy.path_index])
+            return
+        tile = enemy.position
+        watchers = self._tile_watchers.get(tile)
+        if watchers is None:
+            watchers = self._tile_watchers[tile] = [
+                order for order, tower in enumerate(self.game.towers) if tower.covers(tile)
+            ]
+        self._wake(watchers)
+
+    def _sync_cooldowns(self) -> None:
+        """
+        Przepisuje cooldown wież z kolejki gotowości (po fali — przechodzi na kolejną).
+        """
+        tick = self.ticks
+        towers = self.game.towers
+        for ready, order in self._ready:
+            towers[order].cooldown = max(0, ready - tick - 1)
+        for order, (ready, period) in self._idle.items():
+            if ready <= tick:
+                ready += ((tick - ready) // period + 1) * period
+            towers[order].cooldown = ready - tick - 1
+
+    def _spawn_due(self) -> None:
+        """
+        Wprowadza na mapę wrogów z kolejki spawnu, których tick wejścia już nadszedł.
+        """
+        queue = self._spawn_queue
+        enemies = self.game.enemies
+        progress = self.progress
+        while queue and queue[0][0] <= self.ticks:
+            _, _, enemy = queue.popleft()
+            enemy.spawn_delay = 0
+            enemy.death_queue = self._deaths
+            self.effects.track(enemy)
+            self._active.append((len(enemies), enemy))
+            enemies.append(enemy)
+            if progress is not None:
+                progress.add(enemy)
+            if self._idle:
+                self._wake_at(enemy)
+
+    @property
+    def running(self) -> bool:
+        return self.alive_count > 0
+
+    def tick(self) -> List[TickEvent]:
+        """
+        Wykonuje jeden krok symulacji: ruch wrogów, ataki wież, nagrody.
+        """
+        game = self.game
+        events: List[TickEvent] = []
+        self.ticks += 1
+        profiler = self.profiler
+        if profiler is not None:
+            tick_start = start = profiler.clock()
+
+        # Efekty statusowe: tylko wrogowie, których tura efektu przypada na ten tick
+        turns = self.effects.advance(self.ticks)
+        progress = self.progress
+        track_hp = progress is not None and progress.track_hp
+        if profiler is not None:
+            profiler.count("efekty", len(turns))
+            start = profiler.add("efekty", start)
+
+        # Ruch przeciwników po ścieżce (wróg zabity podpaleniem w tym ticku też wykonuje krok)
+        base = game.map.base
+        idle = self._idle
+        asleep = self._asleep
+        moved = 0
+        tick = self.ticks
+        for order, enemy in self._active:
+            if not enemy.alive and enemy.effect_tick != tick:
+                continue
+            moved += 1
+            path_index, position = enemy.path_index, enemy.position
+            if enemy.skip_move:
+                # Wróg stoi tylko w ticku swojej tury efektów
+                enemy.skip_move = False
+            else:
+                enemy.step()
+                if idle and enemy.position != position and (asleep[enemy.path_index] or enemy.flying):
+                    self._wake_at(enemy)
+            if enemy.position == base:
+                self._enemy_entered_base(enemy)
+                events.append(TickEvent(EVENT_BASE_ENTRY, enemy=enemy, amount=enemy.damage))
+            # HP zmienia się tylko w turze efektów (podpalenie, regeneracja), przed ruchem;
+            # indeks postępu śledzi HP tylko dla wież "weakest" (track_hp)
+            if progress is not None and (
+                not enemy.alive or enemy.path_index != path_index
+                or (track_hp and enemy.effect_tick == tick)
+            ):
+                progress.update(order, enemy)
+        if self._spawn_queue and self._spawn_queue[0][0] <= self.ticks:
+            self._spawn_due()
+        if profiler is not None:
+            profiler.count("wrogowie_w_ruchu", moved)
+            start = profiler.add("ruch", start)
+
+        # Atak wież na przeciwników
+        if self.coverage is not None:
+            self._attack_indexed(events)
+        elif self.ranges is not None:
+            self._attack_vectorized(events)
+        else:
+            alive = [enemy for _, enemy in self._active if enemy.alive]
+            for tower in game.towers:
+                self._tower_attack(tower, alive, events)
+        if profiler is not None:
+            start = profiler.add("ataki", start)
+
+        # Przyznawanie nagród za pokonanych — tylko wrogowie zmarli w tym ticku
+        deaths = self._deaths
+        for enemy in deaths:
+            if not enemy.reached_end and not enemy.rewarded:
+                reward = self._reward_enemy(enemy)
+                events.append(TickEvent(EVENT_REWARD, enemy=enemy, amount=reward))
+        self.alive_count -= len(deaths)
+        self._active_dead += len(deaths)
+        deaths.clear()
+        if not self.alive_count:
+            if self.coverage is not None:
+                self._sync_cooldowns()
+            elif self.ranges is not None:
+                self.ranges.store_cooldowns()
+        # Kompakcja listy aktywnych, gdy martwi stanowią jej połowę
+        if 2 * self._active_dead >= len(self._active) and self._active_dead:
+            self._active = [item for item in self._active if item[1].alive]
+            self._active_dead = 0
+        if profiler is not None:
+            profiler.add("nagrody", start)
+            profiler.end_tick(tick_start)
+
+        return events
+
+    def _attack_indexed(self, events: List[TickEvent]) -> None:
+        """
+        Ataki wież z użyciem indeksu pokrycia i indeksu postępu: atakują tylko wieże, których
+        tick gotowości właśnie nadszedł (w kolejności z listy wież). Wieża, która trafiła,
+        wraca do kolejki na koniec swojego cooldownu; wieża bez celu zasypia.
+        """
+        towers = self.game.towers
+        covered_by = self._covered
+        progress = self.progress
+        track_hp = progress.track_hp
+        profiler = self.profiler
+        ready = self._ready
+        tick = self.ticks
+        while ready and ready[0][0] <= tick:
+            _, order = heappop(ready)
+            tower = towers[order]
+            tower.cooldown = 0
+            hits = tower.hits
+            # Wieże "weakest" i "first" dostają gotowy cel z zapytania indeksu, pozostałe —
+            # kandydatów w kolejności z listy wrogów, więc wybór celu jest identyczny jak przy
+            # pełnym skanie.
+            covered = covered_by[order]
+            if tower.TARGETING == TARGET_WEAKEST:
+                target = progress.weakest_in_range(tower, covered)
+                targets = () if target is None else (target,)
+            elif tower.TARGETING == TARGET_FIRST:
+                target = progress.first_in_range(tower, covered)
+                targets = () if target is None else (target,)
+            else:
+                targets = progress.candidates(covered)
+            if profiler is None:
+                tower.attack(targets)
+            else:
+                self._profile_attack(tower, targets)
+            # Trafienie zmienia w indeksie tylko HP (śledzone przy track_hp) albo zabija wroga
+            for enemy in targets:
+                if track_hp or not enemy.alive:
+                    progress.refresh(enemy)
+            if tower.hits > hits:
+                events.append(TickEvent(EVENT_SHOT, tower=tower, amount=tower.hits - hits))
+                heappush(ready, (tick + tower.cooldown + 1, order))
+            else:
+                # Brak celu — wieża śpi do wejścia wroga w jej zasięg
+                self._idle[order] = (tick + tower.cooldown + 1, tower.cooldown + 1)
+                for idx in covered:
+                    self._asleep[idx] += 1
+
+    def _attack_vectorized(self, events: List[TickEvent]) -> None:
+        """
+        Ataki wież z macierzą zasięgu NumPy: zasięg, widoczność i cooldown liczone są raz
+        na tick dla wszystkich wież, a cel każdej strzelającej wieży wybierany z bieżących HP
+        (po strzałach wcześniejszych wież), więc wynik jest identyczny jak przy pełnym skanie.
+        """
+        ranges = self.ranges
+        # Także wrogowie zmarli od ostatniego ticku — ich kolumny dostają alive=False
+        ranges.update([enemy for _, enemy in self._active])
+        towers = self.game.towers
+        cooldown = ranges.cooldown
+        for i in ranges.ready():
+            tower = towers[i]
+            targets = ranges.targets(i)
+            tower.cooldown = 0
+            self._tower_attack(tower, targets, events)
+            cooldown[i] = tower.cooldown
+            ranges.refresh(targets)
+
+    def _tower_attack(self, tower, enemies, events: List[TickEvent]) -> None:
+        hits = tower.hits
+        if self.profiler is None:
+            tower.attack(enemies)
+        else:
+            self._profile_attack(tower, enemies)
+        if tower.hits > hits:
+            events.append(TickEvent(EVENT_SHOT, tower=tower, amount=tower.hits - hits))
+
+    def _profile_attack(self, tower, enemies) -> None:
+        profiler = self.profiler
+        hits = tower.hits
+        start = profiler.clock()
+        tower.attack(enemies)
+        profiler.add(f"atak:{type(tower).__name__}", start)
+        profiler.count("przeskanowane_cele", len(enemies))
+        profiler.count("strzały", tower.hits - hits)
+
+    def _enemy_entered_base(self, enemy) -> None:
+        enemy.reached_end = True
+        enemy.die()
+        self.game.lives -= enemy.damage
+        self.lives_lost += enemy.damage
+
+    def _reward_enemy(self, enemy) -> int:
+        reward = int(enemy.reward * (1.5 if enemy.marked_for_gold else 1))
+        game = self.game
+        game.gold += reward
+        enemy.rewarded = True
+        game.stats["zabici_przeciwnicy"] += 1
+        game.update_achievements()
+        self.gold_earned += reward
+        return reward
+
+    def result(self) -> WaveResult:
+        enemies = self.game.enemies
+        return WaveResult(
+            self.game.wave_number,
+            self.ticks,
+            sum(1 for e in enemies if e.rewarded),
+            sum(1 for e in enemies if e.reached_end),
+            self.gold_earned,
+            self.lives_lost
+        )
+
+
+def simulate_wave(game, engine: Optional[WaveEngine] = None) -> WaveResult:
+    """
+    Rozgrywa całą falę bez interfejsu i zwraca jej podsumowanie.
+    """
+    engine = engine or WaveEngine(game)
+    engine.start()
+    while engine.running:
+        engine.tick()
+    return engine.result()
@@ -1,6 +1,5 @@
 import os
 import sys
-import json
 import logging
 import re
 
@@ -8,8 +7,12 @@ from game.building import Building
 from game.wave_loop import WaveLoop
 from game import database
 from game.map import Map
+from game.autosave import AutosaveQueue
+from game.replay import ReplayLog
+from game.rng import new_seed, stream
 from game.sound import sound_manager
 from game.settings import load_prefs
+from game.utils import column_index
 from typing import Tuple, Optional
 from game.ranking import Ranking
 from game.menu import GameMenu
@@ -17,6 +20,10 @@ from game.menu import GameMenu
 from rich.console import Console
 from rich.panel import Panel
 
+# Współrzędne pola: litery kolumny + numer wiersza (B4, AB120) albo kolumna,wiersz (28,120)
+_LETTER_COORDS = re.compile(r"([A-Z]{1,3})(\d{1,4})")
+_NUMERIC_COORDS = re.compile(r"(\d{1,4})\s*[,;]\s*(\d{1,4})")
+
 class Game(WaveLoop, Building, Ranking):
     """
     Główna klasa gry.
@@ -48,6 +55,15 @@ class Game(WaveLoop, Building, Ranking):
         self.notifications = []
         self.save_file = None
         self.slot = None
+        # Ziarno gry i bieżący strumień losowy (mapa, skład fal, efekty wież)
+        self.seed = None
+        self.rng = None
+        # Dziennik powtórki (budowy, ulepszenia, fale, tempo) zapisywany razem z grą
+        self.replay = None
+        # Kolejka zapisów w tle
+        self.autosave = AutosaveQueue()
+        # Opcjonalny profiler ticków fali (main.py --profile)
+        self.profiler = None
 
         # Załaduj preferencje
         prefs = load_prefs()
@@ -150,7 +166,11 @@ class Game(WaveLoop, Building, Ranking):
         Tworzy nową mapę, zeruje fale, złoto, statystyki i powiadomienia.
         """
         self.difficulty = prefs["mode"]
-        self.map = Map(map_type=self.map_type)
+        self.seed = new_seed()
+        self.rng = None
+        self.map = Map(map_type=self.map_type, rng=stream(self.seed, "map"))
+        self.replay = ReplayLog(self.seed, self.map_type, prefs)
+        self.autosave.forget()
         self.towers.clear()
         self.gold = prefs["starting_gold"]
         self.lives = prefs["starting_lives"]
@@ -179,18 +199,19 @@ class Game(WaveLoop, Building, Ranking):
             f"Nowa gra utworzona dla gracza {self.username}, tryb: {self.difficulty}, mapa: {self.map_type}, slot: {self.slot}"
         )
 
-    def save_game(self):
+    def snapshot(self) -> dict:
         """
-        Zapisuje stan gry do bazy w aktualnym slocie.
-        Serializuje całą logikę: mapę, wieże, statystyki, poziom fali itd.
+        Zwraca stan gry w układzie zapisu: mapę, wieże, statystyki, poziom fali itd.
+        Korzysta tylko z pól wspólnych z HeadlessGame (HeadlessGame.snapshot).
         """
-        data = {
+        return {
             "username": self.username,
             "difficulty": self.difficulty,
+            "seed": self.seed,
             "gold": self.gold,
             "lives": self.lives,
             "wave": self.wave_number,
-            "stats": self.stats,
+            "stats": self.stats.copy(),
             "hp_scale_per_wave": self.hp_scale_per_wave,
             "reward_scale_per_wave": self.reward_scale_per_wave,
             "map": {
@@ -203,27 +224,42 @@ class Game(WaveLoop, Building, Ranking):
             "towers": [(t.name, t.x, t.y, t.level) for t in self.towers],
             "achievements": self.achievements.copy(),
         }
-        json_data = json.dumps(data)
+
+    def save_game(self):
+        """
+        Zapisuje stan gry (snapshot) do bazy w aktualnym slocie.
+        Sam zapis wykonuje w tle kolejka autosave; flush() czeka na jego zakończenie.
+        """
+        data = self.snapshot()
         if self.slot is None:
             self.slot = 1
-        database.save_game(self.username, self.slot, json_data)
+        replay = self.replay.to_json() if self.replay is not None else None
+
+        # Zapis do bazy odbywa się w tle (AutosaveQueue), bez czekania na dysk
+        self.autosave.submit(self.username, self.slot, data, replay=replay)
         logging.info(f"Zapisano grę: użytkownik={self.username}, slot={self.slot}")
         print("💾 Gra zapisana do bazy danych.")
 
     def parse_coordinates(self, s: str) -> Tuple[Optional[int], Optional[int]]:
         """
-        Parsuje współrzędne planszy w formacie np. 'A5' na indeksy (x, y).
+        Parsuje współrzędne planszy na indeksy (x, y).
+        Akceptuje kolumnę literową i numer wiersza (np. 'A5', 'AB120')
+        albo parę liczb kolumna,wiersz liczonych od 1 (np. '28,120') — wygodniejszą na dużych mapach.
         """
-        if not re.fullmatch(r"[A-Z]\d{1,2}", s.upper()):
-            return None, None
-        try:
-            col = ord(s[0].upper()) - ord('A')
-            row = int(s[1:]) - 1
-            if 0 <= col < self.map.WIDTH and 0 <= row < self.map.HEIGHT:
-                logging.debug(f"Parsowanie koordynatów z wejścia: {s} → ({col}, {row})")
-                return col, row
-        except (IndexError, ValueError, TypeError):
-            pass
+        text = s.strip().upper()
+        match = _LETTER_COORDS.fullmatch(text)
+        if match:
+            col = column_index(match.group(1))
+            row = int(match.group(2)) - 1
+        else:
+            match = _NUMERIC_COORDS.fullmatch(text)
+            if not match:
+                return None, None
+            col = int(match.group(1)) - 1
+            row = int(match.group(2)) - 1
+        if 0 <= col < self.map.WIDTH and 0 <= row < self.map.HEIGHT:
+            logging.debug(f"Parsowanie koordynatów z wejścia: {s} → ({col}, {row})")
+            return col, row
         return None, None
 
     def show_achievements(self):
@@ -1,30 +1,51 @@
-import json
 import logging
 from game.map import Map
-from game import database
-from game.tower import Strzelajaca, CiezkaArmatnia, Lodowa, MagiaOgnia, Laserowa
+from game.replay import ReplayLog
+from game.rng import new_seed, stream
+from game import database, save_format
+from game.tower import TOWER_CLASSES
 
 def load_game(game) -> bool:
     """
     Wczytuje zapis gry danego gracza z bazy.
     """
+    game.autosave.flush()
     try:
         json_data = database.load_game(game.username, game.slot)
         if not json_data:
             return False
-        data = json_data if isinstance(json_data, dict) else json.loads(json_data)
+        data = json_data if isinstance(json_data, dict) else save_format.loads(json_data)
     except Exception as e:
         logging.error(f"Błąd wczytywania zapisu z bazy: {e}")
         return False
 
     _load_game_data(game, data)
+    _load_replay(game)
     return True
 
+def _load_replay(game):
+    """
+    Wczytuje dziennik powtórki zapisu. Zapisy bez dziennika (lub z uszkodzonym) dalej go nie prowadzą,
+    bo bez historii od początku gry powtórka nie byłaby zgodna ze stanem.
+    """
+    game.replay = None
+    try:
+        text = database.load_replay(game.username, game.slot)
+        if text:
+            game.replay = ReplayLog.from_json(text)
+    except Exception as e:
+        logging.error(f"Błąd wczytywania dziennika powtórki: {e}")
+
 def _load_game_data(game, data: dict):
     """
     Ładuje właściwe dane do obiektu Game — odtwarza stan gry, mapę, wieże, statystyki, osiągnięcia.
     """
     game.difficulty = data.get("difficulty", "Normal")
+    # Starsze zapisy nie mają ziarna — dostają nowe
+    game.seed = data.get("seed") if data.get("seed") is not None else new_seed()
+    game.rng = None
+    # Następny zapis będzie pełny (kompaktuje delty wczytanego zapisu)
+    game.autosave.forget()
     game.gold = data["gold"]
     game.lives = data["lives"]
     game.wave_number = data["wave"]
@@ -49,22 +70,17 @@ def _load_game_data(game, data: dict):
     # Odtworzenie mapy: układ, ścieżka, start, baza
     m = data["map"]
     game.map_type = m["map_type"]
-    game.map = Map(map_type=game.map_type)
+    game.map = Map(map_type=game.map_type, rng=stream(game.seed, "map"),
+                   width=len(m["grid"][0]), height=len(m["grid"]))
     game.map.grid = m["grid"]
-    game.map.path = [(int(x), int(y)) for x, y in m["path"]]
+    game.map.set_path([(int(x), int(y)) for x, y in m["path"]])
     game.map.start = (int(m["start"][0]), int(m["start"][1]))
     game.map.base = (int(m["base"][0]), int(m["base"][1]))
 
     # Wieże: przywrócenie lokalizacji, typów, poziomów
     game.towers.clear()
     for name, x, y, lvl in data["towers"]:
-        cls = {
-            "Strzelająca": Strzelajaca,
-            "Ciężka Armatnia": CiezkaArmatnia,
-            "Lodowa": Lodowa,
-            "Magia Ognia": MagiaOgnia,
-            "Laserowa": Laserowa
-        }[name]
+        cls = TOWER_CLASSES[name]
         t = cls(x, y)
         t.game = game
         for _ in range(lvl - 1):
@@ -1,5 +1,5 @@
 import random
-from typing import List, Tuple
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
 from game.config import MAP_WIDTH, MAP_HEIGHT
 
 class Map:
@@ -11,19 +11,33 @@ class Map:
         "start": "◆"
     }
 
-    def __init__(self, map_type: int = 1):
+    def __init__(
+        self,
+        map_type: int = 1,
+        rng: Optional[random.Random] = None,
+        width: Optional[int] = None,
+        height: Optional[int] = None
+    ):
         """
-        Inicjalizuje pustą siatkę oraz wybraną ścieżkę:
+        Inicjalizuje pustą siatkę oraz wybraną ścieżkę.
+        rng – strumień losowy gry (domyślnie globalny moduł random).
+        width/height – wymiary planszy (domyślnie MAP_WIDTH × MAP_HEIGHT z konfiguracji).
         """
-        self.WIDTH: int = MAP_WIDTH
-        self.HEIGHT: int = MAP_HEIGHT
+        self.rng = rng if rng is not None else random
+        self.WIDTH: int = width or MAP_WIDTH
+        self.HEIGHT: int = height or MAP_HEIGHT
         self.grid: List[List[str]] = [
             [self.SYMBOLS['empty'] for _ in range(self.WIDTH)]
             for _ in range(self.HEIGHT)
         ]
         self.path: List[Tuple[int, int]] = []
+        # Zbiór pól ścieżki i indeks pole → pozycja na ścieżce (synchronizowane przez set_path)
+        self.path_tiles: FrozenSet[Tuple[int, int]] = frozenset()
+        self.path_index: Dict[Tuple[int, int], int] = {}
         self.start: Tuple[int, int] = (0, 0)
         self.base: Tuple[int, int] = (0, 0)
+        # Licznik zmian planszy (budowa, ulepszenie wieży) — zwiększany przez touch()
+        self.version: int = 0
 
         # System wyboru generatora ścieżki
         generators = {
@@ -33,8 +47,27 @@ class Map:
         }
         generator = generators.get(map_type, self._generate_linear)
         generator()
+        self.set_path(self.path)
         self._place_markers()
 
+    def set_path(self, path: Sequence[Tuple[int, int]]) -> None:
+        """
+        Ustawia ścieżkę (wiersz, kolumna) i przelicza zbiór jej pól oraz indeks pole → pozycja.
+        Pole odwiedzone przez ścieżkę kilka razy wskazuje na pierwszą pozycję.
+        """
+        self.path = list(path)
+        self.path_tiles = frozenset(self.path)
+        index: Dict[Tuple[int, int], int] = {}
+        for i, tile in enumerate(self.path):
+            index.setdefault(tile, i)
+        self.path_index = index
+
+    def touch(self) -> None:
+        """
+        Oznacza zmianę planszy lub stojących na niej wież (np. dla warstwy statycznej renderera).
+        """
+        self.version += 1
+
     def _place_markers(self) -> None:
         """Oznacza na siatce start i bazę, bazując na wygenerowanej ścieżce."""
         if not self.path:
@@ -58,14 +91,14 @@ class Map:
         Generator losowej ścieżki z góry na dół, ze skrętami.
         Umożliwia tworzenie unikalnych plansz dla każdej rozgrywki.
         """
-        x = random.randint(1, self.WIDTH - 2)
+        x = self.rng.randint(1, self.WIDTH - 2)
         y = 0
         self.path.append((y, x))
         self.grid[y][x] = self.SYMBOLS['path']
 
         attempts = 0
         while y < self.HEIGHT - 1:
-            direction = random.choice(['down', 'left', 'right'])
+            direction = self.rng.choice(['down', 'left', 'right'])
             if direction == 'down' or attempts >= 5:
                 y += 1
                 attempts = 0
@@ -105,6 +105,7 @@ class GameMenu:
                 input("\n⏸ Naciśnij Enter, aby wrócić do menu…")
             elif choice == 'q':
                 logging.info(f"[MENU] Gracz {self.game.username} zakończył program.")
+                self.game.autosave.close()
                 exit()
             else:
                 print("❌ Nieznana opcja.")
@@ -317,6 +318,7 @@ class GameMenu:
         """
         console = self.console
         os.system('cls' if os.name == 'nt' else 'clear')
+        self.game.autosave.flush()
 
         while True:
             show_intro()
@@ -0,0 +1,123 @@
+import json
+import time
+from collections import Counter
+from typing import Dict, List
+
+
+class TickProfiler:
+    """
+    TickProfiler – opcjonalny pomiar czasu ticków fali.
+
+    Sekcje (ruch wrogów, atak każdej klasy wieży, nagrody, rysowanie UI) mierzone są parą
+    start = profiler.clock() / profiler.add(nazwa, start), liczniki przez profiler.count(nazwa, n).
+    Wynik: tabela podsumowania (print_summary) oraz plik Chrome trace (dump_chrome_trace),
+    do otwarcia w chrome://tracing lub Perfetto.
+    Kod gry sprawdza tylko `if profiler is not None`, więc bez profilera koszt jest pomijalny.
+    """
+    # Limit zdarzeń w trace (sumy w podsumowaniu liczone są zawsze)
+    MAX_TRACE_EVENTS = 200_000
+
+    def __init__(self) -> None:
+        self.clock = time.perf_counter_ns
+        # nazwa sekcji -> [wywołania, łączny czas ns, maks. czas ns]
+        self.sections: Dict[str, List[int]] = {}
+        self.counters: Counter = Counter()
+        self.ticks = 0
+        self._origin = self.clock()
+        self._spans: list = []
+        self._counter_samples: list = []
+        self._tick_counters: Counter = Counter()
+
+    def add(self, name: str, start: int) -> int:
+        """
+        Zapisuje sekcję trwającą od `start` do teraz. Zwraca bieżący czas (start kolejnej sekcji).
+        """
+        end = self.clock()
+        duration = end - start
+        stat = self.sections.get(name)
+        if stat is None:
+            self.sections[name] = [1, duration, duration]
+        else:
+            stat[0] += 1
+            stat[1] += duration
+            if duration > stat[2]:
+                stat[2] = duration
+        if len(self._spans) < self.MAX_TRACE_EVENTS:
+            self._spans.append((name, start, duration))
+        return end
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] += amount
+        self._tick_counters[name] += amount
+
+    def end_tick(self, start: int) -> None:
+        """
+        Zamyka pomiar całego ticku i zapisuje liczniki z tego ticku.
+        """
+        self.ticks += 1
+        end = self.add("tick", start)
+        if len(self._counter_samples) < self.MAX_TRACE_EVENTS:
+            self._counter_samples.append((end, dict(self._tick_counters)))
+        self._tick_counters.clear()
+
+    def summary(self) -> List[dict]:
+        """
+        Zwraca wiersze podsumowania posortowane malejąco po łącznym czasie.
+        """
+        tick_total = self.sections.get("tick", [0, 0, 0])[1]
+        rows = []
+        for name, (calls, total, worst) in self.sections.items():
+            rows.append({
+                "name": name,
+                "calls": calls,
+                "total_ms": total / 1e6,
+                "mean_us": total / calls / 1e3,
+                "max_us": worst / 1e3,
+                "tick_share": total / tick_total if tick_total else 0.0,
+            })
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows
+
+    def print_summary(self, console=None) -> None:
+        """
+        Wyświetla tabelę czasów sekcji i liczników.
+        """
+        from rich.console import Console
+        from rich.table import Table
+        from rich import box
+
+        table = Table(title=f"⏱ Profil fali – {self.ticks} ticków", box=box.ROUNDED)
+        table.add_column("Sekcja", style="cyan")
+        table.add_column("Wywołania", justify="right")
+        table.add_column("Łącznie [ms]", justify="right")
+        table.add_column("Średnio [µs]", justify="right")
+        table.add_column("Maks. [µs]", justify="right")
+        table.add_column("% ticku", justify="right")
+        for row in self.summary():
+            table.add_row(
+                row["name"], str(row["calls"]), f"{row['total_ms']:.2f}",
+                f"{row['mean_us']:.1f}", f"{row['max_us']:.1f}", f"{row['tick_share']:.1%}"
+            )
+        for name, value in sorted(self.counters.items()):
+            per_tick = value / self.ticks if self.ticks else 0
+            table.add_row(f"[yellow]{name}[/]", str(value), "", f"{per_tick:.1f}/tick", "", "")
+        (console or Console()).print(table)
+
+    def chrome_trace(self) -> dict:
+        """
+        Zwraca zdarzenia w formacie Chrome Trace Event (czasy w mikrosekundach).
+        """
+        events = [
+            {"name": name, "ph": "X", "ts": (start - self._origin) / 1e3, "dur": duration / 1e3, "pid": 1, "tid": 1}
+            for name, start, duration in self._spans
+        ]
+        events.extend(
+            {"name": "liczniki", "ph": "C", "ts": (ts - self._origin) / 1e3, "pid": 1, "tid": 1, "args": values}
+            for ts, values in self._counter_samples
+        )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump_chrome_trace(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
@@ -0,0 +1,203 @@
+from bisect import bisect_left, insort
+from heapq import heapify, heappop, heappush
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+class ProgressIndex:
+    """
+    Indeks postępu wrogów na ścieżce, utrzymywany przyrostowo przez silnik fali.
+
+    Żywi wrogowie naziemni leżą w kubełkach według indeksu ścieżki, a w każdym kubełku —
+    w kolejności z listy wrogów fali (order). Latający (którzy nie zmieniają path_index)
+    trzymani są osobno. Po ruchu wroga silnik woła update(), więc kubełki nie są budowane
+    od nowa w każdym ticku.
+
+    first_in_range() odpowiada na pytanie wież celujących w "najdalszego na ścieżce"
+    (Lodowa, Magia Ognia): przegląda kubełki z zasięgu wieży od końca ścieżki
+    i zwraca pierwszego pasującego wroga — bez sortowania wszystkich wrogów.
+
+    weakest_in_range() (Strzelająca, Ciężka Armatnia) korzysta z kopców (hp, order) trzymanych
+    osobno dla każdego pola ścieżki i dla widzialnych/niewidzialnych wrogów. Kopce są leniwe:
+    każda zmiana HP lub pola dopisuje nowy wpis, a nieaktualne wpisy usuwane są dopiero,
+    gdy trafią na szczyt. Dlatego po każdej zmianie HP wroga trzeba wywołać update()/refresh().
+
+    Wrogowie wchodzący na mapę w trakcie fali dopisywani są przez add() — dostają kolejny order.
+    """
+
+    def __init__(self, enemies: Sequence, track_hp: bool = True) -> None:
+        """
+        track_hp=False wyłącza kopce HP (gdy żadna wieża nie pyta o najsłabszego wroga).
+        """
+        self.buckets: Dict[int, List[Tuple[int, object]]] = {}
+        self.flying: List[Tuple[int, object]] = []
+        self.track_hp = track_hp
+        self._enemies = list(enemies)
+        self._orders: Dict[int, int] = {id(enemy): order for order, enemy in enumerate(self._enemies)}
+        self._flying_orders = {
+            order for order, enemy in enumerate(self._enemies) if enemy.flying
+        }
+        # order -> indeks kubełka, w którym wróg jest obecnie zapisany
+        self._placed: Dict[int, int] = {}
+        # (indeks ścieżki, niewidzialny) -> kopiec (hp, order); order -> aktualny klucz wroga
+        self._heaps: Dict[Tuple[int, bool], List[Tuple[int, int]]] = {}
+        self._heap_key: Dict[int, Tuple[int, bool, int]] = {}
+        for order, enemy in enumerate(self._enemies):
+            self.update(order, enemy)
+
+    def add(self, enemy) -> None:
+        """
+        Dopisuje do indeksu wroga, który właśnie wszedł na mapę (order = kolejny numer).
+        """
+        order = len(self._enemies)
+        self._enemies.append(enemy)
+        self._orders[id(enemy)] = order
+        if enemy.flying:
+            self._flying_orders.add(order)
+        self.update(order, enemy)
+
+    def update(self, order: int, enemy) -> None:
+        """
+        Uaktualnia położenie (i HP) wroga w indeksie po jego ruchu albo usuwa go, jeśli zginął.
+        """
+        if order in self._flying_orders:
+            if not enemy.alive and order in self._placed:
+                del self._placed[order]
+                self.flying.pop(bisect_left(self.flying, (order,)))
+            elif enemy.alive and order not in self._placed:
+                self._placed[order] = -1
+                insort(self.flying, (order, enemy))
+            return
+
+        placed = self._placed
+        current = placed.get(order)
+        target = enemy.path_index if enemy.alive else None
+        if current != target:
+            buckets = self.buckets
+            if current is not None:
+                bucket = buckets[current]
+                bucket.pop(bisect_left(bucket, (order,)))
+                if not bucket:
+                    # Puste pole — wszystkie wpisy jego kopców są już nieaktualne
+                    del buckets[current]
+                    if self.track_hp:
+                        self._heaps.pop((current, False), None)
+                        self._heaps.pop((current, True), None)
+            if target is None:
+                del placed[order]
+            else:
+                insort(buckets.setdefault(target, []), (order, enemy))
+                placed[order] = target
+        elif target is None:
+            return
+
+        if not self.track_hp:
+            return
+        if target is None:
+            self._heap_key.pop(order, None)
+            return
+        invisible, hp = enemy.invisible, enemy.hp
+        key = (target, invisible, hp)
+        heap_key = self._heap_key
+        if heap_key.get(order) != key:
+            heap_key[order] = key
+            heap = self._heaps.setdefault((target, invisible), [])
+            heappush(heap, (hp, order))
+            # Zbyt wiele nieaktualnych wpisów — kopiec budowany od nowa z aktualnych kluczy
+            if len(heap) > 4 * len(self.buckets[target]) + 8:
+                self._rebuild(heap, target, invisible)
+
+    def refresh(self, enemy) -> None:
+        """
+        Uaktualnia wroga po zmianie jego stanu poza ruchem (np. po trafieniu przez wieżę).
+        """
+        self.update(self._orders[id(enemy)], enemy)
+
+    def _rebuild(self, heap: List[Tuple[int, int]], idx: int, invisible: bool) -> None:
+        """
+        Buduje kopiec pola od nowa z aktualnych kluczy wrogów.
+        """
+        heap[:] = [
+            (self._enemies[o].hp, o) for o, _ in self.buckets[idx]
+            if self._heap_key.get(o) == (idx, invisible, self._enemies[o].hp)
+        ]
+        heapify(heap)
+
+    def _valid_top(self, idx: int, invisible: bool) -> Optional[Tuple[int, int]]:
+        """
+        Zwraca aktualny szczyt kopca pola (hp, order), zdejmując po drodze nieaktualne wpisy.
+        """
+        heap = self._heaps.get((idx, invisible))
+        if not heap:
+            return None
+        heap_key = self._heap_key
+        while heap:
+            hp, order = heap[0]
+            if heap_key.get(order) == (idx, invisible, hp):
+                return heap[0]
+            heappop(heap)
+        return None
+
+    def candidates(self, covered: Sequence[int]) -> list:
+        """
+        Wrogowie z kubełków podanych indeksów ścieżki oraz wszyscy latający,
+        w kolejności z listy wrogów fali.
+        """
+        items = list(self.flying)
+        buckets = self.buckets
+        for idx in covered:
+            bucket = buckets.get(idx)
+            if bucket:
+                items.extend(bucket)
+        items.sort(key=lambda item: item[0])
+        return [enemy for _, enemy in items]
+
+    def first_in_range(self, tower, covered: Sequence[int]) -> Optional[object]:
+        """
+        Zwraca żywego wroga w zasięgu wieży, który zaszedł najdalej po ścieżce
+        (remis: wcześniejszy na liście wrogów), albo None.
+
+        covered – rosnące indeksy ścieżki w zasięgu wieży (CoverageIndex.covered_indices).
+        Latający mają path_index 0, więc rywalizują tylko z wrogami na polu startowym.
+        """
+        visible = tower.can_hit_invisible
+        buckets = self.buckets
+        for idx in reversed(covered):
+            if idx == 0:
+                break
+            for _, enemy in buckets.get(idx, ()):
+                if enemy.alive and (visible or not enemy.invisible):
+                    return enemy
+
+        items = [item for item in self.flying if tower.in_range(item[1])]
+        if covered and covered[0] == 0:
+            items.extend(buckets.get(0, ()))
+        items.sort(key=lambda item: item[0])
+        for _, enemy in items:
+            if enemy.alive and (visible or not enemy.invisible):
+                return enemy
+        return None
+
+    def weakest_in_range(self, tower, covered: Sequence[int]) -> Optional[object]:
+        """
+        Zwraca żywego, trafialnego wroga w zasięgu wieży o najmniejszym HP
+        (remis: wcześniejszy na liście wrogów — jak min() w Tower.attack), albo None.
+        Wymaga track_hp=True.
+        """
+        visible = tower.can_hit_invisible
+        buckets = self.buckets
+        best = None
+        for idx in covered:
+            if idx not in buckets:
+                continue
+            top = self._valid_top(idx, False)
+            if top is not None and (best is None or top < best):
+                best = top
+            if visible:
+                top = self._valid_top(idx, True)
+                if top is not None and (best is None or top < best):
+                    best = top
+        for order, enemy in self.flying:
+            if enemy.alive and (visible or not enemy.invisible) and tower.in_range(enemy):
+                if best is None or (enemy.hp, order) < best:
+                    best = (enemy.hp, order)
+        return self._enemies[best[1]] if best is not None else None
@@ -0,0 +1,172 @@
+"""
+Dziennik powtórek (replay) — zapis decyzji gracza i ich ponowne odtworzenie bez interfejsu.
+
+Dziennik zawiera ziarno gry, typ mapy, parametry startowe oraz dopisywaną listę zdarzeń:
+    ["b", nazwa_wieży, x, y]  – budowa wieży
+    ["u", indeks_wieży]       – ulepszenie wieży
+    ["w"]                     – start fali
+    ["s", tempo]              – zmiana tempa gry
+Dzięki deterministycznym strumieniom losowym odtworzenie daje identyczny stan gry.
+
+Przykład:
+    python -m game.replay --nick Gracz --slot 1 --wave 5
+"""
+
+import argparse
+import json
+import logging
+from typing import List, Optional
+
+from game.building import Building
+from game.engine import HeadlessGame, simulate_wave
+from game.tower import TOWER_CLASSES
+
+REPLAY_VERSION = 1
+
+EVENT_BUILD = "b"
+EVENT_UPGRADE = "u"
+EVENT_WAVE = "w"
+EVENT_SPEED = "s"
+
+# Parametry startowe zapisywane w nagłówku dziennika
+HEADER_PREFS = (
+    "mode", "starting_gold", "starting_lives", "num_waves",
+    "hp_scale_per_wave", "reward_scale_per_wave"
+)
+
+
+class ReplayLog:
+    """
+    Dopisywany dziennik zdarzeń jednej rozgrywki.
+    """
+
+    def __init__(self, seed: int, map_type: int, prefs: dict, events: Optional[list] = None) -> None:
+        self.seed = seed
+        self.map_type = map_type
+        self.prefs = {key: prefs[key] for key in HEADER_PREFS if key in prefs}
+        self.events: List[list] = events if events is not None else []
+
+    def record_build(self, tower_name: str, x: int, y: int) -> None:
+        self.events.append([EVENT_BUILD, tower_name, x, y])
+
+    def record_upgrade(self, tower_index: int) -> None:
+        self.events.append([EVENT_UPGRADE, tower_index])
+
+    def record_wave(self) -> None:
+        self.events.append([EVENT_WAVE])
+
+    def record_speed(self, speed: float) -> None:
+        self.events.append([EVENT_SPEED, speed])
+
+    @property
+    def waves(self) -> int:
+        return sum(1 for event in self.events if event[0] == EVENT_WAVE)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {"v": REPLAY_VERSION, "seed": self.seed, "map_type": self.map_type,
+             "prefs": self.prefs, "events": self.events},
+            separators=(",", ":"),
+            ensure_ascii=False
+        )
+
+    @classmethod
+    def from_json(cls, text: str) -> "ReplayLog":
+        data = json.loads(text)
+        if data.get("v") != REPLAY_VERSION:
+            raise ValueError(f"Nieobsługiwana wersja dziennika powtórki: {data.get('v')}")
+        return cls(data["seed"], data["map_type"], data["prefs"], data["events"])
+
+
+def replay(log: ReplayLog, until_wave: Optional[int] = None) -> HeadlessGame:
+    """
+    Odtwarza dziennik w silniku bez interfejsu z pełną szybkością.
+    until_wave – zatrzymuje odtwarzanie po zakończeniu wskazanej fali.
+    """
+    game = HeadlessGame(log.prefs, map_type=log.map_type, seed=log.seed)
+    building = Building(game)
+
+    for event in log.events:
+        kind = event[0]
+        if kind == EVENT_BUILD:
+            _, name, x, y = event
+            error = building.place_tower(TOWER_CLASSES[name](0, 0), x, y)
+            if error:
+                raise ValueError(f"Nie można odtworzyć budowy {name} na ({x}, {y}): {error}")
+        elif kind == EVENT_UPGRADE:
+            error = building.apply_upgrade(game.towers[event[1]])
+            if error:
+                raise ValueError(f"Nie można odtworzyć ulepszenia wieży {event[1]}: {error}")
+        elif kind == EVENT_WAVE:
+            if until_wave is not None and game.wave_number >= until_wave:
+                break
+            simulate_wave(game)
+        elif kind == EVENT_SPEED:
+            game.game_speed = event[1]
+    return game
+
+
+def verify(log: ReplayLog, data: dict) -> List[str]:
+    """
+    Odtwarza dziennik i porównuje wynik z zapisem gry. Zwraca listę rozbieżności (pusta = zgodne).
+    """
+    game = replay(log)
+    expected = {
+        "złoto": data.get("gold"),
+        "życia": data.get("lives"),
+        "fala": data.get("wave"),
+        "zabici": data.get("stats", {}).get("zabici_przeciwnicy"),
+        "wieże": [tuple(t) for t in data.get("towers", [])],
+    }
+    actual = {
+        "złoto": game.gold,
+        "życia": game.lives,
+        "fala": game.wave_number,
+        "zabici": game.stats["zabici_przeciwnicy"],
+        "wieże": [(t.name, t.x, t.y, t.level) for t in game.towers],
+    }
+    return [
+        f"{key}: zapis={expected[key]} powtórka={actual[key]}"
+        for key in expected
+        if expected[key] != actual[key]
+    ]
+
+
+def main(argv=None) -> int:
+    from rich.console import Console
+    from game import database
+    from ui.map_renderer import MapRenderer
+
+    parser = argparse.ArgumentParser(description="Tower Defense – odtwarzanie powtórki zapisu")
+    parser.add_argument('--nick', type=str, required=True, help='Nick gracza')
+    parser.add_argument('--slot', type=int, required=True, help='Slot zapisu')
+    parser.add_argument('--wave', type=int, help='Pokaż stan po tej fali zamiast po ostatniej')
+    args = parser.parse_args(argv)
+
+    console = Console()
+    database.init_db()
+    text = database.load_replay(args.nick, args.slot)
+    if not text:
+        console.print("[red]❌ Ten zapis nie ma dziennika powtórki.[/]")
+        return 1
+    log = ReplayLog.from_json(text)
+
+    if args.wave is None:
+        data = database.load_game(args.nick, args.slot) or {}
+        mismatches = verify(log, data)
+        if mismatches:
+            console.print("[bold red]❌ Powtórka niezgodna z zapisem:[/]")
+            for line in mismatches:
+                console.print(f"  {line}")
+        else:
+            console.print("[bold green]✅ Powtórka zgodna z zapisem.[/]")
+
+    game = replay(log, until_wave=args.wave)
+    console.print(MapRenderer(game).render())
+    console.print(f"Fala: {game.wave_number}  Złoto: {game.gold}  Życia: {game.lives}")
+    logging.info(f"Odtworzono powtórkę: użytkownik={args.nick}, slot={args.slot}, zdarzeń={len(log.events)}")
+    return 1 if args.wave is None and mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,21 @@
+import random
+
+# Źródło nowych ziaren — niezależne od globalnego stanu modułu random
+_seed_source = random.SystemRandom()
+
+
+def new_seed() -> int:
+    """
+    Losuje nowe ziarno gry.
+    """
+    return _seed_source.randrange(2 ** 63)
+
+
+def stream(seed: int, *labels) -> random.Random:
+    """
+    Zwraca niezależny strumień losowy wyprowadzony z ziarna gry i etykiet,
+    np. stream(seed, "map") albo stream(seed, "wave", 7).
+    Ziarno tekstowe jest haszowane SHA-512, więc wynik jest identyczny w każdym procesie
+    i przy każdym uruchomieniu (nie zależy od PYTHONHASHSEED).
+    """
+    return random.Random("/".join(str(part) for part in (seed, *labels)))
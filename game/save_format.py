@@ -0,0 +1,233 @@
+"""
+Kompaktowy format zapisu gry (wersja 2) z zapisami przyrostowymi (delta).
+
+Pełny zapis to tekst "TD2:" + base64(zlib(dane binarne)):
+    -nagłówek: wersja formatu, długość bloku meta,
+    -meta: złoto, życia, fala, statystyki, osiągnięcia itd. (zwarty JSON),
+    -mapa: wymiary, start, baza i ścieżka jako serie kierunków (run-length),
+    -wieże: spakowane krotki (kod typu, x, y, poziom).
+Siatka mapy nie jest zapisywana — odtwarza się ją ze ścieżki i wież.
+
+Zapis przyrostowy to dopisana linia "\\nD" + JSON ze zmienionymi polami meta,
+nowymi poziomami wież i nowymi wieżami względem poprzedniego zapisu.
+loads() czyta zarówno nowy format (z deltami), jak i stary zapis JSON.
+"""
+
+import base64
+import json
+import struct
+import zlib
+from typing import List, Optional, Tuple
+
+from game.map import Map
+from game.tower import TOWER_CLASSES
+
+FORMAT_VERSION = 2
+PREFIX = "TD2:"
+DELTA_SEPARATOR = "\nD"
+
+# Kody typów wież — stała kolejność, nowe typy dopisywać na końcu
+TOWER_CODES = ("Strzelająca", "Ciężka Armatnia", "Lodowa", "Magia Ognia", "Laserowa")
+
+# Kierunki kroków ścieżki (wiersz, kolumna); 0 = krok w miejscu
+DIRECTIONS = ((0, 0), (-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1))
+
+PATH_RLE = 0
+PATH_RAW = 1
+
+# Pola meta porównywane przy zapisie przyrostowym (słowniki porównywane klucz po kluczu)
+META_KEYS = (
+    "username", "difficulty", "seed", "gold", "lives", "wave", "stats",
+    "hp_scale_per_wave", "reward_scale_per_wave", "achievements"
+)
+
+_HEADER = struct.Struct("<BH")
+_MAP = struct.Struct("<HHHHHHBH")
+_TILE = struct.Struct("<HH")
+_RUN = struct.Struct("<BH")
+_COUNT = struct.Struct("<H")
+_TOWER = struct.Struct("<BHHB")
+
+
+def _encode_path(path: List[Tuple[int, int]]) -> Tuple[int, list]:
+    """
+    Zamienia ścieżkę na serie (kierunek, długość). Gdy ścieżka ma skok dłuższy niż jedno pole,
+    zwraca tryb PATH_RAW i listę pól.
+    """
+    if not path:
+        return PATH_RAW, []
+    runs: list = []
+    for (r0, c0), (r1, c1) in zip(path, path[1:]):
+        step = (r1 - r0, c1 - c0)
+        if step not in DIRECTIONS:
+            return PATH_RAW, list(path)
+        direction = DIRECTIONS.index(step)
+        if runs and runs[-1][0] == direction and runs[-1][1] < 0xFFFF:
+            runs[-1][1] += 1
+        else:
+            runs.append([direction, 1])
+    return PATH_RLE, runs
+
+
+def _decode_path(first: Tuple[int, int], runs: list) -> List[Tuple[int, int]]:
+    path = [first]
+    row, col = first
+    for direction, count in runs:
+        dr, dc = DIRECTIONS[direction]
+        for _ in range(count):
+            row, col = row + dr, col + dc
+            path.append((row, col))
+    return path
+
+
+def build_grid(width: int, height: int, path, start, base, towers) -> List[List[str]]:
+    """
+    Odtwarza siatkę mapy tak, jak buduje ją Map i Building (ścieżka, start, baza, wieże).
+    """
+    grid = [[Map.SYMBOLS['empty'] for _ in range(width)] for _ in range(height)]
+    for row, col in path:
+        grid[row][col] = Map.SYMBOLS['path']
+    if path:
+        grid[start[0]][start[1]] = Map.SYMBOLS['start']
+        grid[base[0]][base[1]] = Map.SYMBOLS['base']
+    symbols = {}
+    for name, x, y, _ in towers:
+        if name not in symbols:
+            symbols[name] = TOWER_CLASSES[name](0, 0).symbol
+        grid[y][x] = symbols[name]
+    return grid
+
+
+def encode(data: dict) -> str:
+    """
+    Koduje pełny stan gry (słownik w układzie Game.save_game) do formatu TD2.
+    """
+    meta = {key: data[key] for key in META_KEYS if key in data}
+    meta["map_type"] = data["map"]["map_type"]
+    meta_bytes = json.dumps(meta, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    m = data["map"]
+    path = [tuple(p) for p in m["path"]]
+    mode, items = _encode_path(path)
+    width, height = len(m["grid"][0]), len(m["grid"])
+
+    parts = [_HEADER.pack(FORMAT_VERSION, len(meta_bytes)), meta_bytes]
+    parts.append(_MAP.pack(width, height, *m["start"], *m["base"], mode, len(items)))
+    if mode == PATH_RLE:
+        parts.append(_TILE.pack(*path[0]))
+        parts.extend(_RUN.pack(direction, count) for direction, count in items)
+    else:
+        parts.extend(_TILE.pack(*tile) for tile in items)
+
+    towers = data["towers"]
+    parts.append(_COUNT.pack(len(towers)))
+    parts.extend(_TOWER.pack(TOWER_CODES.index(name), x, y, level) for name, x, y, level in towers)
+
+    return PREFIX + base64.b64encode(zlib.compress(b"".join(parts), 9)).decode("ascii")
+
+
+def _decode_full(text: str) -> dict:
+    raw = zlib.decompress(base64.b64decode(text[len(PREFIX):]))
+    version, meta_len = _HEADER.unpack_from(raw, 0)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Nieobsługiwana wersja zapisu: {version}")
+    offset = _HEADER.size
+    data = json.loads(raw[offset:offset + meta_len].decode("utf-8"))
+    offset += meta_len
+
+    width, height, sr, sc, br, bc, mode, count = _MAP.unpack_from(raw, offset)
+    offset += _MAP.size
+    if mode == PATH_RLE:
+        first = _TILE.unpack_from(raw, offset)
+        offset += _TILE.size
+        runs = [_RUN.unpack_from(raw, offset + i * _RUN.size) for i in range(count)]
+        offset += count * _RUN.size
+        path = _decode_path(first, runs)
+    else:
+        path = [_TILE.unpack_from(raw, offset + i * _TILE.size) for i in range(count)]
+        offset += count * _TILE.size
+
+    (tower_count,) = _COUNT.unpack_from(raw, offset)
+    offset += _COUNT.size
+    towers = []
+    for i in range(tower_count):
+        code, x, y, level = _TOWER.unpack_from(raw, offset + i * _TOWER.size)
+        towers.append([TOWER_CODES[code], x, y, level])
+
+    data["map"] = {
+        "map_type": data.pop("map_type"),
+        "path": [list(p) for p in path],
+        "start": [sr, sc],
+        "base": [br, bc],
+        "width": width,
+        "height": height,
+    }
+    data["towers"] = towers
+    return data
+
+
+def encode_delta(previous: dict, data: dict) -> Optional[str]:
+    """
+    Zwraca linię przyrostową względem poprzedniego zapisu ("" gdy nic się nie zmieniło)
+    albo None, gdy potrzebny jest pełny zapis (inna mapa, usunięte lub przestawione wieże).
+    """
+    if previous["map"]["path"] != data["map"]["path"] or previous["map"]["map_type"] != data["map"]["map_type"]:
+        return None
+    old_towers, towers = previous["towers"], data["towers"]
+    if len(towers) < len(old_towers):
+        return None
+    levels = []
+    for i, (old, new) in enumerate(zip(old_towers, towers)):
+        if tuple(old[:3]) != tuple(new[:3]):
+            return None
+        if old[3] != new[3]:
+            levels.append([i, new[3]])
+
+    changes = {}
+    for key in META_KEYS:
+        old, new = previous.get(key), data.get(key)
+        if old == new:
+            continue
+        if isinstance(old, dict) and isinstance(new, dict) and set(old) <= set(new):
+            changes[key] = {k: v for k, v in new.items() if old.get(k) != v}
+        else:
+            changes[key] = new
+    if levels:
+        changes["levels"] = levels
+    if len(towers) > len(old_towers):
+        changes["towers"] = [list(t) for t in towers[len(old_towers):]]
+
+    if not changes:
+        return ""
+    return DELTA_SEPARATOR + json.dumps(changes, separators=(",", ":"), ensure_ascii=False)
+
+
+def _apply_delta(data: dict, changes: dict) -> None:
+    for i, level in changes.pop("levels", []):
+        data["towers"][i][3] = level
+    data["towers"].extend(changes.pop("towers", []))
+    for key, value in changes.items():
+        if isinstance(value, dict) and isinstance(data.get(key), dict):
+            data[key].update(value)
+        else:
+            data[key] = value
+
+
+def loads(text: str) -> dict:
+    """
+    Wczytuje zapis w dowolnym formacie: stary JSON albo TD2 z dopisanymi deltami.
+    Dla TD2 siatka mapy jest odtwarzana ze ścieżki i wież.
+    """
+    if not text.startswith(PREFIX):
+        return json.loads(text)
+    full, *deltas = text.split(DELTA_SEPARATOR)
+    try:
+        data = _decode_full(full)
+    except (zlib.error, struct.error, IndexError, UnicodeDecodeError) as e:
+        raise ValueError(f"Uszkodzony zapis: {e}") from e
+    for delta in deltas:
+        _apply_delta(data, json.loads(delta))
+
+    m = data["map"]
+    m["grid"] = build_grid(m.pop("width"), m.pop("height"), m["path"], m["start"], m["base"], data["towers"])
+    return data
@@ -0,0 +1,243 @@
+"""
+Symulator balansu gry (Monte Carlo) — rozgrywa wiele pełnych gier bez interfejsu.
+
+Przykład:
+    python -m game.simulate --preset Hard --layouts layouts.json --runs 10000 --workers 8
+
+Plik z układami wież (JSON) to lista układów:
+    [
+      {"name": "linia", "map_type": 1, "towers": [
+          {"type": "Strzelająca", "x": 12, "y": 3},
+          {"type": "Lodowa", "x": 14, "y": 8, "wave": 3, "level": 2}
+      ]}
+    ]
+"wave" to numer fali, przed którą wieża ma zostać postawiona (domyślnie 1),
+"level" — docelowy poziom (ulepszenia kupowane, gdy starczy złota).
+
+--vectorized przełącza silnik fali na macierz zasięgu NumPy (RangeMatrix, wymaga numpy) —
+wyniki są te same, ale tryb jest wolniejszy od domyślnych indeksów silnika.
+"""
+
+import argparse
+import json
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from game.building import Building
+from game.engine import HeadlessGame, WaveEngine, simulate_wave
+from game.ranking import Ranking
+from game.settings import DEFAULT_PREFS, DIFFICULTY_PRESETS
+from game.tower import TOWER_CLASSES
+
+DEFAULT_LAYOUT = {"name": "bez wież", "map_type": 1, "towers": []}
+
+
+def preset_prefs(preset: str, num_waves: Optional[int] = None) -> dict:
+    """
+    Zwraca preferencje gry dla wybranego presetu trudności (jak w select_game_mode).
+    """
+    if preset not in DIFFICULTY_PRESETS:
+        raise ValueError(f"Nieznany preset: {preset} (dostępne: {', '.join(DIFFICULTY_PRESETS)})")
+    prefs = DEFAULT_PREFS.copy()
+    prefs.update(DIFFICULTY_PRESETS[preset])
+    prefs["mode"] = preset
+    if num_waves is not None:
+        prefs["num_waves"] = num_waves
+    return prefs
+
+
+def _tower_class(name: str):
+    if name in TOWER_CLASSES:
+        return TOWER_CLASSES[name]
+    for cls in TOWER_CLASSES.values():
+        if cls.__name__ == name:
+            return cls
+    raise ValueError(f"Nieznany typ wieży: {name}")
+
+
+def _build_for_wave(game, building: Building, pending: list, built: list, wave: int) -> None:
+    """
+    Stawia zaplanowane wieże (w kolejności z układu) i kupuje ulepszenia, na które starcza złota.
+    Pierwsza wieża, na którą brakuje złota, wstrzymuje kolejne do następnej fali.
+    """
+    while pending and pending[0].get("wave", 1) <= wave:
+        spec = pending[0]
+        tower = _tower_class(spec["type"])(0, 0)
+        if game.gold < tower.cost:
+            break
+        pending.pop(0)
+        if building.place_tower(tower, spec["x"], spec["y"]) is None:
+            built.append((tower, spec.get("level", 1)))
+
+    for tower, target_level in built:
+        while tower.level < target_level:
+            if building.apply_upgrade(tower) is not None:
+                break
+
+
+def play_game(prefs: dict, layout: dict, seed: int, vectorized: bool = False) -> dict:
+    """
+    Rozgrywa jedną pełną grę bez interfejsu i zwraca jej wynik.
+    vectorized=True rozgrywa fale silnikiem z macierzą NumPy (WaveEngine(vectorized=True)).
+    """
+    game = HeadlessGame(prefs, map_type=layout.get("map_type", 1), seed=seed)
+    building = Building(game)
+    pending = list(layout.get("towers", []))
+    built: list = []
+    gold_curve = []
+
+    while game.wave_number < game.num_waves and game.lives > 0:
+        _build_for_wave(game, building, pending, built, game.wave_number + 1)
+        simulate_wave(game, WaveEngine(game, vectorized=vectorized))
+        gold_curve.append(game.gold)
+
+    return {
+        "layout": layout.get("name", "?"),
+        "seed": seed,
+        "survived": game.lives > 0,
+        "waves": game.wave_number,
+        "lives": game.lives,
+        "gold_curve": gold_curve,
+        "score": Ranking(game).calculate_score(),
+    }
+
+
+def _run_chunk(args) -> List[dict]:
+    prefs, layouts, seeds, vectorized = args
+    return [play_game(prefs, layouts[seed % len(layouts)], seed, vectorized) for seed in seeds]
+
+
+def run_batch(
+    prefs: dict,
+    layouts: List[dict],
+    runs: int,
+    workers: int = 1,
+    seed: int = 0,
+    vectorized: bool = False
+) -> List[dict]:
+    """
+    Rozgrywa `runs` gier, rozdzielając je między procesy.
+    Gra o numerze i dostaje ziarno seed + i, więc wyniki nie zależą od liczby procesów.
+    """
+    layouts = layouts or [DEFAULT_LAYOUT]
+    seeds = list(range(seed, seed + runs))
+    if workers <= 1:
+        return _run_chunk((prefs, layouts, seeds, vectorized))
+
+    chunk_count = min(runs, workers * 4) or 1
+    chunks = [seeds[i::chunk_count] for i in range(chunk_count)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = [r for part in executor.map(_run_chunk, [(prefs, layouts, c, vectorized) for c in chunks]) for r in part]
+    results.sort(key=lambda r: r["seed"])
+    return results
+
+
+def _percentile(sorted_values: List[int], q: float) -> int:
+    idx = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def aggregate(results: List[dict]) -> dict:
+    """
+    Agreguje wyniki gier: przeżywalność, osiągnięte fale, krzywą złota i rozkład punktów.
+    """
+    if not results:
+        return {"runs": 0}
+    scores = sorted(r["score"] for r in results)
+    waves = [r["waves"] for r in results]
+    max_waves = max(len(r["gold_curve"]) for r in results)
+    gold_curve = []
+    for w in range(max_waves):
+        values = [r["gold_curve"][w] for r in results if len(r["gold_curve"]) > w]
+        gold_curve.append(round(statistics.mean(values), 1))
+
+    return {
+        "runs": len(results),
+        "survival_rate": sum(r["survived"] for r in results) / len(results),
+        "waves_mean": round(statistics.mean(waves), 2),
+        "waves_median": statistics.median(waves),
+        "gold_curve": gold_curve,
+        "score": {
+            "min": scores[0],
+            "p10": _percentile(scores, 0.1),
+            "p50": _percentile(scores, 0.5),
+            "p90": _percentile(scores, 0.9),
+            "max": scores[-1],
+            "mean": round(statistics.mean(scores), 1),
+        },
+    }
+
+
+def aggregate_by_layout(results: List[dict]) -> dict:
+    groups: dict = {}
+    for r in results:
+        groups.setdefault(r["layout"], []).append(r)
+    return {name: aggregate(group) for name, group in groups.items()}
+
+
+def print_summary(summary: dict, preset: str) -> None:
+    """
+    Wyświetla tabelę z podsumowaniem symulacji.
+    """
+    from rich.console import Console
+    from rich.table import Table
+    from rich import box
+
+    table = Table(title=f"📊 Symulacja balansu – preset {preset}", box=box.ROUNDED)
+    table.add_column("Układ", style="cyan")
+    table.add_column("Gry", justify="right")
+    table.add_column("Przeżywalność", justify="right")
+    table.add_column("Fale (śr./med.)", justify="right")
+    table.add_column("Wynik p10/p50/p90", justify="right")
+    table.add_column("Złoto po fali 1/5/10", justify="right")
+    for name, agg in summary.items():
+        curve = agg["gold_curve"]
+        gold = "/".join(str(curve[i]) if i < len(curve) else "—" for i in (0, 4, 9))
+        table.add_row(
+            name,
+            str(agg["runs"]),
+            f"{agg['survival_rate']:.1%}",
+            f"{agg['waves_mean']} / {agg['waves_median']}",
+            f"{agg['score']['p10']}/{agg['score']['p50']}/{agg['score']['p90']}",
+            gold,
+        )
+    Console().print(table)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tower Defense – symulacja balansu (Monte Carlo)")
+    parser.add_argument('--preset', default="Normal", choices=sorted(DIFFICULTY_PRESETS), help='Preset trudności')
+    parser.add_argument('--layouts', type=str, help='Plik JSON z układami wież')
+    parser.add_argument('--runs', type=int, default=100, help='Liczba gier')
+    parser.add_argument('--workers', type=int, default=1, help='Liczba procesów')
+    parser.add_argument('--seed', type=int, default=0, help='Ziarno pierwszej gry')
+    parser.add_argument('--waves', type=int, help='Liczba fal (domyślnie z presetu)')
+    parser.add_argument('--json', type=str, help='Zapisz podsumowanie do pliku JSON')
+    parser.add_argument('--vectorized', action='store_true',
+                        help='Silnik fali z macierzą NumPy (wolniejszy od domyślnego)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> dict:
+    args = parse_args(argv)
+    layouts = [DEFAULT_LAYOUT]
+    if args.layouts:
+        with open(args.layouts, "r") as f:
+            layouts = json.load(f)
+
+    prefs = preset_prefs(args.preset, args.waves)
+    results = run_batch(
+        prefs, layouts, args.runs, workers=args.workers, seed=args.seed, vectorized=args.vectorized
+    )
+    summary = aggregate_by_layout(results)
+    print_summary(summary, args.preset)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
+    return summary
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,260 @@
+import atexit
+import os
 import threading
 import logging
-import pygame
+import queue
+import time
 
+from abc import ABC, abstractmethod
+from collections import Counter
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 from game.settings import load_prefs
 
+if TYPE_CHECKING:
+    import pygame
+
+# pygame jest importowany dopiero przy pierwszym użyciu dźwięku (szybszy start gry)
+pygame = None
+
+# Zmienna środowiskowa wybierająca backend dźwięku: pygame (domyślnie), null, recording
+AUDIO_ENV = "TD_AUDIO"
+
+
+def _import_pygame():
+    global pygame
+    if pygame is None:
+        import pygame as _pygame
+        pygame = _pygame
+    return pygame
+
+
+class AudioBackend(ABC):
+    """
+    Interfejs backendu dźwięku, z którego korzysta SoundManager.
+    threaded = True oznacza, że efekty odtwarza wątek SFX (scalanie zgłoszeń w oknie czasowym);
+    backendy bez prawdziwego miksera odtwarzają je od razu w wątku wywołującym.
+    """
+    name = "?"
+    threaded = False
+
+    @abstractmethod
+    def init(self, channels: int, reserved: int) -> bool:
+        """Przygotowuje mikser; False = dźwięk niedostępny."""
+
+    @abstractmethod
+    def load_music(self, path: Path, volume: float) -> bool:
+        """Ładuje muzykę tła; False przy błędzie."""
+
+    @abstractmethod
+    def set_music_volume(self, volume: float) -> None:
+        pass
+
+    @abstractmethod
+    def play_music(self, loop: bool) -> None:
+        pass
+
+    @abstractmethod
+    def music_busy(self) -> bool:
+        pass
+
+    @abstractmethod
+    def pause_music(self) -> None:
+        pass
+
+    @abstractmethod
+    def unpause_music(self) -> None:
+        pass
+
+    @abstractmethod
+    def play_sfx(self, key: str, path: Path, volume: float, channel: Optional[int], count: int) -> None:
+        """
+        Odtwarza efekt raz z podaną głośnością; count to liczba scalonych zgłoszeń.
+        channel – numer zarezerwowanego kanału albo None (dowolny wolny kanał).
+        """
+
+
+class PygameBackend(AudioBackend):
+    """
+    Backend pygame.mixer — prawdziwe odtwarzanie dźwięku.
+    """
+    name = "pygame"
+    threaded = True
+
+    def __init__(self) -> None:
+        self._sounds: Dict[str, "pygame.mixer.Sound"] = {}
+
+    def init(self, channels: int, reserved: int) -> bool:
+        try:
+            pygame = _import_pygame()
+        except ImportError as e:
+            logging.error(f"Brak pakietu pygame, dźwięk wyłączony: {e}")
+            return False
+        try:
+            pygame.mixer.init()
+        except pygame.error as e:
+            logging.error(f"Nie udało się zainicjować miksera dźwięku: {e}")
+            return False
+        pygame.mixer.set_num_channels(channels)
+        pygame.mixer.set_reserved(reserved)
+        return True
+
+    def load_music(self, path: Path, volume: float) -> bool:
+        try:
+            pygame.mixer.music.load(str(path))
+            pygame.mixer.music.set_volume(volume)
+            return True
+        except pygame.error as e:
+            logging.warning(f"Nie załadowano muzyki tła ({path}): {e}")
+            return False
+
+    def set_music_volume(self, volume: float) -> None:
+        pygame.mixer.music.set_volume(volume)
+
+    def play_music(self, loop: bool) -> None:
+        pygame.mixer.music.play(-1 if loop else 0)
+
+    def music_busy(self) -> bool:
+        return pygame.mixer.music.get_busy()
+
+    def pause_music(self) -> None:
+        pygame.mixer.music.pause()
+
+    def unpause_music(self) -> None:
+        pygame.mixer.music.unpause()
+
+    def _load_sfx(self, key: str, path: Path) -> Optional["pygame.mixer.Sound"]:
+        """
+        Ładuje efekt dźwiękowy (SFX), cache'uje obiekt Sound.
+        Jeśli plik nie istnieje lub jest błąd, zwraca None.
+        """
+        if key in self._sounds:
+            return self._sounds[key]
+        try:
+            # Głośność efektu ustawiana jest na kanale przy odtworzeniu
+            sound = pygame.mixer.Sound(str(path))
+            self._sounds[key] = sound
+            return sound
+        except pygame.error as e:
+            logging.error(f"Błąd ładowania SFX ({path}): {e}")
+            return None
+
+    def play_sfx(self, key: str, path: Path, volume: float, channel: Optional[int], count: int) -> None:
+        sfx = self._load_sfx(key, path)
+        if not sfx:
+            return
+        try:
+            if channel is not None:
+                playing = pygame.mixer.Channel(channel)
+                playing.play(sfx)
+            else:
+                playing = sfx.play()
+            if playing is not None:
+                playing.set_volume(volume)
+        except pygame.error as e:
+            logging.error(f"Błąd odtwarzania SFX: {e}")
+
+
+class NullBackend(AudioBackend):
+    """
+    Backend bez dźwięku — nie importuje pygame i nic nie robi (symulacje, testy, --mute).
+    """
+    name = "null"
+
+    def init(self, channels: int, reserved: int) -> bool:
+        return False
+
+    def load_music(self, path: Path, volume: float) -> bool:
+        return False
+
+    def set_music_volume(self, volume: float) -> None:
+        pass
+
+    def play_music(self, loop: bool) -> None:
+        pass
+
+    def music_busy(self) -> bool:
+        return False
+
+    def pause_music(self) -> None:
+        pass
+
+    def unpause_music(self) -> None:
+        pass
+
+    def play_sfx(self, key: str, path: Path, volume: float, channel: Optional[int], count: int) -> None:
+        pass
+
+
+class RecordingBackend(AudioBackend):
+    """
+    Backend do testów — nie gra, tylko zapisuje odtworzenia.
+        plays     – liczba odtworzeń na klucz,
+        requests  – liczba zgłoszeń na klucz (z uwzględnieniem count),
+        log       – lista (klucz, głośność, kanał) w kolejności odtworzeń.
+    """
+    name = "recording"
+
+    def __init__(self) -> None:
+        self.plays: Counter = Counter()
+        self.requests: Counter = Counter()
+        self.log: List[Tuple[str, float, Optional[int]]] = []
+        self.music_plays = 0
+        self._music_playing = False
+        self.music_volume = 0.0
+
+    def init(self, channels: int, reserved: int) -> bool:
+        return True
+
+    def load_music(self, path: Path, volume: float) -> bool:
+        self.music_volume = volume
+        return True
+
+    def set_music_volume(self, volume: float) -> None:
+        self.music_volume = volume
+
+    def play_music(self, loop: bool) -> None:
+        self.music_plays += 1
+        self._music_playing = True
+
+    def music_busy(self) -> bool:
+        return self._music_playing
+
+    def pause_music(self) -> None:
+        self._music_playing = False
+
+    def unpause_music(self) -> None:
+        self._music_playing = True
+
+    def play_sfx(self, key: str, path: Path, volume: float, channel: Optional[int], count: int) -> None:
+        self.plays[key] += 1
+        self.requests[key] += count
+        self.log.append((key, volume, channel))
+
+
+AUDIO_BACKENDS = {
+    PygameBackend.name: PygameBackend,
+    NullBackend.name: NullBackend,
+    RecordingBackend.name: RecordingBackend,
+}
+
+
+def make_backend(name: Optional[str] = None) -> AudioBackend:
+    """
+    Tworzy backend o podanej nazwie; bez nazwy — z TD_AUDIO (domyślnie pygame).
+    """
+    name = (name or os.environ.get(AUDIO_ENV) or PygameBackend.name).lower()
+    if name not in AUDIO_BACKENDS:
+        logging.warning(f"Nieznany backend dźwięku '{name}', używam '{NullBackend.name}'.")
+        name = NullBackend.name
+    return AUDIO_BACKENDS[name]()
+
+
 class SoundManager:
     """
        Zarządza całą obsługą dźwięków gry — efektów SFX i muzyki tła.
        Odpowiada za ładowanie, odtwarzanie, ustawienia głośności i wyciszanie.
-       Korzysta z pygame.mixer, obsługuje błędy i preferencje użytkownika.
+       Samo odtwarzanie deleguje do backendu (pygame, null lub recording).
        """
     SOUND_DIR = Path(__file__).parent.parent / 'sounds'
     # Mapowanie kluczy na pliki dźwiękowe gry
@@ -25,137 +269,197 @@ class SoundManager:
         'shoot_laser': 'shoot_laser.wav',
         'music':       'bgm.wav',
     }
+    # Efekty SFX odtwarza jeden wątek: zgłoszenia z okna SFX_WINDOW [s] są scalane per klucz
+    SFX_WINDOW = 0.05
+    SFX_QUEUE_SIZE = 256
+    # Przyrost głośności za każde scalone zgłoszenie ponad pierwsze
+    MERGE_GAIN = 0.15
+    # Liczba kanałów miksera i kanały zarezerwowane dla ważnych efektów
+    SFX_CHANNELS = 16
+    RESERVED_CHANNELS = {'lose': 0, 'build': 1}
 
     def __init__(
         self,
         enabled: bool = True,
         debug: bool = False,
-        sound_dir: Optional[Path] = None
+        sound_dir: Optional[Path] = None,
+        backend: Optional[AudioBackend] = None
     ) -> None:
         """
         Inicjalizuje SoundManagera:
             -Ustawia ścieżki do plików dźwięków,
-            -Próbuje zainicjować mikser pygame,
-            -Ładuje preferencje głośności z bazy,
-            -Ładuje muzykę tła.
+            -Wybiera backend (domyślnie wg zmiennej TD_AUDIO),
+            -Ładuje preferencje głośności z bazy.
+        Mikser i muzyka tła są inicjalizowane dopiero przy pierwszym użyciu dźwięku.
         """
         self.enabled = enabled
         self.debug = debug
-        self._sfx_cache = {}
-        self.sfx_volume = 1.0
+        self.backend = backend if backend is not None else make_backend()
 
         if sound_dir:
             self.SOUND_DIR = Path(sound_dir)
         self.music_loaded = False
-
-        try:
-            pygame.mixer.init()
-        except pygame.error as e:
-            logging.error(f"Nie udało się zainicjować miksera dźwięku: {e}")
-            self.enabled = False
-            return
+        # None = mikser jeszcze nie inicjalizowany, potem True/False
+        self._mixer_ready: Optional[bool] = None
+        self._sfx_queue: queue.Queue = queue.Queue(maxsize=self.SFX_QUEUE_SIZE)
+        self._sfx_thread: Optional[threading.Thread] = None
+        self.dropped_sfx = 0
 
         # Załaduj preferencje głośności
         prefs = load_prefs()
         self.sfx_volume = float(prefs.get("sfx_volume", 1.0))
-        music_volume = float(prefs.get("music_volume", 0.5))
+        self.music_volume = float(prefs.get("music_volume", 0.5))
 
-        music_file = self.SFX_MAP.get('music')
-        if music_file:
-            music_path = self.SOUND_DIR / music_file
-            try:
-                pygame.mixer.music.load(str(music_path))
-                pygame.mixer.music.set_volume(music_volume)
-                self.music_loaded = True
-                if self.debug:
-                    logging.debug(f"Załadowano muzykę: {music_path}")
-            except pygame.error as e:
-                logging.warning(f"Nie załadowano muzyki tła ({music_path}): {e}")
-
-    def _load_sfx(self, key: str) -> Optional[pygame.mixer.Sound]:
-        """
-        Ładuje efekt dźwiękowy (SFX) na podstawie klucza, cache'uje obiekt Sound.
-        Jeśli plik nie istnieje lub jest błąd, zwraca None.
+    def use_backend(self, backend: AudioBackend) -> None:
         """
-        if key in self._sfx_cache:
-            return self._sfx_cache[key]
+        Podmienia backend (np. z flagi --audio/--mute). Działa przed pierwszym użyciem dźwięku.
+        """
+        if self._mixer_ready is not None:
+            raise RuntimeError("Backendu dźwięku nie można zmienić po inicjalizacji miksera.")
+        self.backend = backend
 
-        fname = self.SFX_MAP.get(key)
-        if not fname:
-            return None
+    def _ensure_mixer(self) -> bool:
+        """
+        Inicjalizuje backend i ładuje muzykę tła przy pierwszym wywołaniu.
+        Zwraca True, jeśli dźwięk jest dostępny.
+        """
+        if self._mixer_ready is not None:
+            return self._mixer_ready
+        self._mixer_ready = self.backend.init(self.SFX_CHANNELS, len(self.RESERVED_CHANNELS))
+        if not self._mixer_ready:
+            # Dźwięk niedostępny (brak pygame lub miksera) — dalej gra bez dźwięku
+            self.backend = NullBackend()
+            self.enabled = False
+            return False
+        if self.backend.threaded:
+            self._start_worker()
 
-        path = self.SOUND_DIR / fname
-        try:
-            sound = pygame.mixer.Sound(str(path))
-            # Ustaw poziom głośności tylko dla efektów
-            if key.startswith("shoot_") or key in ("death", "build", "lose"):
-                sound.set_volume(self.sfx_volume)
-            self._sfx_cache[key] = sound
-            return sound
-        except pygame.error as e:
-            logging.error(f"Błąd ładowania SFX ({path}): {e}")
-            return None
+        music_file = self.SFX_MAP.get('music')
+        if music_file:
+            music_path = self.SOUND_DIR / music_file
+            self.music_loaded = self.backend.load_music(music_path, self.music_volume)
+            if self.debug and self.music_loaded:
+                logging.debug(f"Załadowano muzykę: {music_path}")
+        return True
 
     def set_music_volume(self, volume: float) -> None:
         """
         Ustawia głośność muzyki tła (0.0 - 1.0).
         """
-        pygame.mixer.music.set_volume(max(0.0, min(1.0, volume)))
+        self.music_volume = max(0.0, min(1.0, volume))
+        if self._mixer_ready:
+            self.backend.set_music_volume(self.music_volume)
         if self.debug:
             logging.debug(f"Ustawiono głośność muzyki: {volume}")
 
     def set_sfx_volume(self, volume: float) -> None:
         """
-        Ustawia głośność wszystkich efektów SFX (również już załadowanych).
+        Ustawia głośność wszystkich efektów SFX (od następnego odtworzenia).
         """
         self.sfx_volume = max(0.0, min(1.0, volume))
-        for sound in self._sfx_cache.values():
-            sound.set_volume(self.sfx_volume)
         if self.debug:
             logging.debug(f"Ustawiono głośność SFX: {volume}")
 
-    def play(self, key: str, loop: bool = False) -> None:
+    def play(self, key: str, loop: bool = False, count: int = 1) -> None:
         """
         Odtwarza efekt SFX lub muzykę tła na podstawie klucza.
+        Efekt trafia do kolejki wątku SFX; count to liczba zgłoszeń naraz (np. strzałów w ticku).
+        Przy pełnej kolejce zgłoszenie jest pomijane.
         """
-        if not self.enabled:
+        if not self.enabled or not self._ensure_mixer():
             return
 
-        if key == 'music' and self.music_loaded:
-            pygame.mixer.music.play(-1 if loop else 0)
+        if key == 'music':
+            if self.music_loaded:
+                self.backend.play_music(loop)
             return
 
-        sfx = self._load_sfx(key)
-        if not sfx:
+        if self._sfx_thread is None:
+            self._play_merged(key, count)
+            return
+        try:
+            self._sfx_queue.put_nowait((key, count))
+        except queue.Full:
+            self.dropped_sfx += 1
+
+    def _start_worker(self) -> None:
+        self._sfx_thread = threading.Thread(target=self._sfx_worker, name="sfx", daemon=True)
+        self._sfx_thread.start()
+        atexit.register(self.close)
+
+    def close(self) -> None:
+        """
+        Odtwarza zaległe efekty i kończy wątek SFX (wywoływane też przy wyjściu).
+        Późniejsze efekty grają już bez wątku.
+        """
+        thread = self._sfx_thread
+        if thread is None:
             return
+        self._sfx_thread = None
+        # None na końcu kolejki kończy wątek po odtworzeniu wcześniejszych zgłoszeń
+        self._sfx_queue.put(None)
+        if thread is not threading.current_thread():
+            thread.join()
 
-        def _play():
-            try:
-                sfx.play()
-            except pygame.error as e:
-                logging.error(f"Błąd odtwarzania SFX: {e}")
+    def _sfx_worker(self) -> None:
+        """
+        Pętla wątku SFX: zbiera zgłoszenia z jednego okna czasowego i odtwarza każdy klucz raz.
+        """
+        while True:
+            item = self._sfx_queue.get()
+            if item is None:
+                return
+            key, count = item
+            counts = {key: count}
+            closing = False
+            deadline = time.monotonic() + self.SFX_WINDOW
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._sfx_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    closing = True
+                    break
+                key, count = item
+                counts[key] = counts.get(key, 0) + count
+            for key, count in counts.items():
+                self._play_merged(key, count)
+            if closing:
+                return
 
-        # SFX odtwarzany w osobnym wątku, by nie blokował gry
-        threading.Thread(target=_play, daemon=True).start()
+    def _play_merged(self, key: str, count: int) -> None:
+        """
+        Odtwarza efekt raz, głośniej o MERGE_GAIN za każde dodatkowe zgłoszenie.
+        Ważne efekty grają na zarezerwowanym kanale; pozostałe tylko, gdy jest wolny kanał.
+        """
+        fname = self.SFX_MAP.get(key)
+        if not fname:
+            return
+        volume = min(1.0, self.sfx_volume * (1 + self.MERGE_GAIN * (count - 1)))
+        self.backend.play_sfx(key, self.SOUND_DIR / fname, volume, self.RESERVED_CHANNELS.get(key), count)
 
     def toggle_mute(self) -> None:
         """
         Pauzuje lub wznawia muzykę tła. Wyciszanie działa tylko na BGM.
         """
-        if not self.music_loaded:
+        if not self._mixer_ready or not self.music_loaded:
             return
-        if pygame.mixer.music.get_busy():
-            pygame.mixer.music.pause()
+        if self.backend.music_busy():
+            self.backend.pause_music()
         else:
-            pygame.mixer.music.unpause()
+            self.backend.unpause_music()
 
     def is_muted(self) -> bool:
         """
         Zwraca True jeśli muzyka tła jest wyciszona (nie gra lub niezaładowana).
         """
-        if not self.music_loaded:
+        if not self._mixer_ready or not self.music_loaded:
             return True
-        return not pygame.mixer.music.get_busy()
+        return not self.backend.music_busy()
 
-# Globalna instancja dźwięku dla gry
-sound_manager = SoundManager(enabled=True, debug=False)
\ No newline at end of file
+# Globalna instancja dźwięku dla gry (backend wg TD_AUDIO; main.py może go zmienić flagą --audio/--mute)
+sound_manager = SoundManager(enabled=True, debug=False)
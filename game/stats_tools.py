@@ -1,7 +1,8 @@
 import csv
 import logging
-from openpyxl import Workbook
-import matplotlib.pyplot as plt
+
+# openpyxl i matplotlib są importowane dopiero przy eksporcie (szybszy start gry)
+
 
 def export_stats_to_csv(stats, username, filename="statystyki.csv"):
     """
@@ -23,6 +24,7 @@ def export_stats_to_excel(stats, username, filename="statystyki.xlsx"):
     Eksportuje statystyki gracza do pliku Excel.
     """
     try:
+        from openpyxl import Workbook
         wb = Workbook()
         ws = wb.active
         ws.title = "Statystyki"
@@ -39,6 +41,8 @@ def plot_stats_chart(stats):
     """
     Generuje wykres słupkowy ze statystyk gracza, wyświetlając liczby nad słupkami.
     """
+    import matplotlib.pyplot as plt
+
     labels = list(stats.keys())
     values = list(stats.values())
     plt.figure(figsize=(8, 5))
@@ -1,20 +1,44 @@
 from abc import ABC, abstractmethod
-from game.utils import manhattan_distance
-from game.sound import sound_manager
+from operator import attrgetter
 import random
 
+# Sposoby wyboru celu (Tower.TARGETING): najmniej HP, najdalej na ścieżce
+# albo kilku pierwszych z listy wrogów (wieże przebijające)
+TARGET_WEAKEST = "weakest"
+TARGET_FIRST = "first"
+TARGET_PIERCE = "pierce"
+
+# Klucze sortowania i filtrowania wrogów (bez wywołań funkcji Pythona dla każdego wroga)
+_path_index = attrgetter("path_index")
+_alive = attrgetter("alive")
+_hp = attrgetter("hp")
+
 class Tower(ABC):
     """
     Bazowa klasa wieży – logika zasięgu, ataku, ulepszania i statystyk.
     Wszystkie specjalistyczne wieże dziedziczą z niej podstawowe funkcjonalności.
+
+    Dane wspólne dla typu (nazwa, symbol, tower_type, can_hit_invisible) są atrybutami klasy;
+    egzemplarz ma __slots__ tylko ze stanem zmiennym (pozycja, statystyki po ulepszeniach, cooldown).
     """
+    __slots__ = (
+        "x", "y", "range", "damage", "rate", "base_cost", "cost",
+        "cooldown", "level", "hits", "total_damage", "game",
+    )
     MAX_LEVEL = 20
     COST_GROWTH = 1.25
-
-    def __init__(self, x, y, name, range_, damage, rate, cost):
+    # Klucz efektu dźwiękowego strzału (odtwarzany przez renderer fali)
+    SOUND = "shoot_basic"
+    # Wybór celu — silnik fali dobiera według niego zapytanie do indeksu postępu wrogów
+    TARGETING = TARGET_WEAKEST
+    name = "?"
+    symbol = "?"
+    tower_type = None
+    can_hit_invisible = False
+
+    def __init__(self, x, y, range_, damage, rate, cost):
         self.x = x
         self.y = y
-        self.name = name
         self.range = range_
         self.damage = damage
         self.rate = rate
@@ -23,10 +47,8 @@ class Tower(ABC):
 
         self.cooldown = 0
         self.level = 1
-        self.symbol = "?"
         self.hits = 0
         self.total_damage = 0
-        self.can_hit_invisible = False
         self.game = None
 
     @classmethod
@@ -36,6 +58,13 @@ class Tower(ABC):
         """
         return cls.MAX_LEVEL
 
+    @property
+    def rng(self):
+        """
+        Strumień losowy gry, do której należy wieża (lub globalny moduł random).
+        """
+        return getattr(self.game, "rng", None) or random
+
     @property
     def attack_speed(self) -> float:
         try:
@@ -43,15 +72,24 @@ class Tower(ABC):
         except ZeroDivisionError:
             return 0.0
 
+    def covers(self, tile) -> bool:
+        """
+        Sprawdza, czy pole (wiersz, kolumna) leży w zasięgu wieży.
+        """
+        row, col = tile
+        # manhattan_distance(self.x, self.y, col, row) bez wywołania funkcji — covers jest w pętli ataku
+        return abs(self.x - col) + abs(self.y - row) <= self.range
+
     def in_range(self, enemy) -> bool:
+        # covers(enemy.position) bez dodatkowego wywołania
         row, col = enemy.position
-        return manhattan_distance(self.x, self.y, col, row) <= self.range
+        return abs(self.x - col) + abs(self.y - row) <= self.range
 
     def iter_targets(self, enemies):
         for e in enemies:
             if (
                 e.alive and
-                (not getattr(e, 'invisible', False) or self.can_hit_invisible) and
+                (not e.invisible or self.can_hit_invisible) and
                 self.in_range(e)
             ):
                 yield e
@@ -74,11 +112,10 @@ class Tower(ABC):
             self.cooldown -= 1
             return
 
-        targets = list(self.iter_targets(enemies))
-        if not targets:
+        target = min(self.iter_targets(enemies), key=_hp, default=None)
+        if target is None:
             return
 
-        target = min(targets, key=lambda e: e.hp)
         self.shoot(target)
         self.cooldown = self.rate
 
@@ -112,10 +149,13 @@ class Tower(ABC):
         }
 
 class Strzelajaca(Tower):
+    __slots__ = ("shot_counter",)
+    name = "Strzelająca"
+    symbol = "▲"
+    tower_type = "basic"
+
     def __init__(self, x, y):
-        super().__init__(x, y, "Strzelająca", 3, 2, 1, 50)
-        self.symbol = "▲"
-        self.tower_type = "basic"
+        super().__init__(x, y, 3, 2, 1, 50)
         self.shot_counter = 0
 
     def shoot(self, enemy):
@@ -129,48 +169,55 @@ class Strzelajaca(Tower):
             raise RuntimeError(f"Nie udało się zadać obrażeń: {e}")
         self.hits += 1
         self.total_damage += dmg
-        sound_manager.play("shoot_basic")
 
 class CiezkaArmatnia(Tower):
+    __slots__ = ()
+    SOUND = "shoot_heavy"
+    name = "Ciężka Armatnia"
+    symbol = "☢"
+    tower_type = "heavy"
+
     def __init__(self, x, y):
-        super().__init__(x, y, "Ciężka Armatnia", 2, 5, 2, 120)
-        self.symbol = "☢"
-        self.tower_type = "heavy"
+        super().__init__(x, y, 2, 5, 2, 120)
 
     def shoot(self, enemy):
         try:
             enemy.take_damage(self.damage)
-            if random.random() < 0.3:
-                enemy.stunned = 1
+            if self.rng.random() < 0.3:
+                enemy.add_status("stun", 1)
         except Exception as e:
             raise RuntimeError(f"Nie udało się zadać obrażeń: {e}")
         self.hits += 1
         self.total_damage += self.damage
-        sound_manager.play("shoot_heavy")
 
 class Lodowa(Tower):
+    __slots__ = ()
+    SOUND = "shoot_ice"
+    TARGETING = TARGET_FIRST
+    name = "Lodowa"
+    symbol = "❄"
+    tower_type = "ice"
+    # attack() nie sprawdza niewidzialności — Lodowa trafia też niewidzialnych
+    can_hit_invisible = True
+
     def __init__(self, x, y):
-        super().__init__(x, y, "Lodowa", 3, 2, 1, 70)
-        self.symbol = "❄"
-        self.tower_type = "ice"
+        super().__init__(x, y, 3, 2, 1, 70)
 
     def shoot(self, enemy):
         try:
             enemy.take_damage(self.damage)
-            enemy.slowed = 2
+            enemy.add_status("slow", 2)
         except Exception as e:
             raise RuntimeError(f"Nie udało się zadać obrażeń: {e}")
         self.hits += 1
         self.total_damage += self.damage
-        sound_manager.play("shoot_ice")
 
     def attack(self, enemies):
         if self.cooldown > 0:
             self.cooldown -= 1
             return
 
-        alive = [e for e in enemies if e.alive]
-        alive.sort(key=lambda e: e.path_index, reverse=True)
+        alive = sorted(filter(_alive, enemies), key=_path_index, reverse=True)
         for e in alive:
             if self.in_range(e):
                 self.shoot(e)
@@ -178,21 +225,25 @@ class Lodowa(Tower):
                 return
 
 class MagiaOgnia(Tower):
+    __slots__ = ()
+    SOUND = "shoot_fire"
+    TARGETING = TARGET_FIRST
+    name = "Magia Ognia"
+    symbol = "*"
+    tower_type = "fire"
+    can_hit_invisible = True
+
     def __init__(self, x, y):
-        super().__init__(x, y, "Magia Ognia", 3, 2, 2, 100)
-        self.symbol = "*"
-        self.can_hit_invisible = True
-        self.tower_type = "fire"
+        super().__init__(x, y, 3, 2, 2, 100)
 
     def shoot(self, enemy):
         try:
             enemy.take_damage(self.damage, damage_type="fire")
-            enemy.burning = 3
+            enemy.add_status("burn", 3)
         except Exception as e:
             raise RuntimeError(f"Nie udało się zadać obrażeń: {e}")
         self.hits += 1
         self.total_damage += self.damage
-        sound_manager.play("shoot_fire")
 
     def attack(self, enemies):
         if self.cooldown > 0:
@@ -200,8 +251,8 @@ class MagiaOgnia(Tower):
             return
 
         alive_sorted = sorted(
-            filter(lambda opponent: opponent.alive, enemies),
-            key=lambda opponent: opponent.path_index,
+            filter(_alive, enemies),
+            key=_path_index,
             reverse=True
         )
         for enemy in alive_sorted:
@@ -211,11 +262,18 @@ class MagiaOgnia(Tower):
                 return
 
 class Laserowa(Tower):
+    __slots__ = ()
+    SOUND = "shoot_laser"
+    TARGETING = TARGET_PIERCE
+    # Maksymalna liczba wrogów trafionych jednym strzałem
+    MAX_TARGETS = 5
+    name = "Laserowa"
+    symbol = "✦"
+    tower_type = "laser"
+    can_hit_invisible = True
+
     def __init__(self, x, y):
-        super().__init__(x, y, "Laserowa", 4, 2, 1, 60)
-        self.symbol = "✦"
-        self.can_hit_invisible = True
-        self.tower_type = "laser"
+        super().__init__(x, y, 4, 2, 1, 60)
 
     def shoot(self, enemy):
         try:
@@ -225,7 +283,6 @@ class Laserowa(Tower):
             raise RuntimeError(f"Nie udało się zadać obrażeń: {e}")
         self.hits += 1
         self.total_damage += self.damage
-        sound_manager.play("shoot_laser")
 
     def attack(self, enemies):
         if self.cooldown > 0:
@@ -233,11 +290,19 @@ class Laserowa(Tower):
             return
 
         hits = 0
-        max_hits = 5
         for e in self.iter_targets(enemies):
             self.shoot(e)
             hits += 1
-            if hits >= max_hits:
+            if hits >= self.MAX_TARGETS:
                 break
 
-        self.cooldown = self.rate
\ No newline at end of file
+        self.cooldown = self.rate
+
+# Mapowanie nazw wież (jak w zapisach gry) na klasy
+TOWER_CLASSES = {
+    "Strzelająca": Strzelajaca,
+    "Ciężka Armatnia": CiezkaArmatnia,
+    "Lodowa": Lodowa,
+    "Magia Ognia": MagiaOgnia,
+    "Laserowa": Laserowa
+}
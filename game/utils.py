@@ -15,4 +15,25 @@ def clamp(value: int, min_value: int, max_value: int) -> int:
         return min_value
     if value > max_value:
         return max_value
-    return value
\ No newline at end of file
+    return value
+
+def column_label(index: int) -> str:
+    """
+    Zwraca etykietę kolumny planszy jak w arkuszu kalkulacyjnym: 0 → 'A', 25 → 'Z', 26 → 'AA'.
+    """
+    label = ""
+    index += 1
+    while index > 0:
+        index, rest = divmod(index - 1, 26)
+        label = chr(65 + rest) + label
+    return label
+
+
+def column_index(label: str) -> int:
+    """
+    Odwrotność column_label: 'A' → 0, 'Z' → 25, 'AA' → 26.
+    """
+    index = 0
+    for ch in label.upper():
+        index = index * 26 + ord(ch) - 64
+    return index - 1
@@ -0,0 +1,177 @@
+from typing import Sequence
+
+try:
+    import numpy as np
+except ImportError:  # numpy jest opcjonalny — bez niego RangeMatrix jest niedostępny
+    np = None
+
+from game.tower import TARGET_FIRST, TARGET_PIERCE, TARGET_WEAKEST
+
+
+class RangeMatrix:
+    """
+    RangeMatrix – macierz zasięgu wież względem wrogów liczona w NumPy.
+
+    Pozycje, zasięgi i can_hit_invisible wież trzymane są w tablicach (wieże nie zmieniają się
+    w trakcie fali). Tablice wrogów i macierze to bufory przydzielone raz na `capacity` wrogów
+    (podwajane w razie potrzeby): update(enemies) przepisuje w nich w miejscu pozycje, HP,
+    path_index i niewidzialność wrogów (kolumna j to enemies[j]) i przelicza macierz
+    (wieże × wrogowie) bez tworzenia nowych tablic:
+        -in_range – odległość Manhattan ≤ zasięg wieży (jak Tower.in_range),
+        -hittable – w zasięgu i widoczny dla wieży (niewidzialny tylko dla can_hit_invisible).
+    Wybór celu odpowiada kodowi skalarnemu: najmniej HP (TARGET_WEAKEST, remis: wcześniejszy
+    na liście), największy path_index (TARGET_FIRST, remis: wcześniejszy na liście) albo
+    pierwszych MAX_TARGETS wrogów z listy (wieże przebijające).
+
+    targets(i) wybiera cel jednej wieży z uwzględnieniem trafień wcześniejszych wież
+    w tym samym ticku (po każdym strzale wywołuje się refresh() dla trafionych).
+    ready() odlicza w tablicy cooldown wszystkich wież i zwraca tylko te, które strzelają,
+    więc wieże przeładowujące albo bez wroga w zasięgu nie kosztują wywołania attack().
+
+    Tryb ten (WaveEngine z vectorized=True) jest wciąż wolniejszy od indeksów silnika
+    (indexed=True) — w benchmarku test_wave_with_many_towers ok. 1,5–2 razy: macierz liczona
+    jest co tick dla wszystkich wież i wrogów, a wybór celu to nadal wywołanie NumPy na każdą
+    strzelającą wieżę. Indeksy pomijają wieże śpiące i przeładowujące całkowicie.
+    """
+
+    def __init__(self, towers: Sequence, capacity: int = 0) -> None:
+        if np is None:
+            raise RuntimeError("RangeMatrix wymaga pakietu numpy (pip install numpy).")
+        self.towers = list(towers)
+        self.x = np.array([t.x for t in self.towers], dtype=np.int32)
+        self.y = np.array([t.y for t in self.towers], dtype=np.int32)
+        self.range = np.array([t.range for t in self.towers], dtype=np.int32)
+        self.can_hit_invisible = np.array([t.can_hit_invisible for t in self.towers], dtype=bool)
+        self.weakest = np.array([t.TARGETING == TARGET_WEAKEST for t in self.towers], dtype=bool)
+        self.first = np.array([t.TARGETING == TARGET_FIRST for t in self.towers], dtype=bool)
+        self.max_targets = np.array([getattr(t, "MAX_TARGETS", 1) for t in self.towers], dtype=np.int32)
+        # Cooldown wież odliczany w miejscu (Tower.cooldown aktualny dopiero po store_cooldowns());
+        # wieże przebijające bez celu i tak zaczynają cooldown (jak Laserowa.attack)
+        self.cooldown = np.array([t.cooldown for t in self.towers], dtype=np.int64)
+        self.rate = np.array([t.rate for t in self.towers], dtype=np.int64)
+        self.pierce = np.array([t.TARGETING == TARGET_PIERCE for t in self.towers], dtype=bool)
+        self._waiting = np.empty(len(self.towers), dtype=bool)
+        self._has_targets = np.empty(len(self.towers), dtype=bool)
+        self._mask = np.empty(len(self.towers), dtype=bool)
+        self.enemies: list = []
+        self._index: dict = {}
+        self._reserve(max(capacity, 16))
+        self.update(())
+
+    def _reserve(self, capacity: int) -> None:
+        """
+        Przydziela bufory na `capacity` wrogów (update() i tak przepisuje cały stan).
+        """
+        towers = len(self.towers)
+        self._capacity = capacity
+        self._position = np.zeros((capacity, 2), dtype=np.int32)
+        self._hp = np.zeros(capacity, dtype=np.int64)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._invisible = np.zeros(capacity, dtype=bool)
+        self._path_index = np.zeros(capacity, dtype=np.int64)
+        self._distance = np.empty((towers, capacity), dtype=np.int32)
+        self._scratch = np.empty((towers, capacity), dtype=np.int32)
+        self._in_range = np.empty((towers, capacity), dtype=bool)
+        self._hittable = np.empty((towers, capacity), dtype=bool)
+        self._live = np.empty((towers, capacity), dtype=bool)
+        self._row = np.empty(capacity, dtype=bool)
+
+    def update(self, enemies: Sequence) -> None:
+        """
+        Wczytuje stan wrogów (kolumna j to enemies[j]) i przelicza w miejscu macierze
+        zasięgu i widoczności. Indeks wróg -> kolumna jest tylko uzupełniany, dopóki
+        `enemies` zaczyna się od wrogów z poprzedniego wywołania.
+        """
+        enemies = list(enemies)
+        n = len(enemies)
+        known = self.enemies
+        if len(known) > n or enemies[:len(known)] != known:
+            known = self.enemies = []
+            self._index = {}
+        index = self._index
+        for j in range(len(known), n):
+            index[id(enemies[j])] = j
+        self.enemies = enemies
+        if n > self._capacity:
+            self._reserve(2 * n)
+
+        if n:
+            self._position[:n] = [e.position for e in enemies]
+        self.hp = self._hp[:n]
+        self.hp[:] = [e.hp for e in enemies]
+        self.alive = self._alive[:n]
+        self.alive[:] = [e.alive for e in enemies]
+        self.invisible = self._invisible[:n]
+        self.invisible[:] = [e.invisible for e in enemies]
+        self.path_index = self._path_index[:n]
+        self.path_index[:] = [e.path_index for e in enemies]
+
+        distance = self._distance[:, :n]
+        scratch = self._scratch[:, :n]
+        np.subtract(self.y[:, None], self._position[None, :n, 0], out=distance)
+        np.abs(distance, out=distance)
+        np.subtract(self.x[:, None], self._position[None, :n, 1], out=scratch)
+        np.abs(scratch, out=scratch)
+        distance += scratch
+        self.in_range = np.less_equal(distance, self.range[:, None], out=self._in_range[:, :n])
+        hittable = np.logical_or(
+            np.logical_not(self.invisible, out=self._row[:n])[None, :],
+            self.can_hit_invisible[:, None],
+            out=self._hittable[:, :n]
+        )
+        self.hittable = np.logical_and(hittable, self.in_range, out=hittable)
+        # Wieże bez żadnego wroga w zasięgu — targets() nie musi przeglądać ich wiersza
+        live = np.logical_and(hittable, self.alive[None, :], out=self._live[:, :n])
+        has_targets = live.any(axis=1, out=self._has_targets)
+        self.has_targets = has_targets.tolist()
+
+    def ready(self) -> list:
+        """
+        Numery wież, które w tym ticku strzelają do wroga w zasięgu (cooldown 0, w kolejności
+        z listy wież). Pozostałym wieżom odlicza cooldown tak jak Tower.attack bez celu.
+        Strzelająca wieża dostaje cooldown 0 — po jej ataku trzeba przepisać Tower.cooldown
+        do self.cooldown.
+        """
+        cooldown = self.cooldown
+        waiting = np.greater(cooldown, 0, out=self._waiting)
+        np.subtract(cooldown, 1, out=cooldown, where=waiting)
+        # Gotowe bez wroga w zasięgu: przebijające zaczynają cooldown
+        mask = np.logical_or(waiting, self._has_targets, out=self._mask)
+        np.logical_not(mask, out=mask)
+        np.logical_and(mask, self.pierce, out=mask)
+        np.copyto(cooldown, self.rate, where=mask)
+        mask = np.logical_not(waiting, out=self._mask)
+        np.logical_and(mask, self._has_targets, out=mask)
+        return np.flatnonzero(mask).tolist()
+
+    def store_cooldowns(self) -> None:
+        """
+        Przepisuje cooldown z tablicy do wież (po fali — przechodzi na kolejną).
+        """
+        for tower, cooldown in zip(self.towers, self.cooldown.tolist()):
+            tower.cooldown = cooldown
+
+    def refresh(self, enemies: Sequence) -> None:
+        """
+        Przepisuje HP i stan życia wskazanych wrogów (np. po trafieniu) do tablic.
+        """
+        for enemy in enemies:
+            j = self._index[id(enemy)]
+            self.hp[j] = enemy.hp
+            self.alive[j] = enemy.alive
+
+    def targets(self, i: int) -> list:
+        """
+        Cele wieży o numerze i dla bieżących (odświeżanych refresh()) HP i stanu wrogów.
+        """
+        if not self.has_targets[i]:
+            return []
+        n = len(self.enemies)
+        candidates = np.flatnonzero(np.logical_and(self.hittable[i], self.alive, out=self._row[:n]))
+        if not candidates.size:
+            return []
+        if self.weakest[i]:
+            return [self.enemies[candidates[self.hp[candidates].argmin()]]]
+        if self.first[i]:
+            return [self.enemies[candidates[self.path_index[candidates].argmax()]]]
+        return [self.enemies[j] for j in candidates[:self.max_targets[i]]]
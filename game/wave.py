@@ -1,11 +1,43 @@
-from typing import List, Tuple, Type
+from functools import lru_cache
+from itertools import accumulate
+from typing import List, Optional, Sequence, Tuple, Type
 import random
 
 from game.enemy import (
-    Enemy, Goblin, Ork, Smok, Duch, Nietoperz, Troll, Pajak
+    Enemy, EnemyType, Goblin, Ork, Smok, Duch, Nietoperz, Troll, Pajak
 )
 from game.config import HP_SCALE_PER_WAVE, REWARD_SCALE_PER_WAVE, DELAY_STEP
 
+
+@lru_cache(maxsize=None)
+def _class_table(number: int) -> Tuple[Tuple[Type[Enemy], ...], Tuple[float, ...]]:
+    """
+    Tablica losowania typów wrogów dla numeru fali: klasy i skumulowane prawdopodobieństwa.
+    Liczona raz na numer fali.
+    """
+    weights: dict = {
+        Goblin:    max(0.4, 0.8  - number * 0.02),        # Goblin dominuje na starcie, później rzadziej
+        Ork:       min(0.3, 0.1  + number * 0.01),        # Ork coraz częstszy
+        Troll:     min(0.15, 0.05 + number * 0.005),      # Troll pojawia się częściej z czasem
+        Pajak:     0.10,                                  # Stała szansa na Pająka
+        Duch:      0.05,                                  # Duch – rzadko
+        Nietoperz: 0.05                                   # Nietoperz – rzadko
+    }
+    total_w = sum(weights.values())
+    probabilities = [w / total_w for w in weights.values()]
+    return tuple(weights), tuple(accumulate(probabilities))
+
+
+@lru_cache(maxsize=None)
+def _scaled_type(kind: EnemyType, hp_scale: float, reward_scale: float) -> EnemyType:
+    """
+    Typ wroga z HP i nagrodą przeskalowanymi dla fali — wspólny dla wszystkich wrogów tego typu w fali.
+    """
+    return kind._replace(
+        max_hp=int(kind.max_hp * hp_scale),
+        reward=int(kind.reward * reward_scale)
+    ).shared()
+
 class Wave:
     """
     Klasa Wave odpowiada za wygenerowanie pojedynczej fali przeciwników.
@@ -20,15 +52,23 @@ class Wave:
         number: int,
         path: List[Tuple[int, int]],
         start_pos: Tuple[int, int],
-        base_pos: Tuple[int, int]
+        base_pos: Tuple[int, int],
+        hp_scale_per_wave: float = HP_SCALE_PER_WAVE,
+        reward_scale_per_wave: float = REWARD_SCALE_PER_WAVE,
+        rng: Optional[random.Random] = None
     ) -> None:
         """
         Inicjalizuje falę: zapisuje parametry i wywołuje generowanie mobków.
+        Skalowanie HP i nagród domyślnie pochodzi z konfiguracji, ale gra przekazuje własne
+        (z wybranego poziomu trudności). rng – strumień losowy fali (domyślnie moduł random).
         """
         self.number: int = number
         self.path: List[Tuple[int, int]] = path
         self.start: Tuple[int, int] = start_pos
         self.base: Tuple[int, int] = base_pos
+        self.hp_scale_per_wave: float = hp_scale_per_wave
+        self.reward_scale_per_wave: float = reward_scale_per_wave
+        self.rng = rng if rng is not None else random
         self.enemies: List[Enemy] = []
         self._generate_enemies()
 
@@ -36,59 +76,41 @@ class Wave:
         """
         Tworzy listę przeciwników dla tej fali. Liczba mobków, ich HP i nagrody
         skalują się z numerem fali zgodnie z konfiguracją gry.
+        Typy losowane są jednym wywołaniem dla całej fali, a przeskalowane statystyki
+        każdego typu (EnemyType) są wspólne dla wszystkich jego wrogów.
         """
-        hp_scale = 1 + (self.number - 1) * HP_SCALE_PER_WAVE
-        reward_scale = 1 + (self.number - 1) * REWARD_SCALE_PER_WAVE
+        hp_scale = 1 + (self.number - 1) * self.hp_scale_per_wave
+        reward_scale = 1 + (self.number - 1) * self.reward_scale_per_wave
         total_count = self.BASE_COUNT + (self.number - 1) * self.GROWTH_PER_WAVE
 
-        for idx in range(total_count):
+        classes = self._select_enemy_classes(total_count)
+        kinds = {cls: _scaled_type(cls.KIND, hp_scale, reward_scale) for cls in set(classes)}
+        path = self.path
+        enemies = self.enemies
+        for idx, EnemyClass in enumerate(classes):
             delay = idx * DELAY_STEP
-            EnemyClass = self._select_enemy_class(idx)
-
             if EnemyClass is Nietoperz:
                 # Nietoperz porusza się w linii prostej start->baza (ignoruje ścieżkę)
-                enemy = EnemyClass(
-                    self.path,
-                    delay=delay,
-                    start=self.start,
-                    target=self.base
-                )
+                enemy = Nietoperz(path, delay=delay, start=self.start, target=self.base, kind=kinds[Nietoperz])
             else:
-                enemy = EnemyClass(self.path, delay=delay)
-
-            # Skalowanie HP i nagrody
-            enemy.max_hp = int(enemy.max_hp * hp_scale)
-            enemy.hp = enemy.max_hp
-            enemy.reward = int(enemy.reward * reward_scale)
+                enemy = EnemyClass(path, delay=delay, kind=kinds[EnemyClass])
+            enemies.append(enemy)
 
-            self.enemies.append(enemy)
-
-    def _select_enemy_class(self, index: int) -> Type[Enemy]:
+    def _select_enemy_classes(self, count: int) -> Sequence[Type[Enemy]]:
         """
-        Wybiera klasę przeciwnika na danej pozycji w fali.
+        Wybiera klasy przeciwników dla całej fali.
         Co 10. fala zawsze zaczyna się od bossa (Smok).
-        Reszta dobierana jest losowo według dynamicznych wag.
+        Reszta dobierana jest losowo według dynamicznych wag (jedno losowanie k elementów;
+        kolejne liczby z rng są zużywane tak samo jak przy losowaniu po jednym wrogu).
 
         Args:
-            index (int): Indeks mobka w tej fali.
+            count (int): Liczba mobków w tej fali.
 
         Returns:
-            Type[Enemy]: Klasa przeciwnika do wygenerowania.
+            Sequence[Type[Enemy]]: Klasy przeciwników w kolejności wyjścia na mapę.
         """
+        classes, cum_weights = _class_table(self.number)
         # Co 10 fala pierwszy mob to boss Smok
-        if self.number % 10 == 0 and index == 0:
-            return Smok
-
-        weights: dict = {
-            Goblin:    max(0.4, 0.8  - self.number * 0.02),        # Goblin dominuje na starcie, później rzadziej
-            Ork:       min(0.3, 0.1  + self.number * 0.01),        # Ork coraz częstszy
-            Troll:     min(0.15, 0.05 + self.number * 0.005),      # Troll pojawia się częściej z czasem
-            Pajak:     0.10,                                       # Stała szansa na Pająka
-            Duch:      0.05,                                       # Duch – rzadko
-            Nietoperz: 0.05                                        # Nietoperz – rzadko
-        }
-        total_w = sum(weights.values())
-        choices = list(weights.keys())
-        probabilities = [w / total_w for w in weights.values()]
-
-        return random.choices(choices, probabilities, k=1)[0]
\ No newline at end of file
+        if self.number % 10 == 0 and count > 0:
+            return [Smok] + self.rng.choices(classes, cum_weights=cum_weights, k=count - 1)
+        return self.rng.choices(classes, cum_weights=cum_weights, k=count)
@@ -5,8 +5,10 @@ Uruchamia grę Tower Defense w trybie terminalowym:
     -tworzy główny obiekt gry oraz interfejs UI (Rich).
 
 Możliwości CLI:
-    --mute – wyciszenie dźwięków
+    --mute – wyciszenie dźwięków (backend dźwięku null)
+    --audio <backend> – backend dźwięku: pygame, null, recording (domyślnie z TD_AUDIO)
     --nick <nazwa> – nick gracza
+    --profile [plik] – pomiar czasu ticków fali: tabela po wyjściu i plik Chrome trace
 
 Po uruchomieniu skryptu program przechodzi do głównej pętli gry.
 """
@@ -15,6 +17,8 @@ from game.game import Game
 from ui.game_ui import GameUI
 import argparse
 from game import database
+from game.sound import sound_manager, make_backend, AUDIO_BACKENDS
+from game.profiler import TickProfiler
 import logging
 
 # Ustawienia logowania – wszystkie zdarzenia są zapisywane do pliku tower_defense.log
@@ -28,22 +32,42 @@ def parse_args():
     """
     Parsuje argumenty wiersza poleceń:
         --mute   – wyciszenie dźwięków
+        --audio  – backend dźwięku
         --nick   – nick gracza
+        --profile – profilowanie ticków fali
     """
     parser = argparse.ArgumentParser(description="Tower Defense - gra tekstowa")
     parser.add_argument('--mute', action='store_true', help='Wycisza dźwięki gry')
+    parser.add_argument('--audio', choices=sorted(AUDIO_BACKENDS), help='Backend dźwięku (domyślnie z TD_AUDIO)')
     parser.add_argument('--nick', type=str, help='Nick gracza')
+    parser.add_argument(
+        '--profile', nargs='?', const='tower_defense_trace.json', metavar='PLIK',
+        help='Mierzy czas ticków fali; po wyjściu pokazuje tabelę i zapisuje Chrome trace'
+    )
     return parser.parse_args()
 
 if __name__ == '__main__':
     # Inicjalizacja bazy danych, uruchomienie gry z argumentami CLI
     database.init_db()
     args = parse_args()
+    if args.mute:
+        sound_manager.use_backend(make_backend("null"))
+    elif args.audio:
+        sound_manager.use_backend(make_backend(args.audio))
 
     g = Game(
         username=args.nick,
         sound_enabled=not args.mute
     )
 
+    if args.profile:
+        g.profiler = TickProfiler()
+
     ui = GameUI(g)
-    ui.run()
\ No newline at end of file
+    ui.run()
+    g.autosave.close()
+
+    if g.profiler is not None:
+        g.profiler.print_summary()
+        g.profiler.dump_chrome_trace(args.profile)
+        print(f"📈 Zapisano Chrome trace do {args.profile}")
\ No newline at end of file
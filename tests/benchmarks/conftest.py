@@ -0,0 +1,79 @@
+"""
+Benchmarki (pytest-benchmark) głównych pętli gry.
+
+Domyślny `pytest` je pomija — uruchamiane są tylko z --benchmark-only:
+
+    pytest tests/benchmarks --benchmark-only --benchmark-save=baseline
+    pytest tests/benchmarks --benchmark-only --benchmark-compare --benchmark-compare-fail=mean:15%
+
+Zapisane pomiary trafiają do katalogu .benchmarks/ (osobno dla każdej maszyny).
+"""
+from unittest.mock import patch
+
+import pytest
+
+from game.engine import HeadlessGame
+from game.settings import DEFAULT_PREFS
+
+try:
+    import pytest_benchmark  # noqa: F401
+except ImportError:
+    collect_ignore_glob = ["test_*.py"]
+
+SEED = 1234
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("benchmark_only", False):
+        return
+    skip = pytest.mark.skip(reason="benchmark – uruchom z --benchmark-only")
+    for item in items:
+        if "benchmark" in getattr(item, "fixturenames", ()):
+            item.add_marker(skip)
+
+
+def free_tiles(game):
+    """
+    Pola planszy, na których można postawić wieżę (poza ścieżką, startem i bazą).
+    """
+    path = set(game.map.path) | {game.map.start, game.map.base}
+    taken = {(t.y, t.x) for t in game.towers}
+    return [
+        (x, y)
+        for y in range(game.map.HEIGHT)
+        for x in range(game.map.WIDTH)
+        if (y, x) not in path and (y, x) not in taken
+    ]
+
+
+def tile_next_to_path(game, index):
+    """
+    Wolne pole sąsiadujące z polem ścieżki o danym indeksie (x, y).
+    """
+    row, col = game.map.path[index]
+    free = set(free_tiles(game))
+    for dy, dx in ((0, 1), (1, 0), (0, -1), (-1, 0), (1, 1), (-1, -1), (1, -1), (-1, 1)):
+        if (col + dx, row + dy) in free:
+            return col + dx, row + dy
+    raise AssertionError("brak wolnego pola przy ścieżce")
+
+
+@pytest.fixture
+def headless_game():
+    return HeadlessGame(DEFAULT_PREFS.copy(), map_type=1, seed=SEED)
+
+
+@pytest.fixture
+def game(memory_db):
+    """
+    Pełny obiekt Game (bez menu i czyszczenia ekranu) z nową grą na stałej mapie.
+    """
+    from game.game import Game
+
+    with patch("game.game.GameMenu"), patch("game.game.os.system"), \
+            patch("game.game.load_prefs", return_value=DEFAULT_PREFS.copy()):
+        instance = Game(username="bench")
+    instance.map_type = 1
+    instance.new_game(DEFAULT_PREFS.copy())
+    yield instance
+    instance.autosave.close()
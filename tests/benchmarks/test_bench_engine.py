@@ -0,0 +1,137 @@
+import random
+
+import pytest
+
+from game.engine import HeadlessGame, WaveEngine, simulate_wave
+from game.enemy import Enemy, Goblin, Nietoperz
+from game.settings import DEFAULT_PREFS
+from game.tower import TOWER_CLASSES, CiezkaArmatnia, Lodowa, MagiaOgnia, Strzelajaca
+from game.wave import Wave
+from tests.benchmarks.conftest import SEED, free_tiles, tile_next_to_path
+
+ENEMY_COUNTS = (10, 100, 1000)
+
+
+def targets(game, count):
+    """
+    Wrogowie rozłożeni równomiernie wzdłuż ścieżki, z HP na tyle dużym, by nie ginęli w trakcie pomiaru.
+    """
+    path = game.map.path
+    enemies = []
+    for i in range(count):
+        enemy = Enemy(path, name="Cel", hp=10 ** 9, speed=1, reward=0)
+        enemy.path_index = i * len(path) // count
+        enemy.position = path[enemy.path_index]
+        enemies.append(enemy)
+    return enemies
+
+
+@pytest.mark.parametrize("count", ENEMY_COUNTS)
+@pytest.mark.parametrize("tower_name", list(TOWER_CLASSES))
+def test_tower_attack(benchmark, headless_game, tower_name, count):
+    game = headless_game
+    tower = TOWER_CLASSES[tower_name](*tile_next_to_path(game, len(game.map.path) // 2))
+    tower.game = game
+    enemies = targets(game, count)
+
+    def attack():
+        tower.cooldown = 0
+        tower.attack(enemies)
+
+    benchmark(attack)
+    assert tower.hits > 0
+
+
+def fresh_walkers(game, count):
+    path = game.map.path
+    walkers = []
+    for i in range(count):
+        enemy = Goblin(path)
+        enemy.path_index = i % (len(path) - 1)
+        enemy.position = path[enemy.path_index]
+        walkers.append(enemy)
+    return (walkers,), {}
+
+
+def fresh_bats(game, count):
+    start, base = game.map.start, game.map.base
+    return ([Nietoperz([start], start=start, target=base) for _ in range(count)],), {}
+
+
+@pytest.mark.parametrize("kind", ["sciezka", "latajacy"])
+def test_enemy_move(benchmark, headless_game, kind):
+    make = fresh_walkers if kind == "sciezka" else fresh_bats
+
+    def move_all(enemies):
+        for enemy in enemies:
+            enemy.move(enemies)
+
+    benchmark.pedantic(move_all, setup=lambda: make(headless_game, 500), rounds=100)
+
+
+@pytest.mark.parametrize("number", [1, 25, 50, 100])
+def test_wave_generation(benchmark, headless_game, number):
+    m = headless_game.map
+    wave = benchmark(lambda: Wave(number, m.path, m.start, m.base, rng=random.Random(number)))
+    assert wave.enemies
+
+
+def test_wave_generation_1_to_100(benchmark, headless_game):
+    m = headless_game.map
+
+    def generate():
+        return [Wave(n, m.path, m.start, m.base, rng=random.Random(n)) for n in range(1, 101)]
+
+    waves = benchmark(generate)
+    assert len(waves) == 100
+
+
+TOWER_PAIRS = {
+    "first": (Lodowa, MagiaOgnia),
+    "weakest": (Strzelajaca, CiezkaArmatnia),
+}
+
+
+@pytest.mark.parametrize("indexed", [True, False], ids=["indeks", "pelny_skan"])
+@pytest.mark.parametrize("targeting", list(TOWER_PAIRS))
+def test_wave_with_towers(benchmark, targeting, indexed):
+    def setup():
+        game = HeadlessGame(DEFAULT_PREFS.copy(), map_type=1, seed=SEED)
+        left, right = TOWER_PAIRS[targeting]
+        for row, col in game.map.path[1:-1:2]:
+            for cls, x in ((left, col - 1), (right, col + 1)):
+                tower = cls(x, row)
+                tower.game = game
+                game.towers.append(tower)
+        game.lives = 10 ** 6
+        game.wave_number = 40
+        return (game, WaveEngine(game, indexed=indexed)), {}
+
+    benchmark.pedantic(simulate_wave, setup=setup, rounds=10)
+
+
+ENGINE_MODES = {
+    "indeks": {"indexed": True},
+    "pelny_skan": {"indexed": False},
+    "numpy": {"indexed": False, "vectorized": True},
+}
+
+
+@pytest.mark.parametrize("mode", list(ENGINE_MODES))
+def test_wave_with_many_towers(benchmark, mode):
+    """
+    Kilkaset wież rozsianych po całej mapie — większość przez całą falę nie ma wroga w zasięgu.
+    """
+    def setup():
+        game = HeadlessGame(DEFAULT_PREFS.copy(), map_type=1, seed=SEED)
+        classes = list(TOWER_CLASSES.values())
+        tiles = free_tiles(game)
+        for i, (x, y) in enumerate(tiles[::max(1, len(tiles) // 300)][:300]):
+            tower = classes[i % len(classes)](x, y)
+            tower.game = game
+            game.towers.append(tower)
+        game.lives = 10 ** 6
+        game.wave_number = 40
+        return (game, WaveEngine(game, **ENGINE_MODES[mode])), {}
+
+    benchmark.pedantic(simulate_wave, setup=setup, rounds=5)
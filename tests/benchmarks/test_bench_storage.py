@@ -0,0 +1,61 @@
+from sqlalchemy import insert
+
+from game import database, save_format
+from game.load import load_game
+from game.tower import TOWER_CLASSES
+from tests.benchmarks.conftest import free_tiles
+
+HIGHSCORES = 100_000
+DB_ROUND_TRIPS = 1000
+
+
+def test_save_load_round_trip(benchmark, game, capsys):
+    game.gold = 10 ** 6
+    classes = list(TOWER_CLASSES.values())
+    for i, (x, y) in enumerate(free_tiles(game)[:40]):
+        assert game.place_tower(classes[i % len(classes)](x, y), x, y) is None
+    game.wave_number = 12
+
+    def round_trip():
+        game.save_game()
+        return load_game(game)
+
+    assert benchmark(round_trip)
+    assert len(game.towers) == 40
+
+
+def test_thousand_db_round_trips_under_second(benchmark, game, monkeypatch, tmp_path):
+    """
+    1000 zapisów i odczytów gry (kodowanie, upsert, SELECT, dekodowanie) w bazie plikowej (WAL) poniżej 1 s.
+    """
+    game.gold = 10 ** 6
+    classes = list(TOWER_CLASSES.values())
+    for i, (x, y) in enumerate(free_tiles(game)[:40]):
+        assert game.place_tower(classes[i % len(classes)](x, y), x, y) is None
+    game.save_game()
+    game.autosave.flush()
+    data = database.load_game(game.username, game.slot)
+
+    monkeypatch.setattr(database, "engine", database.make_engine(f"sqlite:///{tmp_path / 'bench.db'}"))
+    monkeypatch.setattr(database, "_initialized_engine", None)
+    database.init_db()
+
+    def round_trips():
+        for _ in range(DB_ROUND_TRIPS):
+            database.save_game("bench", 1, save_format.encode(data))
+            assert database.load_game("bench", 1)["towers"] == data["towers"]
+
+    benchmark.pedantic(round_trips, rounds=3)
+    assert benchmark.stats.stats.mean < 1.0
+
+
+def test_top_scores(benchmark, memory_db):
+    rows = [
+        {"username": f"gracz{i}", "score": (i * 7919) % HIGHSCORES, "date": "2024-01-01 12:00"}
+        for i in range(HIGHSCORES)
+    ]
+    with memory_db.begin() as conn:
+        conn.execute(insert(database.Highscore), rows)
+
+    top = benchmark(database.get_top_scores)
+    assert [row.score for row in top] == list(range(HIGHSCORES - 1, HIGHSCORES - 11, -1))
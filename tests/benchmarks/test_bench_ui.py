@@ -0,0 +1,25 @@
+import random
+
+from game.tower import Strzelajaca, Laserowa, Lodowa
+from game.wave import Wave
+from tests.benchmarks.conftest import tile_next_to_path
+from ui.game_ui import GameUI
+
+
+def test_update_layout(benchmark, headless_game):
+    game = headless_game
+    path = game.map.path
+    for cls, index in ((Strzelajaca, 5), (Laserowa, len(path) // 2), (Lodowa, len(path) - 5)):
+        tower = cls(*tile_next_to_path(game, index))
+        tower.game = game
+        game.towers.append(tower)
+    game.wave_number = 10
+    game.enemies = Wave(10, path, game.map.start, game.map.base, rng=random.Random(10)).enemies
+    for i, enemy in enumerate(game.enemies):
+        enemy.spawn_delay = 0
+        enemy.path_index = i * len(path) // len(game.enemies)
+        enemy.position = path[enemy.path_index]
+    game.notifications = [f"Powiadomienie {i}" for i in range(10)]
+    ui = GameUI(game)
+
+    benchmark(ui._update_layout)
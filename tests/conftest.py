@@ -0,0 +1,26 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+from game import database
+
+# Testy nie inicjalizują miksera pygame — domyślny backend dźwięku to null
+os.environ.setdefault("TD_AUDIO", "null")
+
+
+@pytest.fixture
+def memory_db(monkeypatch):
+    """
+    Baza w pamięci współdzielona przez wątek gry i wątek autosave
+    (jedno połączenie — inaczej każdy wątek widzi pustą bazę).
+    """
+    engine = create_engine(
+        "sqlite:///:memory:", future=True,
+        connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "_initialized_engine", None)
+    database.init_db()
+    return engine
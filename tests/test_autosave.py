@@ -0,0 +1,71 @@
+import threading
+
+from game import database
+from game.autosave import AutosaveQueue
+from game.engine import HeadlessGame
+from game.settings import DEFAULT_PREFS
+
+
+def test_rapid_saves_are_coalesced(monkeypatch, memory_db):
+    release = threading.Event()
+    written = []
+    save_game = database.save_game
+
+    def slow_save(username, slot, data, replay=None):
+        release.wait(5)
+        written.append(slot)
+        save_game(username, slot, data, replay=replay)
+
+    monkeypatch.setattr(database, "save_game", slow_save)
+    queue = AutosaveQueue()
+    game = HeadlessGame(DEFAULT_PREFS.copy(), seed=1)
+    for gold in range(10):
+        game.gold = gold
+        queue.submit("tester", 1, game.snapshot(), replay=f"r{gold}")
+    assert not queue.flush(timeout=0.05)
+
+    release.set()
+    assert queue.flush(timeout=5)
+    assert len(written) <= 2
+    assert database.load_game("tester", 1)["gold"] == 9
+    assert database.load_replay("tester", 1) == "r9"
+    queue.close()
+
+
+def test_later_saves_are_deltas_and_close_flushes(monkeypatch, memory_db):
+    full_saves = []
+    save_game = database.save_game
+    monkeypatch.setattr(database, "save_game", lambda *a, **kw: (full_saves.append(a[1]), save_game(*a, **kw)))
+
+    queue = AutosaveQueue()
+    game = HeadlessGame(DEFAULT_PREFS.copy(), seed=1)
+    queue.submit("tester", 1, game.snapshot())
+    queue.flush()
+    game.wave_number = 4
+    queue.submit("tester", 1, game.snapshot())
+    queue.close()
+
+    assert full_saves == [1]
+    assert database.load_game("tester", 1)["wave"] == 4
+
+
+def test_unchanged_saves_are_skipped(monkeypatch, memory_db):
+    deltas = []
+    append = database.append_save_delta
+    monkeypatch.setattr(
+        database, "append_save_delta", lambda *a, **kw: (deltas.append(a[2]), append(*a, **kw))[1]
+    )
+
+    queue = AutosaveQueue()
+    game = HeadlessGame(DEFAULT_PREFS.copy(), seed=1)
+    for _ in range(3):
+        queue.submit("tester", 1, game.snapshot(), replay="r1")
+        queue.flush()
+    assert deltas == []
+    assert queue._deltas[("tester", 1)] == 0
+
+    queue.submit("tester", 1, game.snapshot(), replay="r2")
+    queue.close()
+    assert deltas == [""]
+    assert queue._deltas[("tester", 1)] == 0
+    assert database.load_replay("tester", 1) == "r2"
@@ -13,10 +13,14 @@ def fake_game():
     game.sound.play = MagicMock()
     game.save_game = MagicMock()
     class DummyMap:
-        path = set()
+        path = []
+        path_tiles = frozenset()
         start = (0, 0)
         base = (5, 5)
         grid = [[None]*10 for _ in range(10)]
+        version = 0
+        def touch(self):
+            self.version += 1
     game.map = DummyMap()
     game.parse_coordinates = MagicMock(return_value=(1, 3))
     return game
@@ -0,0 +1,43 @@
+from game.coverage import CoverageIndex
+from game.map import Map
+from game.tower import Strzelajaca, Laserowa
+
+
+def test_coverage_matches_manhattan_range():
+    m = Map(map_type=2)
+    towers = [Strzelajaca(3, 4), Laserowa(10, 12), Strzelajaca(20, 25)]
+    index = CoverageIndex(m.path, towers)
+    for t in towers:
+        expected = [i for i, tile in enumerate(m.path) if t.covers(tile)]
+        assert index.covered_indices(t) == expected
+        for i in expected:
+            assert t in index.towers_at(i)
+
+
+def test_tower_without_coverage():
+    m = Map(map_type=1)
+    far = Strzelajaca(0, 0)
+    index = CoverageIndex(m.path, [far])
+    assert index.covered_indices(far) == []
+
+
+def test_coverage_on_large_map_matches_full_scan():
+    m = Map(map_type=2, width=256, height=256)
+    towers = [Strzelajaca(m.path[100][1] + 1, m.path[100][0]), Laserowa(128, 128)]
+    for _ in range(15):
+        towers[1].upgrade()
+    index = CoverageIndex(m.path, towers)
+    for t in towers:
+        assert index.covered_indices(t) == [i for i, tile in enumerate(m.path) if t.covers(tile)]
+
+
+def test_coverage_uses_map_path_index_with_revisited_tiles():
+    m = Map(map_type=1)
+    # Ścieżka wraca na pole (0, 10): dłuższa niż romb zasięgu, więc indeks szuka pól w path_index
+    m.set_path([(0, col) for col in range(40)] + [(1, 39), (1, 38)] + [(0, 10), (1, 10)])
+    towers = [Strzelajaca(10, 2), Strzelajaca(38, 3)]
+    index = CoverageIndex(m.path, towers, m.path_index)
+    assert index.path_index is m.path_index
+    for t in towers:
+        assert index.covered_indices(t) == [i for i, tile in enumerate(m.path) if t.covers(tile)]
+    assert 10 in index.covered_indices(towers[0]) and 42 in index.covered_indices(towers[0])
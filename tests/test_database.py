@@ -1,18 +1,6 @@
-import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 from game import database
 
-@pytest.fixture(scope="function")
-def in_memory_db(monkeypatch):
-    engine = create_engine("sqlite:///:memory:", future=True)
-    database.Base.metadata.create_all(engine)
-    session = sessionmaker(bind=engine, future=True)
-    monkeypatch.setattr(database, "engine", engine)
-    monkeypatch.setattr(database, "SessionLocal", session)
-    return session
-
-def test_add_and_get_score(in_memory_db):
+def test_add_and_get_score(memory_db):
     scores = database.get_top_scores()
     assert scores == []
 
@@ -22,8 +10,29 @@ def test_add_and_get_score(in_memory_db):
     assert scores[0].username == "kuba"
     assert scores[0].score == 123
 
-def test_save_and_load_game(in_memory_db):
+def test_save_and_load_game(memory_db):
     data = {"test": 42}
     database.save_game("tester", 1, '{"test": 42}')
     loaded = database.load_game("tester", 1)
-    assert loaded == data
\ No newline at end of file
+    assert loaded == data
+
+def test_file_engine_uses_wal_and_init_is_idempotent(tmp_path, monkeypatch):
+    engine = database.make_engine(f"sqlite:///{tmp_path / 'td.db'}")
+    monkeypatch.setattr(database, "engine", engine)
+    database.init_db()
+    database.save_game("tester", 1, '{"test": 1}')
+    database.init_db()
+    database.save_game("tester", 1, '{"test": 2}', replay="r")
+
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1
+    assert database.load_game("tester", 1) == {"test": 2}
+    assert database.list_saves_for_user("tester") == ["slot 1"]
+
+def test_add_score_keeps_higher_score(memory_db):
+    database.add_score("kuba", 200, date="2024-01-01 10:00")
+    database.add_score("kuba", 100, date="2024-01-02 10:00")
+    assert [(s.score, s.date) for s in database.get_top_scores()] == [(200, "2024-01-01 10:00")]
+    database.add_score("kuba", 300, date="2024-01-03 10:00")
+    assert database.get_top_scores()[0].score == 300
@@ -0,0 +1,99 @@
+import random
+
+from game.effects import EffectWheel, STATUS_EFFECTS, STACK_EXTEND, StatusEffect
+from game.enemy import Goblin, Ork, Troll, Rycerz, Nietoperz
+
+
+def _drive(use_wheel, seed, ticks=80):
+    rng = random.Random(seed)
+    path = [(0, i) for i in range(60)]
+    enemies = []
+    for _ in range(3):
+        enemies += [Goblin(path), Ork(path), Troll(path), Rycerz(path), Nietoperz(path, target=(40, 40))]
+    for e in enemies:
+        e.hp -= 3
+    wheel = EffectWheel() if use_wheel else None
+    if wheel is not None:
+        for e in enemies:
+            wheel.track(e)
+
+    trace = []
+    for tick in range(1, ticks + 1):
+        if wheel is not None:
+            wheel.advance(tick)
+            for e in enemies:
+                if not e.alive and e.effect_tick != tick:
+                    continue
+                if e.skip_move:
+                    e.skip_move = False
+                else:
+                    e.step()
+        else:
+            for e in enemies:
+                e.move()
+        for e in enemies:
+            if e.alive and rng.random() < 0.3:
+                e.add_status(rng.choice(["slow", "burn", "stun"]), rng.randint(1, 3))
+        trace.append([
+            (e.alive, e.hp if e.alive else None, e.position, e.slowed, e.burning, e.stunned)
+            for e in enemies
+        ])
+    return trace
+
+
+def test_effect_wheel_matches_per_tick_effects():
+    for seed in range(20):
+        assert _drive(True, seed) == _drive(False, seed)
+
+
+def test_wheel_touches_only_enemies_with_effects():
+    path = [(0, i) for i in range(20)]
+    enemies = [Goblin(path) for _ in range(100)]
+    wheel = EffectWheel()
+    for e in enemies:
+        wheel.track(e)
+    enemies[7].add_status("burn", 2)
+    assert wheel.advance(1) == [enemies[7]]
+    assert wheel.advance(2) == [enemies[7]]
+    assert enemies[7].hp == enemies[0].hp - 2
+    assert wheel.advance(3) == []
+
+
+def test_new_effect_type_without_enemy_fields():
+    class Poison(StatusEffect):
+        name = "poison"
+        STACKING = STACK_EXTEND
+
+        def fire(self, enemy):
+            enemy.take_damage(2)
+
+    STATUS_EFFECTS["poison"] = Poison()
+    try:
+        e = Goblin([(0, 0), (0, 1), (0, 2)])
+        e.add_status("poison", 1)
+        e.add_status("poison", 1)
+        assert e.statuses == {"poison": 2}
+        e.apply_effects()
+        e.apply_effects()
+        assert e.hp == Goblin.KIND.max_hp - 4
+        assert not any(e.statuses.values())
+    finally:
+        del STATUS_EFFECTS["poison"]
+
+
+def test_regeneration_beyond_one_wheel_turn():
+    path = [(0, i) for i in range(400)]
+    slow, fast = Troll(path), Troll(path)
+    slow.regen_interval = EffectWheel.SLOTS + 6
+    for e in (slow, fast):
+        e.hp = 1
+    wheel = EffectWheel()
+    wheel.track(slow)
+    reference = Troll(path)
+    reference.regen_interval = slow.regen_interval
+    reference.hp = 1
+    for tick in range(1, 3 * EffectWheel.SLOTS):
+        wheel.advance(tick)
+        reference.move()
+        assert slow.hp == reference.hp
+    assert slow.hp == 3
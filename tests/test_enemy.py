@@ -1,4 +1,9 @@
+import random
+import tracemalloc
+
 from game.enemy import Enemy, Troll, Rycerz, Nietoperz
+from game.map import Map
+from game.wave import Wave
 
 def test_enemy_initialization():
     path = [(0,0), (1,0), (2,0)]
@@ -64,4 +69,39 @@ def test_nietoperz_moves_to_target():
     bat.move()
     assert bat.position == (2,2)
     assert not bat.alive
-    assert bat.reached_end
\ No newline at end of file
+    assert bat.reached_end
+
+def test_large_wave_shares_enemy_types_and_stays_small():
+    game_map = Map(map_type=1, rng=random.Random(1))
+    number = (10_000 - Wave.BASE_COUNT) // Wave.GROWTH_PER_WAVE + 2
+
+    tracemalloc.start()
+    try:
+        wave = Wave(number, game_map.path, game_map.start, game_map.base, rng=random.Random(3))
+        used, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    enemies = wave.enemies
+    assert len(enemies) >= 10_000
+    # Jeden przeskalowany typ na klasę wroga, egzemplarze bez __dict__
+    assert len({id(e.kind) for e in enemies}) == len({type(e) for e in enemies})
+    assert not any(hasattr(e, "__dict__") for e in enemies[:100])
+    # Wróg w słownikowej wersji zajmował ~380 B (CPython 3.11), ze __slots__ ~190 B
+    assert used / len(enemies) < 256
+
+def test_writing_type_field_does_not_change_shared_type():
+    path = [(0,0), (1,0)]
+    a, b = Troll(path), Troll(path)
+    a.regen_interval = 1
+    assert a.regen_interval == 1
+    assert b.regen_interval == Troll.KIND.regen_interval
+
+def test_enemy_killed_by_burn_at_path_end_is_reported_once():
+    path = [(0,0)]
+    e = Enemy(path, "Test", 1, 1, 1)
+    e.death_queue = []
+    e.burning = 1
+    e.move()
+    assert not e.alive and e.reached_end
+    assert e.death_queue == [e]
@@ -0,0 +1,147 @@
+import random
+import time
+
+from game.config import DELAY_STEP
+from game.profiler import TickProfiler
+from game.engine import HeadlessGame, WaveEngine, simulate_wave, EVENT_BASE_ENTRY, EVENT_REWARD, EVENT_SHOT
+from game.settings import DEFAULT_PREFS
+from game.tower import Strzelajaca, Lodowa, MagiaOgnia, Laserowa, CiezkaArmatnia
+
+
+def make_game(towers=(), seed=0):
+    game = HeadlessGame(DEFAULT_PREFS.copy(), map_type=1, seed=seed)
+    for cls, x, y in towers:
+        t = cls(x, y)
+        t.game = game
+        game.towers.append(t)
+    return game
+
+
+def test_wave_without_towers_reaches_base():
+    game = make_game(seed=1)
+    lives = game.lives
+    result = simulate_wave(game)
+    assert result.wave_number == 1
+    assert result.defeated == 0
+    assert result.survived == len(game.enemies)
+    assert game.lives == lives - result.lives_lost
+    assert not any(e.alive for e in game.enemies)
+
+
+def test_towers_kill_and_reward():
+    towers = [(Strzelajaca, 12, row) for row in range(2, 24, 3)]
+    towers += [(Laserowa, 14, 10), (Lodowa, 14, 5), (MagiaOgnia, 12, 15), (CiezkaArmatnia, 14, 20)]
+    game = make_game(towers, seed=2)
+    gold = game.gold
+    result = simulate_wave(game)
+    assert result.defeated > 0
+    assert game.gold == gold + result.gold_earned
+    assert game.stats["zabici_przeciwnicy"] == result.defeated
+
+
+def test_tick_events_reported():
+    game = make_game(seed=3, towers=[(Strzelajaca, 12, 3)])
+    engine = WaveEngine(game)
+    engine.start()
+    kinds = set()
+    while engine.running:
+        kinds.update(ev.kind for ev in engine.tick())
+    assert EVENT_SHOT in kinds
+    assert kinds <= {EVENT_SHOT, EVENT_REWARD, EVENT_BASE_ENTRY}
+
+
+def test_full_game_runs_fast():
+    game = make_game(seed=4, towers=[(Laserowa, 12, row) for row in range(1, 25, 2)])
+    game.lives = 10 ** 6
+    start = time.perf_counter()
+    for _ in range(20):
+        simulate_wave(game)
+    assert game.wave_number == 20
+    assert time.perf_counter() - start < 5
+
+
+def _play(indexed, seed, map_type, waves=8):
+    game = HeadlessGame(DEFAULT_PREFS.copy(), map_type=map_type, seed=seed)
+    rng = random.Random(seed)
+    classes = [Strzelajaca, CiezkaArmatnia, Lodowa, MagiaOgnia, Laserowa]
+    path = set(game.map.path)
+    while len(game.towers) < 15:
+        x, y = rng.randrange(game.map.WIDTH), rng.randrange(game.map.HEIGHT)
+        if (y, x) not in path:
+            t = rng.choice(classes)(x, y)
+            t.game = game
+            game.towers.append(t)
+    game.lives = 10 ** 6
+    results = [simulate_wave(game, WaveEngine(game, indexed=indexed)) for _ in range(waves)]
+    return (
+        [(r.defeated, r.survived, r.gold_earned, r.lives_lost, r.ticks) for r in results],
+        [(t.hits, t.total_damage, t.cooldown) for t in game.towers],
+    )
+
+
+def test_indexed_targeting_matches_full_scan():
+    for seed, map_type in [(5, 1), (6, 2), (7, 3)]:
+        assert _play(True, seed, map_type) == _play(False, seed, map_type)
+
+
+def test_death_queue_tracks_alive_enemies_and_compacts():
+    towers = [(Strzelajaca, 12, row) for row in range(2, 24, 3)] + [(MagiaOgnia, 12, 15), (Lodowa, 14, 5)]
+    game = make_game(towers, seed=8)
+    game.wave_number = 9
+    engine = WaveEngine(game)
+    engine.start()
+    total = engine.alive_count
+    rewarded = 0
+    while engine.running:
+        rewarded += sum(ev.kind == EVENT_REWARD for ev in engine.tick())
+        alive = sum(e.alive for e in game.enemies)
+        assert engine.alive_count == alive + len(engine._spawn_queue)
+        assert {id(e) for e in game.enemies if e.alive} <= {id(e) for _, e in engine._active}
+    assert not any(e.alive for e in game.enemies)
+    assert len(game.enemies) == total
+    assert len(engine._active) < total
+    assert rewarded == sum(1 for e in game.enemies if e.rewarded) == engine.result().defeated
+
+
+def test_enemies_enter_map_from_spawn_queue():
+    game = make_game(seed=9, towers=[(Laserowa, 1, 0)])
+    engine = WaveEngine(game)
+    engine.start()
+    total = engine.alive_count
+    assert len(game.enemies) == 1
+    while engine.running:
+        engine.tick()
+        spawned = min(total, engine.ticks // DELAY_STEP + 1)
+        assert len(game.enemies) == spawned
+        # Wróg, który dopiero wszedł, stoi na polu startowym
+        newest = game.enemies[-1]
+        if newest.alive and not newest.flying and engine.ticks == (spawned - 1) * DELAY_STEP:
+            assert newest.path_index == 0
+    assert len(game.enemies) == total
+
+
+def test_idle_towers_sleep_until_enemy_in_range():
+    game = make_game(seed=11)
+    far = [
+        (x, y) for y in range(game.map.HEIGHT) for x in range(game.map.WIDTH)
+        if all(abs(x - col) + abs(y - row) > 6 for row, col in game.map.path)
+    ]
+    for cls, (x, y) in zip([Strzelajaca, Laserowa, Lodowa, CiezkaArmatnia], far[::7]):
+        t = cls(x, y)
+        t.game = game
+        game.towers.append(t)
+    near = Strzelajaca(*next(
+        (x, y) for x, y in far
+        if any(abs(x - col) + abs(y - row) == 7 for row, col in game.map.path)
+    ))
+    near.range = 7
+    near.game = game
+    game.towers.append(near)
+
+    profiler = TickProfiler()
+    result = simulate_wave(game, WaveEngine(game, profiler=profiler))
+    # Wieże bez wrogów w zasięgu próbują strzelić tylko raz, na początku fali
+    for name in ("atak:Laserowa", "atak:Lodowa", "atak:CiezkaArmatnia"):
+        assert profiler.sections[name][0] == 1
+    assert near.hits > 0
+    assert profiler.sections["atak:Strzelajaca"][0] < 2 * result.ticks
@@ -41,4 +41,38 @@ def test_game_init(mock_load_prefs, mock_sound, mock_init_db, mock_gamemenu):
     game.stats["max_gold_ever"] = 2000
     game.stats["towers_built"] = 30
     game.update_achievements()
-    assert all(game.achievements.values())
\ No newline at end of file
+    assert all(game.achievements.values())
+
+def test_parse_coordinates_on_large_map():
+    from types import SimpleNamespace
+    from game.game import Game
+    from game.utils import column_label, column_index
+
+    assert [column_label(i) for i in (0, 25, 26, 51, 701, 702)] == ["A", "Z", "AA", "AZ", "ZZ", "AAA"]
+    assert all(column_index(column_label(i)) == i for i in range(1000))
+
+    holder = SimpleNamespace(map=SimpleNamespace(WIDTH=300, HEIGHT=400))
+    assert Game.parse_coordinates(holder, "AA1") == (26, 0)
+    assert Game.parse_coordinates(holder, "kn400") == (299, 399)
+    assert Game.parse_coordinates(holder, "KO1") == (None, None)
+    assert Game.parse_coordinates(holder, "28, 120") == (27, 119)
+    assert Game.parse_coordinates(holder, "301,1") == (None, None)
+    assert Game.parse_coordinates(holder, "A0") == (None, None)
+
+
+def test_save_game_submits_snapshot(memory_db):
+    from game.game import Game
+    from game.settings import DEFAULT_PREFS
+
+    with patch("game.game.GameMenu"), patch("game.game.os.system"), \
+            patch("game.game.load_prefs", return_value=DEFAULT_PREFS.copy()):
+        game = Game(username="TestUser")
+    game.map_type = 1
+    game.new_game(DEFAULT_PREFS.copy())
+    game.gold = 321
+    with patch.object(game.autosave, "submit") as submit:
+        game.save_game()
+    data = submit.call_args.args[2]
+    assert data == game.snapshot()
+    assert data["gold"] == 321 and data["map"]["map_type"] == 1
+    game.autosave.close()
@@ -0,0 +1,41 @@
+import random
+from unittest.mock import MagicMock
+
+from game.engine import HeadlessGame
+from game.load import _load_game_data
+from game.map import Map
+from game.settings import DEFAULT_PREFS
+from game.tower import Strzelajaca
+
+
+def test_path_tiles_and_index_follow_generated_path():
+    for map_type in (1, 2, 3):
+        m = Map(map_type=map_type, rng=random.Random(map_type), width=256, height=256)
+        assert (m.WIDTH, m.HEIGHT) == (256, 256)
+        assert m.path_tiles == frozenset(m.path)
+        for tile in m.path_tiles:
+            assert m.path_index[tile] == m.path.index(tile)
+
+
+def test_loaded_map_keeps_path_tiles_in_sync():
+    source = Map(map_type=2, rng=random.Random(5), width=40, height=30)
+    game = HeadlessGame(DEFAULT_PREFS.copy(), map_type=2, seed=5)
+    game.autosave = MagicMock()
+    data = {
+        "gold": 100, "lives": 10, "wave": 3,
+        "map": {
+            "map_type": 2,
+            "grid": source.grid,
+            "path": [list(p) for p in source.path],
+            "start": list(source.start),
+            "base": list(source.base),
+        },
+        "towers": [("Strzelająca", 0, 0, 1)],
+    }
+    _load_game_data(game, data)
+
+    assert (game.map.WIDTH, game.map.HEIGHT) == (40, 30)
+    assert game.map.path == source.path
+    assert game.map.path_tiles == source.path_tiles
+    assert game.map.path_index == source.path_index
+    assert isinstance(game.towers[0], Strzelajaca)
@@ -0,0 +1,106 @@
+import random
+
+from game.building import Building
+from game.engine import HeadlessGame, WaveEngine
+from game.map import Map
+from game.settings import DEFAULT_PREFS
+from game.tower import Strzelajaca, Laserowa, Lodowa
+from ui.map_renderer import MapRenderer
+
+
+def naive_map(game):
+    """Pełne przejście planszy — tak jak dawniej w GameUI._update_layout."""
+    lines = ["   " + " ".join(chr(65 + i) for i in range(game.map.WIDTH))]
+    for i in range(game.map.HEIGHT):
+        row = f"{i + 1:2} "
+        for j in range(game.map.WIDTH):
+            ch = game.map.grid[i][j]
+            for t in game.towers:
+                if abs(i - t.y) + abs(j - t.x) <= t.range:
+                    if (i, j) == (t.y, t.x):
+                        ch = t.symbol
+                    elif (i, j) in game.map.path:
+                        ch = '.'
+            for e in game.enemies:
+                if e.alive and (i, j) == e.position:
+                    ch = e.symbol
+            row += ch + " "
+        lines.append(row)
+    return "\n".join(lines)
+
+
+def build(game, cls, x, y):
+    t = cls(x, y)
+    game.towers.append(t)
+    game.map.grid[y][x] = t.symbol
+    game.map.touch()
+
+
+def test_renderer_matches_full_redraw_during_wave():
+    game = HeadlessGame(DEFAULT_PREFS.copy(), map_type=2, seed=11)
+    renderer = MapRenderer(game)
+    assert renderer.render() == naive_map(game)
+
+    build(game, Strzelajaca, 0, 5)
+    build(game, Laserowa, 25, 20)
+    assert renderer.render() == naive_map(game)
+
+    engine = WaveEngine(game)
+    engine.start()
+    while engine.running:
+        engine.tick()
+        assert renderer.render() == naive_map(game)
+
+
+def test_renderer_rebuilds_after_upgrade():
+    game = HeadlessGame(DEFAULT_PREFS.copy(), map_type=1)
+    renderer = MapRenderer(game)
+    build(game, Lodowa, 9, 9)
+    assert renderer.render() == naive_map(game)
+    game.towers[0].upgrade()
+    game.map.touch()
+    assert renderer.render() == naive_map(game)
+
+
+def test_renderer_rebuilds_after_building_changes():
+    game = HeadlessGame(DEFAULT_PREFS.copy(), map_type=1)
+    game.gold = 10 ** 6
+    renderer = MapRenderer(game)
+    renderer.render()
+    building = Building(game)
+    assert building.place_tower(Lodowa(0, 0), 9, 9) is None
+    assert renderer.render() == naive_map(game)
+    assert building.apply_upgrade(game.towers[0]) is None
+    assert renderer.render() == naive_map(game)
+
+
+def test_viewport_renders_window_of_large_map():
+    game = HeadlessGame(DEFAULT_PREFS.copy(), map_type=2, seed=3)
+    game.map = Map(map_type=2, rng=random.Random(3), width=300, height=200)
+    row, col = game.map.path[150]
+    build(game, Laserowa, col + 1, row)
+    full = MapRenderer(game, view_width=300, view_height=200)
+    view = MapRenderer(game, view_width=30, view_height=20)
+
+    assert view.scroll(col - 10, row - 10)
+    row0, row1, col0, col1 = view.window()
+    assert (row1 - row0, col1 - col0) == (20, 30)
+    assert not MapRenderer(game, 30, 20).scroll(-1, -1)
+
+    engine = WaveEngine(game)
+    engine.start()
+    for _ in range(200):
+        if not engine.running:
+            break
+        engine.tick()
+        text = view.render()
+        full.render()
+        assert view.line_count == 20 + 2
+        assert len(text.splitlines()) == view.line_count
+        assert view._cells == [r[col0:col1] for r in full._cells[row0:row1]]
+
+    view.scroll(10_000, 10_000)
+    assert view.window() == (180, 200, 270, 300)
+    view.render()
+    assert view._rows[-1].startswith("200 ")
+    assert view._header[0].strip().startswith("J")
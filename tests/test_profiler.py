@@ -0,0 +1,35 @@
+import json
+
+from game.engine import HeadlessGame, WaveEngine, simulate_wave
+from game.profiler import TickProfiler
+from game.settings import DEFAULT_PREFS
+from game.tower import Strzelajaca, Laserowa
+
+
+def make_game():
+    game = HeadlessGame(DEFAULT_PREFS.copy(), map_type=1, seed=4)
+    for cls, x, y in ((Strzelajaca, 12, 3), (Laserowa, 14, 6)):
+        t = cls(x, y)
+        t.game = game
+        game.towers.append(t)
+    return game
+
+
+def test_profiler_records_sections_counters_and_trace(tmp_path):
+    profiler = TickProfiler()
+    game = make_game()
+    profiled = simulate_wave(game, WaveEngine(game, profiler=profiler))
+    plain = simulate_wave(make_game())
+
+    assert vars(profiled) == vars(plain)
+    assert profiler.ticks == profiled.ticks
+    names = {row["name"] for row in profiler.summary()}
+    assert {"tick", "ruch", "ataki", "nagrody", "atak:Strzelajaca", "atak:Laserowa"} <= names
+    assert profiler.counters["strzały"] == sum(t.hits for t in game.towers)
+    assert profiler.counters["przeskanowane_cele"] > 0
+
+    path = tmp_path / "trace.json"
+    profiler.dump_chrome_trace(str(path))
+    trace = json.loads(path.read_text())
+    kinds = {event["ph"] for event in trace["traceEvents"]}
+    assert kinds == {"X", "C"}
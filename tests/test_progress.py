@@ -0,0 +1,77 @@
+import random
+
+from game.engine import HeadlessGame, WaveEngine, simulate_wave
+from game.settings import DEFAULT_PREFS
+from game.tower import CiezkaArmatnia, Laserowa, Lodowa, MagiaOgnia, Strzelajaca
+
+
+def brute_first(tower, enemies):
+    """Wybór celu jak w Lodowa.attack: sortowanie żywych po path_index, pierwszy trafialny w zasięgu."""
+    alive = sorted((e for e in enemies if e.alive), key=lambda e: e.path_index, reverse=True)
+    return next(
+        (e for e in alive if tower.in_range(e) and (tower.can_hit_invisible or not e.invisible)), None
+    )
+
+
+def add_towers(game, classes, count, seed):
+    rng = random.Random(seed)
+    while len(game.towers) < count:
+        x, y = rng.randrange(game.map.WIDTH), rng.randrange(game.map.HEIGHT)
+        if (y, x) not in game.map.path_tiles:
+            t = rng.choice(classes)(x, y)
+            t.game = game
+            game.towers.append(t)
+
+
+def test_first_in_range_matches_sorted_scan_every_tick():
+    for map_type in (1, 2, 3):
+        game = HeadlessGame(DEFAULT_PREFS.copy(), map_type=map_type, seed=map_type)
+        add_towers(game, [Lodowa, MagiaOgnia, Strzelajaca], 12, map_type)
+        game.lives = 10 ** 6
+        game.wave_number = 14
+        engine = WaveEngine(game)
+        engine.start()
+        while engine.running:
+            engine.tick()
+            for tower in game.towers:
+                found = engine.progress.first_in_range(tower, engine.coverage.covered_indices(tower))
+                assert found is brute_first(tower, game.enemies)
+
+
+def test_first_target_towers_match_full_scan():
+    def play(indexed):
+        game = HeadlessGame(DEFAULT_PREFS.copy(), map_type=2, seed=21)
+        add_towers(game, [Lodowa, MagiaOgnia], 10, 21)
+        game.lives = 10 ** 6
+        results = [vars(simulate_wave(game, WaveEngine(game, indexed=indexed))) for _ in range(15)]
+        return results, [(t.hits, t.total_damage) for t in game.towers]
+
+    assert play(True) == play(False)
+
+
+def test_weakest_in_range_matches_min_scan_every_tick():
+    for map_type in (1, 2, 3):
+        game = HeadlessGame(DEFAULT_PREFS.copy(), map_type=map_type, seed=map_type + 10)
+        add_towers(game, [Strzelajaca, CiezkaArmatnia, MagiaOgnia, Laserowa], 14, map_type)
+        game.lives = 10 ** 6
+        game.wave_number = 16
+        engine = WaveEngine(game)
+        engine.start()
+        while engine.running:
+            engine.tick()
+            for tower in game.towers:
+                found = engine.progress.weakest_in_range(tower, engine.coverage.covered_indices(tower))
+                expected = min(tower.iter_targets(game.enemies), key=lambda e: e.hp, default=None)
+                assert found is expected
+
+
+def test_weakest_target_towers_match_full_scan():
+    def play(indexed):
+        game = HeadlessGame(DEFAULT_PREFS.copy(), map_type=3, seed=8)
+        add_towers(game, [Strzelajaca, CiezkaArmatnia, Laserowa, Lodowa], 12, 8)
+        game.lives = 10 ** 6
+        results = [vars(simulate_wave(game, WaveEngine(game, indexed=indexed))) for _ in range(18)]
+        return results, [(t.hits, t.total_damage) for t in game.towers]
+
+    assert play(True) == play(False)
+
@@ -0,0 +1,93 @@
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from game import database
+from game.building import Building
+from game.engine import HeadlessGame, simulate_wave
+from game.replay import ReplayLog, replay, verify
+from game.simulate import preset_prefs
+from game.tower import Strzelajaca, Lodowa, Laserowa
+
+
+def record_game(seed=3, waves=6):
+    """
+    Rozgrywa grę bez interfejsu, prowadząc dziennik tak jak Game, i zwraca (gra, dziennik, zapis).
+    """
+    prefs = preset_prefs("Normal", num_waves=waves)
+    game = HeadlessGame(prefs, map_type=2, seed=seed)
+    log = ReplayLog(seed, 2, prefs)
+    building = Building(game)
+    plan = [(Strzelajaca, 0), (Lodowa, 1), (Laserowa, 3)]
+
+    for wave in range(waves):
+        for cls, at_wave in plan:
+            if at_wave == wave:
+                x, y = _free_tile_next_to_path(game)
+                if building.place_tower(cls(0, 0), x, y) is None:
+                    log.record_build(game.towers[-1].name, x, y)
+        if wave == 2 and game.towers and building.apply_upgrade(game.towers[0]) is None:
+            log.record_upgrade(0)
+        log.record_speed(1.5)
+        log.record_wave()
+        simulate_wave(game)
+
+    data = {
+        "gold": game.gold,
+        "lives": game.lives,
+        "wave": game.wave_number,
+        "stats": game.stats,
+        "towers": [(t.name, t.x, t.y, t.level) for t in game.towers],
+    }
+    return game, log, data
+
+
+def _free_tile_next_to_path(game):
+    for row, col in game.map.path[2:]:
+        for x, y in ((col, row - 1), (col, row + 1)):
+            free = (y, x) not in game.map.path and all((t.x, t.y) != (x, y) for t in game.towers)
+            if 0 <= y < len(game.map.grid) and free:
+                return x, y
+    raise AssertionError("brak wolnego pola")
+
+
+def test_replay_reproduces_recorded_game():
+    game, log, data = record_game()
+    restored = ReplayLog.from_json(log.to_json())
+
+    start = time.perf_counter()
+    assert verify(restored, data) == []
+    assert time.perf_counter() - start < 1.0
+    assert len(log.to_json()) < 4096
+
+    replayed = replay(restored)
+    assert replayed.map.path == game.map.path
+    assert replayed.game_speed == 1.5
+
+
+def test_replay_stops_after_chosen_wave():
+    _, log, _ = record_game()
+    game = replay(log, until_wave=2)
+    assert game.wave_number == 2
+    assert verify(log, {"gold": -1})
+
+
+def test_save_stores_replay_and_migrates_old_schema(monkeypatch):
+    engine = create_engine("sqlite:///:memory:", future=True)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE saves (id INTEGER PRIMARY KEY, username VARCHAR NOT NULL, "
+            "slot INTEGER NOT NULL, data TEXT NOT NULL, UNIQUE (username, slot))"
+        ))
+    monkeypatch.setattr(database, "engine", engine)
+
+    database.init_db()
+    database.save_game("tester", 1, "{}", replay='{"v":1}')
+    assert database.load_replay("tester", 1) == '{"v":1}'
+    assert database.load_replay("tester", 2) is None
+
+
+def test_unknown_replay_version_is_rejected():
+    with pytest.raises(ValueError):
+        ReplayLog.from_json('{"v":99,"seed":1,"map_type":1,"prefs":{},"events":[]}')
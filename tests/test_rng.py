@@ -0,0 +1,39 @@
+from game.engine import HeadlessGame, simulate_wave
+from game.map import Map
+from game.rng import stream, new_seed
+from game.settings import DEFAULT_PREFS
+from game.tower import CiezkaArmatnia, Strzelajaca
+from game.wave import Wave
+
+
+def test_stream_is_reproducible_and_labelled():
+    assert stream(42, "map").random() == stream(42, "map").random()
+    assert stream(42, "map").random() != stream(42, "wave", 1).random()
+    assert stream(42, "wave", 1).random() != stream(43, "wave", 1).random()
+    assert isinstance(new_seed(), int)
+
+
+def test_map_and_wave_use_given_rng():
+    a = Map(map_type=2, rng=stream(7, "map"))
+    b = Map(map_type=2, rng=stream(7, "map"))
+    assert a.path == b.path
+
+    wa = Wave(5, a.path, a.start, a.base, rng=stream(7, "wave", 5))
+    wb = Wave(5, b.path, b.start, b.base, rng=stream(7, "wave", 5))
+    assert [e.name for e in wa.enemies] == [e.name for e in wb.enemies]
+
+
+def _play(seed):
+    game = HeadlessGame(DEFAULT_PREFS.copy(), map_type=2, seed=seed)
+    for x, y, cls in [(0, 4, CiezkaArmatnia), (25, 8, Strzelajaca), (0, 14, CiezkaArmatnia)]:
+        t = cls(x, y)
+        t.game = game
+        game.towers.append(t)
+    game.lives = 10 ** 6
+    results = [simulate_wave(game) for _ in range(6)]
+    return game.map.path, [(r.defeated, r.survived, r.gold_earned, r.ticks) for r in results]
+
+
+def test_same_seed_gives_identical_game():
+    assert _play(123) == _play(123)
+    assert _play(123) != _play(124)
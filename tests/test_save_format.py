@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from game import database, save_format
+from game.building import Building
+from game.engine import HeadlessGame
+from game.settings import DEFAULT_PREFS
+from game.tower import Strzelajaca, Lodowa, Laserowa
+
+
+def free_tile(game):
+    used = {(t.x, t.y) for t in game.towers}
+    for y in range(1, len(game.map.grid)):
+        for x in range(1, len(game.map.grid[0])):
+            if (y, x) not in game.map.path and (x, y) not in used:
+                return x, y
+
+
+def make_game(map_type):
+    prefs = DEFAULT_PREFS.copy()
+    prefs["starting_gold"] = 1000
+    game = HeadlessGame(prefs, map_type=map_type, username="Gracz ł", seed=5)
+    building = Building(game)
+    assert building.place_tower(Strzelajaca(0, 0), *free_tile(game)) is None
+    assert building.place_tower(Lodowa(0, 0), *free_tile(game)) is None
+    assert building.apply_upgrade(game.towers[0]) is None
+    game.achievements["bogacz"] = True
+    return game, building
+
+
+@pytest.mark.parametrize("map_type", [1, 2, 3])
+def test_compact_format_round_trips_old_json_layout(map_type):
+    game, _ = make_game(map_type)
+    data = game.snapshot()
+    text = save_format.encode(data)
+
+    assert text.startswith(save_format.PREFIX)
+    assert len(text) < len(json.dumps(data)) / 5
+    assert save_format.loads(text) == json.loads(json.dumps(data))
+
+
+def test_old_json_saves_still_load():
+    game, _ = make_game(2)
+    data = game.snapshot()
+    assert save_format.loads(json.dumps(data)) == json.loads(json.dumps(data))
+
+
+def test_deltas_rebuild_latest_state():
+    game, building = make_game(2)
+    previous = game.snapshot()
+    text = save_format.encode(previous)
+
+    building.apply_upgrade(game.towers[1])
+    building.place_tower(Laserowa(0, 0), *free_tile(game))
+    game.wave_number = 3
+    game.stats["zabici_przeciwnicy"] = 42
+    data = game.snapshot()
+    delta = save_format.encode_delta(previous, data)
+    assert delta and len(delta) < 200
+    assert save_format.encode_delta(data, data) == ""
+
+    assert save_format.loads(text + delta) == json.loads(json.dumps(data))
+
+
+def test_delta_requires_full_save_when_map_changes():
+    game, _ = make_game(1)
+    other, _ = make_game(2)
+    assert save_format.encode_delta(game.snapshot(), other.snapshot()) is None
+
+
+def test_database_appends_deltas(memory_db):
+    game, _ = make_game(1)
+    previous = game.snapshot()
+    assert not database.append_save_delta("tester", 1, "\nD{}")
+    database.save_game("tester", 1, save_format.encode(previous))
+
+    game.gold = 7
+    data = game.snapshot()
+    assert database.append_save_delta("tester", 1, save_format.encode_delta(previous, data))
+    assert database.load_game("tester", 1)["gold"] == 7
@@ -0,0 +1,68 @@
+import pytest
+
+from game.building import Building
+from game.engine import HeadlessGame
+from game.simulate import _build_for_wave, preset_prefs, play_game, run_batch, aggregate, aggregate_by_layout, main
+
+LAYOUT = {"name": "test", "map_type": 1, "towers": [
+    {"type": "Strzelająca", "x": 12, "y": 3},
+    {"type": "Laserowa", "x": 14, "y": 6},
+    {"type": "Lodowa", "x": 12, "y": 9, "wave": 2, "level": 2},
+]}
+
+
+def test_preset_prefs_applies_preset():
+    prefs = preset_prefs("Hard", num_waves=3)
+    assert prefs["starting_lives"] == 15
+    assert prefs["num_waves"] == 3
+    with pytest.raises(ValueError):
+        preset_prefs("Nightmare")
+
+
+def test_play_game_builds_layout_and_records_curve():
+    result = play_game(preset_prefs("Easy", num_waves=4), LAYOUT, seed=1)
+    assert 1 <= result["waves"] <= 4
+    assert len(result["gold_curve"]) == result["waves"]
+    assert result["score"] >= result["waves"] * 50
+
+
+def test_build_for_wave_holds_towers_back_until_gold_suffices():
+    game = HeadlessGame(preset_prefs("Normal"), map_type=1, seed=1)
+    pending = list(LAYOUT["towers"])
+    built = []
+    game.gold = 60
+    _build_for_wave(game, Building(game), pending, built, wave=1)
+    assert [t.name for t, _ in built] == ["Strzelająca"]
+    assert [spec["type"] for spec in pending] == ["Laserowa", "Lodowa"]
+
+    game.gold = 1000
+    _build_for_wave(game, Building(game), pending, built, wave=1)
+    assert [spec["type"] for spec in pending] == ["Lodowa"]
+
+
+def test_run_batch_is_independent_of_worker_count():
+    prefs = preset_prefs("Normal", num_waves=3)
+    single = run_batch(prefs, [LAYOUT], runs=6, workers=1, seed=10)
+    pooled = run_batch(prefs, [LAYOUT], runs=6, workers=2, seed=10)
+    assert single == pooled
+    agg = aggregate(single)
+    assert agg["runs"] == 6
+    assert 0.0 <= agg["survival_rate"] <= 1.0
+    assert agg["score"]["min"] <= agg["score"]["p50"] <= agg["score"]["max"]
+    assert list(aggregate_by_layout(single)) == ["test"]
+
+
+def test_cli_writes_summary(tmp_path):
+    out = tmp_path / "summary.json"
+    summary = main(["--preset", "Easy", "--runs", "3", "--waves", "2", "--json", str(out)])
+    assert out.exists()
+    assert summary["bez wież"]["runs"] == 3
+
+
+def test_vectorized_engine_gives_same_results():
+    pytest.importorskip("numpy")
+    prefs = preset_prefs("Normal", num_waves=3)
+    vectorized = run_batch(prefs, [LAYOUT], runs=2, seed=4, vectorized=True)
+    assert vectorized == run_batch(prefs, [LAYOUT], runs=2, seed=4)
+    summary = main(["--preset", "Easy", "--runs", "1", "--waves", "2", "--vectorized"])
+    assert summary["bez wież"]["runs"] == 1
@@ -0,0 +1,94 @@
+import sys
+import threading
+
+from game import sound
+from game.sound import SoundManager, PygameBackend, NullBackend, RecordingBackend, make_backend
+
+
+def test_sfx_requests_are_merged_by_single_worker(monkeypatch):
+    manager = SoundManager(backend=PygameBackend())
+    played = []
+    monkeypatch.setattr(manager, "_play_merged", lambda key, count: played.append((key, count)))
+    manager._mixer_ready = True
+    threads_before = threading.active_count()
+
+    # Zgłoszenia czekają w kolejce przed startem wątku — trafiają do jednego okna
+    for _ in range(30):
+        manager._sfx_queue.put_nowait(("shoot_laser", 2))
+    manager._sfx_queue.put_nowait(("death", 1))
+    manager._start_worker()
+    thread = manager._sfx_thread
+    manager.close()
+
+    assert not thread.is_alive()
+    assert threading.active_count() == threads_before
+    assert played == [("shoot_laser", 60), ("death", 1)]
+
+
+def test_play_goes_through_worker_until_close(monkeypatch):
+    manager = SoundManager(backend=PygameBackend())
+    played = []
+    monkeypatch.setattr(manager, "_play_merged", lambda key, count: played.append((key, count)))
+    manager._mixer_ready = True
+    manager._start_worker()
+
+    manager.play("shoot_laser", count=2)
+    manager.play("shoot_laser", count=3)
+    manager.close()
+    assert sum(c for k, c in played if k == "shoot_laser") == 5
+
+    manager.play("death")
+    assert played[-1] == ("death", 1)
+    manager.close()
+
+
+def test_sound_is_noop_without_mixer(monkeypatch):
+    pygame = sound._import_pygame()
+
+    def fail():
+        raise pygame.error("no audio device")
+
+    monkeypatch.setattr(pygame.mixer, "init", fail)
+    manager = SoundManager(backend=PygameBackend())
+    manager.play("shoot_basic")
+    manager.play("music", loop=True)
+
+    assert manager.enabled is False
+    assert manager._sfx_thread is None
+    assert manager.is_muted()
+
+
+def test_sound_is_noop_without_pygame(monkeypatch):
+    monkeypatch.setattr(sound, "pygame", None)
+    monkeypatch.setitem(sys.modules, "pygame", None)
+    manager = SoundManager(backend=PygameBackend())
+    manager.play("shoot_basic")
+    manager.play("shoot_basic")
+
+    assert manager.enabled is False
+    assert isinstance(manager.backend, NullBackend)
+    assert manager.is_muted()
+
+
+def test_recording_backend_counts_plays_synchronously():
+    backend = RecordingBackend()
+    manager = SoundManager(backend=backend)
+    manager.play("music", loop=True)
+    manager.play("shoot_laser", count=3)
+    manager.play("lose")
+
+    assert manager._sfx_thread is None
+    assert backend.music_plays == 1
+    assert backend.plays == {"shoot_laser": 1, "lose": 1}
+    assert backend.requests["shoot_laser"] == 3
+    assert backend.log[-1][2] == SoundManager.RESERVED_CHANNELS["lose"]
+    manager.toggle_mute()
+    assert manager.is_muted()
+
+
+def test_backend_is_chosen_by_env(monkeypatch):
+    monkeypatch.setenv("TD_AUDIO", "recording")
+    assert isinstance(make_backend(), RecordingBackend)
+    monkeypatch.setenv("TD_AUDIO", "nonsense")
+    assert isinstance(make_backend(), NullBackend)
+    assert isinstance(SoundManager(backend=NullBackend()).backend, NullBackend)
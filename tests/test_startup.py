@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Górny limit łącznego czasu importu ścieżki startowej (z dużym zapasem na wolne maszyny)
+IMPORT_TIME_LIMIT_US = 2_000_000
+HEAVY_MODULES = ("pygame", "matplotlib", "openpyxl")
+
+
+def import_times(statement):
+    """
+    Uruchamia python -X importtime w nowym procesie i zwraca {moduł: łączny czas [us]}.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_startup_does_not_import_heavy_dependencies():
+    times = import_times("import game.game, ui.game_ui")
+    loaded = [name for name in times if name.split(".")[0] in HEAVY_MODULES]
+    assert loaded == []
+    assert times["game.game"] + times["ui.game_ui"] < IMPORT_TIME_LIMIT_US
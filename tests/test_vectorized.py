@@ -0,0 +1,102 @@
+import random
+from itertools import islice
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from game.engine import HeadlessGame, WaveEngine, simulate_wave
+from game.enemy import Duch, Goblin, Nietoperz, Ork, Troll
+from game.settings import DEFAULT_PREFS
+from game.tower import TARGET_FIRST, TARGET_WEAKEST, TOWER_CLASSES
+from game.vectorized import RangeMatrix
+
+
+def scalar_targets(tower, enemies):
+    """Wybór celu tak jak w Tower.attack / Lodowa.attack / Laserowa.attack."""
+    if tower.TARGETING == TARGET_WEAKEST:
+        target = min(tower.iter_targets(enemies), key=lambda e: e.hp, default=None)
+        return [] if target is None else [target]
+    if tower.TARGETING == TARGET_FIRST:
+        alive = sorted((e for e in enemies if e.alive), key=lambda e: e.path_index, reverse=True)
+        return next(([e] for e in alive if tower.in_range(e)), [])
+    return list(islice(tower.iter_targets(enemies), tower.MAX_TARGETS))
+
+
+def random_state(seed, towers=40, enemies=300):
+    rng = random.Random(seed)
+    game = HeadlessGame(DEFAULT_PREFS.copy(), map_type=rng.choice([1, 2, 3]), seed=seed)
+    path = game.map.path
+    tower_list = []
+    for _ in range(towers):
+        t = rng.choice(list(TOWER_CLASSES.values()))(rng.randrange(game.map.WIDTH), rng.randrange(game.map.HEIGHT))
+        for _ in range(rng.randrange(4)):
+            t.upgrade()
+        tower_list.append(t)
+    enemy_list = []
+    for _ in range(enemies):
+        cls = rng.choice([Goblin, Ork, Troll, Duch, Nietoperz])
+        if cls is Nietoperz:
+            e = Nietoperz(path, start=(rng.randrange(game.map.HEIGHT), rng.randrange(game.map.WIDTH)))
+        else:
+            e = cls(path)
+            e.path_index = rng.randrange(len(path))
+            e.position = path[e.path_index]
+        e.hp = rng.randint(1, 8)
+        e.alive = rng.random() < 0.9
+        enemy_list.append(e)
+    return tower_list, enemy_list
+
+
+def test_range_matrix_matches_scalar_selection():
+    for seed in range(10):
+        towers, enemies = random_state(seed)
+        ranges = RangeMatrix(towers)
+        ranges.update(enemies)
+
+        expected = [[t.in_range(e) for e in enemies] for t in towers]
+        assert ranges.in_range.tolist() == expected
+        for i, tower in enumerate(towers):
+            assert ranges.targets(i) == scalar_targets(tower, enemies)
+
+
+def test_vectorized_engine_matches_full_scan():
+    def play(vectorized):
+        towers, _ = random_state(5, towers=20, enemies=0)
+        game = HeadlessGame(DEFAULT_PREFS.copy(), map_type=2, seed=31)
+        path = game.map.path_tiles
+        for t in towers:
+            if (t.y, t.x) not in path:
+                t.game = game
+                game.towers.append(t)
+        game.lives = 10 ** 6
+        results = [
+            vars(simulate_wave(game, WaveEngine(game, indexed=False, vectorized=vectorized)))
+            for _ in range(10)
+        ]
+        return results, [(t.hits, t.total_damage, t.cooldown) for t in game.towers]
+
+    assert play(True) == play(False)
+
+
+def test_vectorized_flag_replaces_indexed_engine():
+    game = HeadlessGame(DEFAULT_PREFS.copy(), map_type=1, seed=3)
+    engine = WaveEngine(game, vectorized=True)
+    engine.start()
+    assert not engine.indexed
+    assert engine.coverage is None and engine.ranges is not None
+
+
+def test_range_matrix_updates_buffers_in_place():
+    towers, enemies = random_state(2, towers=10, enemies=40)
+    ranges = RangeMatrix(towers, capacity=len(enemies))
+    ranges.update(enemies[:20])
+    buffers = ranges._hp, ranges._distance, ranges._hittable
+    ranges.update(enemies)
+    assert all(a is b for a, b in zip((ranges._hp, ranges._distance, ranges._hittable), buffers))
+    assert ranges.hp.base is ranges._hp
+    assert ranges.in_range.tolist() == [[t.in_range(e) for e in enemies] for t in towers]
+
+    # Lista bez części wrogów (kompakcja w silniku) — kolumny i indeks liczone od nowa
+    ranges.update(enemies[10:])
+    assert all(ranges.targets(i) == scalar_targets(t, enemies[10:]) for i, t in enumerate(towers))
@@ -6,6 +6,8 @@ import time
 import os
 from rich import box
 from game.building import Building
+from game.utils import column_label
+from ui.map_renderer import MapRenderer
 
 from game.stats_tools import (
     export_stats_to_csv,
@@ -24,6 +26,9 @@ class GameUI:
         -dynamiczną prezentację powiadomień i efektów statusowych wrogów.
     """
 
+    # Przewijanie widoku mapy: klawisz -> (kierunek kolumn, kierunek wierszy), krok = pół okna
+    SCROLL_KEYS = {'i': (0, -1), 'k': (0, 1), 'j': (-1, 0), 'l': (1, 0)}
+
     def __init__(self, game):
         """
         Inicjuje obiekt GameUI – buduje strukturę layoutu, ładuje konsolę Rich i
@@ -42,6 +47,7 @@ class GameUI:
             Layout(name="sidebar", ratio=1),
         )
         self.building = Building(self)
+        self.map_renderer = MapRenderer(game)
 
     def refresh(self):
         """
@@ -117,32 +123,9 @@ class GameUI:
             )
         )
 
-        # Mapa gry
-        width = self.game.map.WIDTH
-        height = self.game.map.HEIGHT
-
-        lines = []
-        lines.append("   " + " ".join(chr(65 + i) for i in range(width)))
-        for i in range(height):
-            row = f"{i + 1:2} "
-            for j in range(width):
-                ch = self.game.map.grid[i][j]
-                # Zasięg wież i symbol wieży na planszy
-                for t in self.game.towers:
-                    if abs(i - t.y) + abs(j - t.x) <= t.range:
-                        if (i, j) == (t.y, t.x):
-                            ch = t.symbol
-                        elif (i, j) in self.game.map.path:
-                            ch = '.'
-                # Przeciwnicy na planszy
-                for e in self.game.enemies:
-                    if e.alive and (i, j) == e.position:
-                        ch = e.symbol
-                row += ch + " "
-            lines.append(row)
-
-        map_str = "\n".join(lines)
-        map_lines = len(lines)
+        # Mapa gry (warstwa statyczna z cache + wrogowie nakładani na zmienione pola)
+        map_str = self.map_renderer.render()
+        map_lines = self.map_renderer.line_count
         sidebar_min = 25
         panel_height = max(map_lines + 6, sidebar_min)
 
@@ -185,6 +168,12 @@ class GameUI:
             "[E] Eksport   [P] Pauza\n"
             "[Q] Wyjście\n"
         )
+        if self.map_renderer.scrollable:
+            row0, row1, col0, col1 = self.map_renderer.window()
+            controls += (
+                "[I/J/K/L] Przewiń mapę\n"
+                f"Widok: {column_label(col0)}–{column_label(col1 - 1)}, {row0 + 1}–{row1}\n"
+            )
 
         max_notif = 6
         to_show = self.game.notifications[-max_notif:]
@@ -226,6 +215,7 @@ class GameUI:
             [M] – mute/unmute muzyki
             [A] – panel osiągnięć
             [P] – pauza
+            [I/J/K/L] – przewijanie mapy większej od okna (góra/lewo/dół/prawo)
             [Q] – wyjście
         """
         if self.game.map is None:
@@ -258,9 +248,13 @@ class GameUI:
             elif choice == '+':
                 self.game.game_speed = min(self.game.game_speed + 0.5, 5.0)
                 self.game.notifications.append(f"⏩ Przyspieszono tempo: x{self.game.game_speed}")
+                if self.game.replay is not None:
+                    self.game.replay.record_speed(self.game.game_speed)
             elif choice == '-':
                 self.game.game_speed = max(self.game.game_speed - 0.5, 0.5)
                 self.game.notifications.append(f"⏪ Spowolniono tempo: x{self.game.game_speed}")
+                if self.game.replay is not None:
+                    self.game.replay.record_speed(self.game.game_speed)
             elif choice == 'e':
                 while True:
                     print(
@@ -292,9 +286,14 @@ class GameUI:
                 input("⏸ Naciśnij Enter, aby wrócić do gry…")
             elif choice == 'p':
                 self.show_pause()
+            elif choice in self.SCROLL_KEYS:
+                d_col, d_row = self.SCROLL_KEYS[choice]
+                renderer = self.map_renderer
+                renderer.scroll(d_col * max(1, renderer.view_width // 2), d_row * max(1, renderer.view_height // 2))
             elif choice == 'q':
                 os.system('cls' if os.name == 'nt' else 'clear')
                 self.game.ranking.update_highscores()
+                self.game.autosave.flush()
                 break
             else:
                 self.game.notifications.append("❌ Nieznana opcja.")
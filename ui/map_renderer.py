@@ -0,0 +1,166 @@
+from typing import Dict, List, Optional, Tuple
+
+from game.config import VIEWPORT_WIDTH, VIEWPORT_HEIGHT
+from game.utils import column_label
+
+
+class MapRenderer:
+    """
+    MapRenderer – warstwowy renderer planszy dla GameUI.
+
+    Składa mapę z dwóch warstw:
+        -statycznej (teren, ścieżka, wieże i podgląd ich zasięgu) — liczonej ponownie
+         tylko po zmianie mapy, budowie lub ulepszeniu wieży albo przewinięciu widoku,
+        -dynamicznej (pozycje żywych wrogów) — rzadkiej, nakładanej na gotowe pola.
+    Między klatkami przebudowywane są wyłącznie wiersze, w których zmieniło się jakieś pole,
+    więc koszt klatki nie zależy od liczby wież.
+
+    Rysowane jest tylko okno (viewport) o rozmiarze view_width × view_height zaczynające się
+    w (view_col, view_row); na dużych mapach koszt zależy od rozmiaru okna, a nie planszy.
+    """
+
+    def __init__(self, game, view_width: Optional[int] = None, view_height: Optional[int] = None):
+        self.game = game
+        self.view_width = view_width or VIEWPORT_WIDTH
+        self.view_height = view_height or VIEWPORT_HEIGHT
+        self.view_col = 0
+        self.view_row = 0
+        self._static_key = None
+        self._window: Tuple[int, int, int, int] = (0, 0, 0, 0)
+        self._static: List[List[str]] = []
+        self._cells: List[List[str]] = []
+        self._rows: List[str] = []
+        self._header: List[str] = []
+        self._row_width = 2
+        self._enemy_cells: Dict[Tuple[int, int], str] = {}
+
+    def window(self) -> Tuple[int, int, int, int]:
+        """
+        Zwraca widoczny fragment mapy (pierwszy wiersz, koniec wierszy, pierwsza kolumna, koniec kolumn),
+        przycięty do granic planszy.
+        """
+        game_map = self.game.map
+        row0 = max(0, min(self.view_row, game_map.HEIGHT - self.view_height))
+        col0 = max(0, min(self.view_col, game_map.WIDTH - self.view_width))
+        return (
+            row0, min(game_map.HEIGHT, row0 + self.view_height),
+            col0, min(game_map.WIDTH, col0 + self.view_width),
+        )
+
+    @property
+    def scrollable(self) -> bool:
+        """
+        Czy mapa jest większa od okna (czy przewijanie cokolwiek zmienia).
+        """
+        game_map = self.game.map
+        return game_map.WIDTH > self.view_width or game_map.HEIGHT > self.view_height
+
+    def scroll(self, d_col: int, d_row: int) -> bool:
+        """
+        Przesuwa okno o podaną liczbę kolumn i wierszy (z przycięciem do planszy).
+        Zwraca True, jeśli widok się zmienił.
+        """
+        before = self.window()
+        self.view_row, _, self.view_col, _ = before
+        self.view_row += d_row
+        self.view_col += d_col
+        after = self.window()
+        self.view_row, _, self.view_col, _ = after
+        return after != before
+
+    def _current_key(self):
+        """
+        Klucz warstwy statycznej: obiekt mapy i siatki, okno widoku oraz licznik zmian mapy.
+        Budowa i ulepszenie wieży zwiększają Map.version (Map.touch), więc klucz zmienia się razem z nimi.
+        """
+        game_map = self.game.map
+        return (game_map, game_map.grid, self.window(), game_map.version)
+
+    def _key_changed(self, key) -> bool:
+        old = self._static_key
+        if old is None:
+            return True
+        return old[0] is not key[0] or old[1] is not key[1] or old[2:] != key[2:]
+
+    def _build_static(self):
+        """
+        Buduje warstwę statyczną okna: pola siatki, zasięg wież na ścieżce ('.') i symbole wież.
+        Zasięg każdej wieży przeglądany jest tylko w części wspólnej z oknem.
+        """
+        game_map = self.game.map
+        towers = self.game.towers
+        row0, row1, col0, col1 = self._window = self.window()
+        static = [list(row[col0:col1]) for row in game_map.grid[row0:row1]]
+
+        path_tiles = game_map.path_tiles
+        for t in towers:
+            r = t.range
+            for row in range(max(row0, t.y - r), min(row1, t.y + r + 1)):
+                rest = r - abs(row - t.y)
+                for col in range(max(col0, t.x - rest), min(col1, t.x + rest + 1)):
+                    if (row, col) in path_tiles:
+                        static[row - row0][col - col0] = '.'
+        for t in towers:
+            if row0 <= t.y < row1 and col0 <= t.x < col1:
+                static[t.y - row0][t.x - col0] = t.symbol
+
+        self._row_width = max(2, len(str(game_map.HEIGHT)))
+        self._static = static
+        self._cells = [list(row) for row in static]
+        self._rows = [self._format_row(row0 + i, row) for i, row in enumerate(self._cells)]
+        self._header = self._format_header(col0, col1)
+        self._enemy_cells = {}
+
+    def _format_header(self, col0: int, col1: int) -> List[str]:
+        """
+        Etykiety kolumn; dłuższe (AA, AB, …) zapisywane są pionowo w kilku wierszach nagłówka.
+        """
+        labels = [column_label(col) for col in range(col0, col1)]
+        depth = max((len(label) for label in labels), default=1)
+        labels = [label.rjust(depth) for label in labels]
+        indent = " " * (self._row_width + 1)
+        return [indent + " ".join(label[k] for label in labels) for k in range(depth)]
+
+    def _format_row(self, i: int, cells: List[str]) -> str:
+        return f"{i + 1:{self._row_width}} " + "".join(ch + " " for ch in cells)
+
+    def render(self) -> str:
+        """
+        Zwraca tekst widocznego okna mapy (nagłówek + wiersze) dla bieżącej klatki.
+        """
+        key = self._current_key()
+        if self._key_changed(key):
+            self._build_static()
+            self._static_key = key
+
+        row0, row1, col0, col1 = self._window
+
+        # Warstwa dynamiczna: ostatni żywy wróg na polu wygrywa (jak w pełnym przebiegu)
+        enemy_cells: Dict[Tuple[int, int], str] = {}
+        for e in self.game.enemies:
+            if e.alive:
+                row, col = e.position
+                if row0 <= row < row1 and col0 <= col < col1:
+                    enemy_cells[(row - row0, col - col0)] = e.symbol
+
+        dirty_rows = set()
+        for pos in self._enemy_cells:
+            if pos not in enemy_cells:
+                row, col = pos
+                self._cells[row][col] = self._static[row][col]
+                dirty_rows.add(row)
+        for pos, symbol in enemy_cells.items():
+            row, col = pos
+            if self._cells[row][col] != symbol:
+                self._cells[row][col] = symbol
+                dirty_rows.add(row)
+        self._enemy_cells = enemy_cells
+
+        for row in dirty_rows:
+            self._rows[row] = self._format_row(row0 + row, self._cells[row])
+
+        return "\n".join(self._header + self._rows)
+
+    @property
+    def line_count(self) -> int:
+        return len(self._rows) + len(self._header)